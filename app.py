@@ -1,16 +1,23 @@
 from dotenv import load_dotenv
+import json
+import math
 import requests
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, jsonify, make_response, Response, request, stream_with_context
 import logging as logger
 import sqlite3
 
 # from flask_cors import CORS
 
 from ebay.models.item_model import Item
-from ebay.models.wishlist_model import WishlistModel
-from ebay.utils.sql_utils import check_database_connection, check_table_exists, get_db_connection
-from ebay.services.ebay_client import get_access_token, search_items, search_item_by_id
-from ebay.models.item_model import create_item
+from ebay.models.wishlist_store import get_wishlist_store, validate_user_id
+from ebay.utils.sql_utils import check_database_connection, check_table_exists, get_db_connection, get_db_pool_stats, get_db_settings
+from ebay.services.ebay_client import get_access_token, search_items_cached, get_item_details_cached, get_items_details, iter_search_items, get_pool_stats, get_cache_stats, get_coalescing_stats, get_rate_limit_stats, get_circuit_breaker_states
+from ebay.services.rate_limiter import RateLimitExceeded
+from ebay.services.resilience import CircuitOpenError
+from ebay.models.item_model import create_item, create_items_bulk, get_all_items, get_item_by_id, iter_all_items
+from ebay.models.price_history_model import get_price_history
+from ebay.services.price_refresher import get_refresher_status
+from ebay.services.item_import import read_ndjson_rows
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,8 +29,91 @@ app = Flask(__name__)
 # uncomment this
 # CORS(app)
 
-# Initialize model for route /
-wishlist = WishlistModel()
+# Largest page the paginated list routes will return
+PAGE_MAX_LIMIT = 1000
+
+def unavailable_response(e) -> Response:
+    """
+    Builds a response for an eBay call that was not made, telling the client when it may retry.
+
+    Rate limits become a 429 and an open circuit breaker becomes a 503.
+    """
+    status = 429 if isinstance(e, RateLimitExceeded) else 503
+    response = make_response(jsonify({'error': str(e), 'retry_after': round(e.retry_after, 2)}), status)
+    response.headers['Retry-After'] = str(math.ceil(e.retry_after))
+    return response
+
+def cached_response(payload: dict, result) -> Response:
+    """
+    Builds a 200 response for data served through the eBay response cache.
+
+    X-Cache says whether it was a HIT, STALE (being refreshed in the
+    background), STALE-IF-ERROR (eBay failed, old data served) or MISS, and
+    Age gives the age of the data in seconds.
+    """
+    response = make_response(jsonify(payload), 200)
+    response.headers['X-Cache'] = result.status
+    response.headers['Age'] = str(int(result.age))
+    return response
+
+def parse_page_args() -> tuple:
+    """
+    Reads the keyset pagination parameters of a list route.
+
+    Returns:
+        tuple: (limit, after); either is None when not given.
+
+    Raises:
+        ValueError: If limit is not between 1 and PAGE_MAX_LIMIT or after is not a non-negative integer.
+    """
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    try:
+        limit = int(limit) if limit is not None else None
+        after = int(after) if after is not None else None
+    except ValueError:
+        raise ValueError('limit and after must be integers')
+    if limit is not None and not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {PAGE_MAX_LIMIT}')
+    if after is not None and after < 0:
+        raise ValueError('after must be a non-negative integer')
+    return limit, after
+
+def page_response(items: list, limit: int) -> Response:
+    """
+    Builds the response for one page of a list route.
+
+    next_after is the cursor for the following page, or None on the last page.
+    """
+    next_after = items[-1]['id'] if limit is not None and len(items) == limit else None
+    return make_response(jsonify({'items': items, 'next_after': next_after}), 200)
+
+def stream_response(rows, fmt: str) -> Response:
+    """
+    Streams rows as they are read from the database, as NDJSON or as one chunked JSON array.
+
+    If the database fails part way through, the last row is an object with an "error" key.
+    """
+    def generate():
+        first = True
+        if fmt == 'json':
+            yield '['
+        try:
+            for row in rows:
+                if fmt == 'json':
+                    yield ('' if first else ',') + json.dumps(row)
+                    first = False
+                else:
+                    yield json.dumps(row) + "\n"
+        except sqlite3.Error as e:
+            app.logger.error(f"Error streaming rows: {e}")
+            error = json.dumps({'error': str(e)})
+            yield (('' if first else ',') + error) if fmt == 'json' else error + "\n"
+        if fmt == 'json':
+            yield ']'
+
+    mimetype = 'application/json' if fmt == 'json' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
 
 @app.route('/')
 def index():
@@ -42,10 +132,14 @@ def healthcheck() -> Response:
     Health check route to verify the service is running.
 
     Returns:
-        JSON response indicating the health status of the service.
+        JSON response indicating the health status of the service and the
+        state of the circuit breakers guarding eBay calls.
     """
     app.logger.info('Health check')
-    return make_response(jsonify({'status': 'healthy'}), 200)
+    return make_response(jsonify({
+        'status': 'healthy',
+        'ebay_circuit_breakers': get_circuit_breaker_states()
+    }), 200)
 
 @app.route('/api/db-check', methods=['GET'])
 def db_check() -> Response:
@@ -53,7 +147,9 @@ def db_check() -> Response:
     Route to check if the database connection and wishlist table are functional.
 
     Returns:
-        JSON response indicating the database health status.
+        JSON response indicating the database health status and the pragma
+        settings (journal mode, synchronous, busy timeout, cache and mmap size,
+        temp store) active on its connections.
     Raises:
         404 error if there is an issue with the database.
     """
@@ -64,10 +160,46 @@ def db_check() -> Response:
         app.logger.info("Checking if wishlist table exists...")
         check_table_exists("wishlist")
         app.logger.info("wishlist table exists.")
-        return make_response(jsonify({'database_status': 'healthy'}), 200)
+        return make_response(jsonify({'database_status': 'healthy', 'settings': get_db_settings()}), 200)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 404)
 
+@app.route('/api/stats', methods=['GET'])
+def stats() -> Response:
+    """
+    Route to report runtime counters for the eBay client and the database.
+
+    Returns:
+        JSON response with the HTTP connection pool, response cache, request
+        coalescing, rate limit, database connection pool and wishlist cache counters.
+    """
+    app.logger.info('Reporting client stats')
+    return make_response(jsonify({
+        'http_pool': get_pool_stats(),
+        'db_pool': get_db_pool_stats(),
+        'cache': get_cache_stats(),
+        'coalescing': get_coalescing_stats(),
+        'rate_limits': get_rate_limit_stats(),
+        'wishlist_cache': get_wishlist_store().stats()
+    }), 200)
+
+@app.route('/api/refresher/status', methods=['GET'])
+def refresher_status() -> Response:
+    """
+    Route to report the background price refresher workers.
+
+    Returns:
+        JSON response with each worker's last saved status: items tracked,
+        queue depth (items due), lag of the most overdue item in seconds, eBay
+        calls in the last minute against its budget, and refresh, error and
+        alert counts. A worker that has stopped reporting is marked stale.
+    """
+    try:
+        return make_response(jsonify({'workers': get_refresher_status()}), 200)
+    except sqlite3.Error as e:
+        app.logger.error(f"Error reading the refresher status: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
 #####################################################
 # Token Management
 #####################################################
@@ -81,6 +213,8 @@ def get_token():
         token = get_access_token()  # Ensure this function is implemented correctly
         app.logger.info("Token generated successfully")
         return make_response(jsonify({'token': token}), 200)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
     except Exception as e:
         app.logger.error(f"Error generating token: {e}")
         return make_response(jsonify({'error': str(e)}), 500)
@@ -110,8 +244,10 @@ def search():
         return make_response(jsonify({'error': 'Query parameter is required'}), 400)
 
     try:
-        items = search_items(query, limit)
-        return make_response(jsonify({'items': items}), 200)
+        result = search_items_cached(query, limit)
+        return cached_response({'items': result.value}, result)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 500)
     
@@ -127,26 +263,26 @@ def get_top_search_result():
     """
     Get the top search result for a given keyword. Based on the above function which gets a search
 
+    The result is served from any cached search summary for the same query,
+    so repeated lookups do not call eBay.
+
     Parameters:
         query (str): The search keyword.
-        limit (int, optional): The maximum number of items to retrieve. Default is 5.
 
     Returns:
         Response: A JSON response containing the top search result, or an error message.
 
     """
     query = request.args.get('query')
-    limit = int(request.args.get('limit', 5))
     if not query:
         return make_response(jsonify({'error': 'Query parameter is required'}), 400)
 
     try:
-        items = search_items(query, limit)
+        result = search_items_cached(query, 1)
+        top_item = result.value[0] if result.value else None
 
-        if not items:
+        if not top_item:
             return make_response(jsonify({'error': 'No items found for the given query'}), 404)
-        
-        top_item = items[0]
 
         # Create a summary for the top item
         summary = {
@@ -155,7 +291,9 @@ def get_top_search_result():
             "price": top_item.get("price"),
         }
 
-        return make_response(jsonify({"top_item": summary}), 200)
+        return cached_response({"top_item": summary}, result)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 500)
     
@@ -165,6 +303,46 @@ def get_top_search_result():
     #
     ###################################################################################
 
+# Stream every result for a query as newline-delimited JSON
+@app.route('/api/search/stream', methods=['GET'])
+def stream_search():
+    """
+    Stream search results across multiple pages as NDJSON, one item per line.
+
+    Pages are fetched lazily while the response is being written, so the
+    server never holds the whole result set in memory. If eBay fails part
+    way through, the last line is an object with an "error" key.
+
+    Parameters:
+        query (str): The search keyword.
+        max_items (int, optional): The maximum number of items to stream. Default is 1000.
+        page_size (int, optional): The number of items fetched per eBay call. Default is 200.
+
+    Returns:
+        Response: An application/x-ndjson stream of items, or an error message.
+
+    Example:
+        curl -N -X GET "http://localhost:5000/api/search/stream?query=laptop&max_items=500"
+    """
+    query = request.args.get('query')
+    if not query:
+        return make_response(jsonify({'error': 'Query parameter is required'}), 400)
+    try:
+        max_items = int(request.args.get('max_items', 1000))
+        page_size = int(request.args.get('page_size', 200))
+    except ValueError:
+        return make_response(jsonify({'error': 'max_items and page_size must be integers'}), 400)
+
+    def generate():
+        try:
+            for item in iter_search_items(query, max_items=max_items, page_size=page_size):
+                yield json.dumps(item) + "\n"
+        except Exception as e:
+            app.logger.error(f"Error streaming search results: {e}")
+            yield json.dumps({'error': str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 
 # Search using ebay_item_id
 @app.route('/api/search/item/ebay_id', methods=['GET'])
@@ -188,35 +366,29 @@ def search_ebay_id():
         return make_response(jsonify({'error': 'Ebay item id parameter is required'}), 400)
 
     try:
-        item_data = search_item_by_id(ebay_item_id)
+        result = get_item_details_cached(ebay_item_id)
+        item_data = result.value
         
         if not item_data:
             return make_response(jsonify({'error': 'No item found for the given eBay item ID'}), 404)
 
-        title = item_data.get("title")
+        title = item_data["title"]
         if not title:
             raise ValueError("Title is missing from item data")
         
-        price_info = item_data.get("price", {})
-        price = float(price_info.get("value", 0))
+        price = item_data["price"]
         if price <= 0:
             raise ValueError(f"Invalid price: {price}")
 
-        estimated_availabilities = item_data.get("estimatedAvailabilities", [])
-        if estimated_availabilities:
-            available_quantity = estimated_availabilities[0].get("estimatedAvailableQuantity")
-            sold_quantity = estimated_availabilities[0].get("estimatedSoldQuantity")
-        else:
-            available_quantity = 0
-            sold_quantity = 0
-
-        return make_response(jsonify({
+        return cached_response({
             "ebay_item_id": ebay_item_id,
             "title": title,
             "price": price,
-            "available_quantity": available_quantity,
-            "sold_quantity": sold_quantity
-        }), 200)
+            "available_quantity": item_data["available_quantity"],
+            "sold_quantity": item_data["sold_quantity"]
+        }, result)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 500)
     
@@ -248,25 +420,23 @@ def get_sold_quantity():
         return make_response(jsonify({'error': 'Ebay item id parameter is required'}), 400)
 
     try:
-        item_data = search_item_by_id(ebay_item_id)
+        result = get_item_details_cached(ebay_item_id, fields=("title", "sold_quantity"))
+        item_data = result.value
         
         if not item_data:
             return make_response(jsonify({'error': 'No item found for the given eBay item ID'}), 404)
 
-        title = item_data.get("title", "Unknown Title")
-
-        estimated_availabilities = item_data.get("estimatedAvailabilities", [])
-        sold_quantity = (
-            estimated_availabilities[0].get("estimatedSoldQuantity", 0)
-            if estimated_availabilities else 0
-        )
+        title = item_data["title"] or "Unknown Title"
+        sold_quantity = item_data["sold_quantity"] or 0
 
     
-        return make_response(jsonify({
+        return cached_response({
             "Ebay Item ID": ebay_item_id,
             "Title": title,
             "Sold quantity: ": sold_quantity
-        }), 200)
+        }, result)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 500)
     
@@ -299,25 +469,23 @@ def get_available_quantity():
         return make_response(jsonify({'error': 'Ebay item id parameter is required'}), 400)
 
     try:
-        item_data = search_item_by_id(ebay_item_id)
+        result = get_item_details_cached(ebay_item_id, fields=("title", "available_quantity"))
+        item_data = result.value
         
         if not item_data:
             return make_response(jsonify({'error': 'No item found for the given eBay item ID'}), 404)
 
-        title = item_data.get("title", "Unknown Title")
-
-        estimated_availabilities = item_data.get("estimatedAvailabilities", [])
-        available_quantity = (
-            estimated_availabilities[0].get("estimatedAvailableQuantity", 0)
-            if estimated_availabilities else 0
-        )
+        title = item_data["title"] or "Unknown Title"
+        available_quantity = item_data["available_quantity"] or 0
        
     
-        return make_response(jsonify({
+        return cached_response({
             "Ebay Item ID": ebay_item_id,
             "Title": title,
             "Available quantity: ": available_quantity
-        }), 200)
+        }, result)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 500)
     
@@ -326,102 +494,260 @@ def get_available_quantity():
     # example curl: curl -X GET "http://localhost:5000/api/search/item/available_quantity?ebay_item_id=v1|254582474636|0"
     #
     ###################################################################################
+
+# Maximum number of ids accepted by the batch lookup route
+BATCH_LOOKUP_MAX_IDS = 200
+
+@app.route('/api/search/items/batch', methods=['POST'])
+def search_items_batch() -> Response:
+    """
+    Look up the details of many eBay items in one request.
+
+    Uncached items are fetched from eBay in parallel using the multi-item
+    getItems call. Duplicate ids are looked up once, and an id that fails is
+    reported in its own entry without failing the others.
+
+    Expected JSON Input:
+        - ebay_item_ids (list[str]): The eBay item IDs to look up.
+
+    Returns:
+        Response: A JSON response with one entry per distinct id, holding its
+        title, price, available_quantity and sold_quantity, or an error.
+
+    Example:
+        curl -X POST "http://localhost:5000/api/search/items/batch" -H "Content-Type: application/json" \
+             -d '{"ebay_item_ids": ["v1|254582474636|0", "v1|205157122545|0"]}'
+    """
+    data = request.get_json(silent=True) or {}
+    ebay_item_ids = data.get('ebay_item_ids')
+
+    if (not isinstance(ebay_item_ids, list) or not ebay_item_ids
+            or not all(isinstance(ebay_item_id, str) and ebay_item_id for ebay_item_id in ebay_item_ids)):
+        return make_response(jsonify({'error': 'ebay_item_ids must be a non-empty list of eBay item ids'}), 400)
+    if len(ebay_item_ids) > BATCH_LOOKUP_MAX_IDS:
+        return make_response(jsonify({'error': f'At most {BATCH_LOOKUP_MAX_IDS} ids can be looked up at once'}), 400)
+
+    try:
+        items = get_items_details(ebay_item_ids)
+        app.logger.info("Batch lookup of %d items", len(items))
+        return make_response(jsonify({'items': items}), 200)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        return unavailable_response(e)
+    except Exception as e:
+        return make_response(jsonify({'error': str(e)}), 500)
     
+#####################################################
+# Item Catalog Routes
+#####################################################
+@app.route('/api/items', methods=['GET'])
+def list_items() -> Response:
+    """
+    List the catalog items in id order, a page at a time or as a stream.
+
+    Query Parameters:
+        limit (int, optional): The page size, up to 1000.
+        after (int, optional): Return items with a greater id; pass the previous page's next_after.
+        stream (str, optional): "ndjson" or "json" to stream every item after `after`
+            (up to `limit`) as it is read instead of building the whole response.
+
+    Returns:
+        Response: The whole catalog as a JSON list when no parameter is given,
+        otherwise {"items": [...], "next_after": id or null}, or the stream.
+
+    Example:
+        curl "http://localhost:5000/api/items?limit=100&after=400"
+        curl -N "http://localhost:5000/api/items?stream=ndjson"
+    """
+    try:
+        limit, after = parse_page_args()
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    fmt = request.args.get('stream')
+    if fmt not in (None, 'ndjson', 'json'):
+        return make_response(jsonify({'error': 'stream must be "ndjson" or "json"'}), 400)
+
+    if fmt:
+        return stream_response(iter_all_items(after=after, limit=limit), fmt)
+    try:
+        if limit is None and after is None:
+            return make_response(jsonify(get_all_items()), 200)
+        return page_response(get_all_items(limit=limit, after=after), limit)
+    except sqlite3.Error as e:
+        app.logger.error(f"Error listing items: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+@app.route('/api/items/<int:item_id>/history', methods=['GET'])
+def item_price_history(item_id: int) -> Response:
+    """
+    Get the price history of a catalog item from its hourly or daily rollups.
+
+    Query Parameters:
+        from (str, optional): The start of the range, as ISO 8601 or unix seconds. Default is 7 days before `to`.
+        to (str, optional): The end of the range. Default is now.
+        resolution (str, optional): "hour", "day" or "auto" (hourly up to 7 days, daily beyond). Default is "auto".
+
+    Returns:
+        Response: The item id, resolution, range and one point per bucket with
+        min, max, avg and last price, or an error message.
+
+    Example:
+        curl "http://localhost:5000/api/items/1/history?from=2024-01-01&resolution=day"
+    """
+    try:
+        get_item_by_id(item_id)
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 404)
+    except sqlite3.Error as e:
+        return make_response(jsonify({'error': str(e)}), 500)
+
+    try:
+        history = get_price_history(item_id, start=request.args.get('from'), end=request.args.get('to'),
+                                    resolution=request.args.get('resolution', 'auto'))
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    except sqlite3.Error as e:
+        app.logger.error(f"Error retrieving price history for item {item_id}: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+    return make_response(jsonify(history), 200)
+
+@app.route('/api/items/bulk', methods=['POST'])
+def create_items_bulk_route() -> Response:
+    """
+    Add or update many catalog items in one transaction.
+
+    Accepts either a JSON array of items (or an object with an "items" array),
+    or an NDJSON body with one item per line, which is read as it streams in.
+    Items whose ebay_item_id is already in the catalog are updated. Invalid
+    rows are reported individually and do not stop the import.
+
+    Expected Input (per item):
+        - ebay_item_id (str), title (str), price (float), available_quantity (int)
+        - sold_quantity (int, optional), alert_price (float, optional, default 60% of price)
+
+    Query Parameters:
+        errors_only (bool, optional): Only list the rows that failed.
+
+    Returns:
+        Response: A JSON summary with the created, updated and failed counts and a result per row.
+
+    Example:
+        curl -X POST "http://localhost:5000/api/items/bulk" -H "Content-Type: application/x-ndjson" \
+             --data-binary @items.ndjson
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        rows = read_ndjson_rows(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        rows = data.get('items') if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            return make_response(jsonify({'error': 'Body must be a JSON array of items, an object with an "items" array, or NDJSON'}), 400)
+
+    try:
+        summary = create_items_bulk(rows)
+    except sqlite3.Error as e:
+        app.logger.error(f"Error bulk loading items: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+    if request.args.get('errors_only', 'false').lower() == 'true':
+        summary['results'] = [result for result in summary['results'] if result['status'] == 'error']
+    return make_response(jsonify(summary), 200)
+
 #
 # Wishlist Management
 #
 
+def parse_user_id(data: dict = None) -> int:
+    """
+    Reads the user whose wishlist a request is for.
+
+    The user ID is taken from the X-User-Id header, else the user_id query
+    parameter, else the user_id field of the JSON body.
+
+    Raises:
+        ValueError: If no user ID is given or it is not a positive integer.
+    """
+    user_id = request.headers.get('X-User-Id') or request.args.get('user_id')
+    if user_id is None and isinstance(data, dict):
+        user_id = data.get('user_id')
+    if user_id is None:
+        raise ValueError('user_id is required (X-User-Id header, user_id query parameter or body field)')
+    try:
+        return validate_user_id(int(user_id))
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid user ID: {user_id} (must be a positive integer).')
+
 # Route to add an item to the wishlist
 @app.route('/api/add-item-to-wishlist', methods=['POST'])
 def add_item_to_wishlist() -> Response:
     """
-    Route to add an item to the wishlist by its unique attributes.
+    Route to add an item, or a batch of items, to a user's wishlist.
+
+    The items are written in one transaction; an item whose eBay item ID is
+    already on the wishlist is updated.
 
     Expected JSON Input:
+        - user_id (int): The user, unless given in the X-User-Id header or the query string.
         - ebay_item_id (str): The eBay item ID.
         - title (str): The title of the item.
         - price (float): The price of the item.
         - available_quantity (int): The available quantity of the item.
         - sold_quantity (int): The sold quantity of the item.
         - alert_price (float): The alert price for the item.
+        Or, for a batch, "items": a list of objects with the item fields.
 
     Returns:
-        JSON response indicating success of the addition or error message.
+        JSON response with the stored item(s) and their wishlist ids, or error message.
     """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return make_response(jsonify({'error': 'Body must be a JSON object'}), 400)
     try:
-        data = request.get_json()
-
-        ebay_item_id = data.get('ebay_item_id')
-        title = data.get('title')
-        price = data.get('price')
-        available_quantity = data.get('available_quantity')
-        sold_quantity = data.get('sold_quantity')
-        alert_price = data.get('alert_price')
-
-        if not ebay_item_id or not title or not isinstance(price, (int, float)) or price <= 0 or available_quantity < 0 or sold_quantity < 0:
-            return make_response(jsonify({'error': 'Invalid input data'}), 400)
-
-        # Assuming an in-memory list for wishlist items (no database)
-        item = {
-            'ebay_item_id': ebay_item_id,
-            'title': title,
-            'price': price,
-            'available_quantity': available_quantity,
-            'sold_quantity': sold_quantity,
-            'alert_price': alert_price
-        }
-
-        # In-memory wishlist (could be a global variable or part of app state)
-        wishlist.add_item_to_wishlist(item)
-
-        logger.info(f"Item {title} added to wishlist")
-        return make_response(jsonify({'status': 'success', 'message': 'Item added to wishlist'}), 201)
-
-    except Exception as e:
+        user_id = parse_user_id(data)
+        items = data['items'] if 'items' in data else [data]
+        if not isinstance(items, list):
+            raise ValueError('items must be a list')
+        stored = get_wishlist_store().add_items(user_id, items)
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    except sqlite3.Error as e:
         logger.error(f"Error adding item to wishlist: {e}")
         return make_response(jsonify({'error': str(e)}), 500)
 
-
-# Function to remove an item from the wishlist by its item id
-def remove_item_from_wishlist(item_id: int) -> None:
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM wishlist WHERE id = ?", (item_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Item with ID %s has already been deleted", item_id)
-                    raise ValueError(f"Item with ID {item_id} has already been deleted")
-            except TypeError:
-                logger.info("Item with ID %s not found", item_id)
-                raise ValueError(f"Item with ID {item_id} not found")
-
-            cursor.execute("UPDATE wishlist SET deleted = TRUE WHERE id = ?", (item_id,))
-            conn.commit()
-            logger.info("Item with ID %s marked as deleted in wishlist.", item_id)
-    except sqlite3.Error as e:
-        logger.error("Database error while deleting item from wishlist: %s", str(e))
-        raise e
+    logger.info(f"{len(stored)} item(s) added to the wishlist of user {user_id}")
+    payload = {'status': 'success', 'message': 'Item added to wishlist'}
+    if 'items' in data:
+        payload['items'] = stored
+    else:
+        payload['item'] = stored[0]
+    return make_response(jsonify(payload), 201)
 
 
 # Route to remove an item from the wishlist by item id
 @app.route('/api/remove-item-from-wishlist/<int:item_id>', methods=['DELETE'])
 def remove_item(item_id: int) -> Response:
     """
-    Route to remove an item from the wishlist by its item ID.
+    Route to remove an item from a user's wishlist by its item ID.
 
     Path Parameter:
         - item_id (int): The ID of the item to remove.
 
+    Query Parameters:
+        user_id (int): The user, unless given in the X-User-Id header.
+
     Returns:
-        JSON response indicating success or error message.
+        JSON response indicating success, or an error message (404 if the
+        item is not on the user's wishlist).
     """
     try:
-        remove_item_from_wishlist(item_id)
+        user_id = parse_user_id()
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    try:
+        get_wishlist_store().remove_item(user_id, item_id)
         return make_response(jsonify({'status': 'success', 'message': 'Item removed from wishlist'}), 200)
-
-    except Exception as e:
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 404)
+    except sqlite3.Error as e:
         logger.error(f"Error removing item from wishlist: {e}")
         return make_response(jsonify({'error': str(e)}), 500)
 
@@ -430,41 +756,41 @@ def remove_item(item_id: int) -> Response:
 @app.route('/api/get-wishlist', methods=['GET'])
 def get_wishlist() -> Response:
     """
-    Route to retrieve all non-deleted items from the wishlist.
+    Route to retrieve all non-deleted items from a user's wishlist.
+
+    Query Parameters:
+        user_id (int): The user, unless given in the X-User-Id header.
+        limit (int, optional): The page size, up to 1000.
+        after (int, optional): Return items with a greater id; pass the previous page's next_after.
+        stream (str, optional): "ndjson" or "json" to stream the items.
 
     Returns:
-        JSON response with a list of items in the wishlist.
+        JSON response with a list of items in the wishlist, or with one page
+        ({"items": [...], "next_after": id or null}) when limit or after is given,
+        or the stream.
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, ebay_item_id, title, price, available_quantity, sold_quantity, alert_price
-                FROM wishlist
-                WHERE deleted = FALSE
-            """)
-            rows = cursor.fetchall()
-
-            items = [
-                {
-                    "id": row[0],
-                    "ebay_item_id": row[1],
-                    "title": row[2],
-                    "price": row[3],
-                    "available_quantity": row[4],
-                    "sold_quantity": row[5],
-                    "alert_price": row[6]
-                }
-                for row in rows
-            ]
-
-            logger.info(f"Retrieved {len(items)} items from the wishlist")
-            return make_response(jsonify(items), 200)
-
+        user_id = parse_user_id()
+        limit, after = parse_page_args()
+    except ValueError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    fmt = request.args.get('stream')
+    if fmt not in (None, 'ndjson', 'json'):
+        return make_response(jsonify({'error': 'stream must be "ndjson" or "json"'}), 400)
+
+    if fmt:
+        return stream_response(get_wishlist_store().iter_items(user_id, after, limit), fmt)
+    try:
+        items = get_wishlist_store().get_items(user_id, after, limit)
     except sqlite3.Error as e:
         logger.error("Database error while retrieving wishlist items: %s", str(e))
         return make_response(jsonify({'error': str(e)}), 500)
 
+    if limit is not None or after is not None:
+        return page_response(items, limit)
+    logger.info(f"Retrieved {len(items)} items from the wishlist of user {user_id}")
+    return make_response(jsonify(items), 200)
+
 if __name__ == "__main__":
 
     app.run(debug=True, host="0.0.0.0", port=5000)
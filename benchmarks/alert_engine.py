@@ -0,0 +1,79 @@
+"""
+Measures price-alert evaluation over a large synthetic catalog.
+
+Loads --items items into an AlertEngine, then repeatedly applies a batch of
+refreshed prices (as the price refresher would) and runs a full evaluation
+pass, reporting the median and 99th percentile time of each. For comparison
+it also times the same check done one Item at a time in Python.
+
+Usage:
+    python benchmarks/alert_engine.py [--items 1000000] [--rounds 200] [--batch 1000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ebay.services.alert_engine import AlertEngine
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(name, samples):
+    print(f"{name:>24}: median {statistics.median(samples) * 1000:8.3f} ms   "
+          f"p99 {percentile(samples, 0.99) * 1000:8.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000, help="Refreshed prices applied per round")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ids = np.arange(1, args.items + 1)
+    prices = rng.uniform(10, 1000, args.items)
+
+    engine = AlertEngine(cooldown=0)
+    started = time.perf_counter()
+    engine.load(ids, prices, prices * 0.6)
+    print(f"Loaded {args.items:,} items in {time.perf_counter() - started:.2f}s")
+
+    update_times, evaluate_times, alerts = [], [], 0
+    for _ in range(args.rounds):
+        batch = rng.choice(ids, args.batch, replace=False).tolist()
+        # Roughly 1% of refreshed items drop below their alert price
+        new_prices = (prices[np.asarray(batch) - 1] * rng.choice([0.5, 1.0], args.batch, p=[0.01, 0.99])).tolist()
+
+        started = time.perf_counter()
+        engine.update_prices(batch, new_prices)
+        update_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        alerts += len(engine.evaluate(now=0))
+        evaluate_times.append(time.perf_counter() - started)
+
+    report(f"update {args.batch} prices", update_times)
+    report(f"evaluate {args.items:,} items", evaluate_times)
+    print(f"{alerts} alerts fired over {args.rounds} rounds")
+
+    # The per-object approach the engine replaces, on a sample scaled up to the catalog size
+    sample = min(args.items, 100_000)
+    objects = [(int(i), float(p), float(p) * 0.6) for i, p in zip(ids[:sample], prices[:sample])]
+    started = time.perf_counter()
+    [item_id for item_id, price, alert_price in objects if price <= alert_price]
+    elapsed = (time.perf_counter() - started) * args.items / sample
+    print(f"{'python loop (estimated)':>24}: {elapsed * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
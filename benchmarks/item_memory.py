@@ -0,0 +1,95 @@
+"""
+Measures the memory held by a large collection of items in each representation.
+
+Builds --items items as a list of Item dataclasses, a list of slotted
+CompactItems and an ItemTable, measuring the memory each allocates with
+tracemalloc, and reports bytes per item, the projected total for --project
+items, and the time to build each (including validation) and to read every
+price back. Titles are drawn from --distinct-titles distinct strings; real
+listing titles are mostly distinct, which is the default.
+
+Usage:
+    python benchmarks/item_memory.py [--items 200000] [--distinct-titles N] [--project 2000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ebay.models.item_model import CompactItem, Item
+from ebay.models.item_table import ItemTable
+
+
+def make_rows(count: int, distinct_titles: int) -> list:
+    # Titles are built per row, as they would be when read from the database
+    return [(item_id, f"v1|{254582474636 + item_id}|0",
+             f"Refurbished laptop 16GB RAM 512GB SSD listing {item_id % distinct_titles}",
+             10.0 + item_id % 500, item_id % 20, item_id % 7, None)
+            for item_id in range(count)]
+
+
+def build_objects(cls, rows: list) -> list:
+    return [cls(item_id, ebay_item_id, title, price, available, sold, 0.0)
+            for item_id, ebay_item_id, title, price, available, sold, _ in rows]
+
+
+def measure(build, count: int, distinct_titles: int) -> tuple:
+    """
+    Builds the items from freshly made rows and drops the rows.
+
+    Returns:
+        tuple: The built collection, the bytes still allocated (everything
+        the collection keeps alive, including strings it shares with the rows)
+        and the seconds the build took.
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows(count, distinct_titles)
+    started = time.perf_counter()
+    built = build(rows)
+    elapsed = time.perf_counter() - started
+    del rows
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, allocated, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--distinct-titles", type=int, default=None, help="Distinct titles (default: one per item)")
+    parser.add_argument("--project", type=int, default=2_000_000, help="Item count to project the totals to")
+    args = parser.parse_args()
+
+    variants = [
+        ("Item", lambda rows: build_objects(Item, rows)),
+        ("CompactItem", lambda rows: build_objects(CompactItem, rows)),
+        ("ItemTable", ItemTable.from_rows),
+    ]
+    print(f"{args.items:,} items, {args.distinct_titles or args.items:,} distinct titles")
+    print(f"{'':>12} {'bytes/item':>11} {f'at {args.project:,}':>14} {'build':>9} {'read prices':>12}")
+    for name, build in variants:
+        built, allocated, build_time = measure(build, args.items, args.distinct_titles or args.items)
+
+        started = time.perf_counter()
+        sum(item.price for item in built)
+        read_time = time.perf_counter() - started
+
+        per_item = allocated / args.items
+        print(f"{name:>12} {per_item:>11.1f} {per_item * args.project / 2 ** 30:>11.2f} GiB "
+              f"{build_time:>8.2f}s {read_time:>11.3f}s")
+        del built
+
+    table = ItemTable.from_rows(make_rows(args.items, args.distinct_titles or args.items))
+    started = time.perf_counter()
+    float(table.prices.sum())
+    print(f"{'ItemTable':>12} column sum of prices: {time.perf_counter() - started:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
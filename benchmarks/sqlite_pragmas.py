@@ -0,0 +1,115 @@
+"""
+Compares mixed read/write throughput of the SQLite pragma profiles.
+
+Runs the same workload twice against a scratch copy of the wishlist table:
+once with SQLite's defaults (rollback journal, synchronous=FULL) and once
+with the pooled profile from ebay.utils.sql_utils.DB_PRAGMAS (WAL,
+synchronous=NORMAL, ...). Each thread loops over a mix of wishlist reads
+and single-row writes for a fixed time through a ConnectionPool.
+
+Usage:
+    python benchmarks/sqlite_pragmas.py [--threads 8] [--seconds 5] [--write-ratio 0.2]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ebay.utils.sql_utils import DB_PRAGMAS, ConnectionPool
+
+
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL", "busy_timeout": DB_PRAGMAS["busy_timeout"]}
+
+
+def create_database(path: str, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE wishlist (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ebay_item_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            price REAL,
+            alert_price REAL,
+            deleted BOOLEAN DEFAULT FALSE
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO wishlist (ebay_item_id, title, price, alert_price) VALUES (?, ?, ?, ?)",
+        [(f"v1|{n}|0", f"Item {n}", 10.0 + n % 500, 5.0) for n in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_workload(pool: ConnectionPool, threads: int, seconds: float, write_ratio: float) -> dict:
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        reads = writes = locked = 0
+        while time.monotonic() < deadline:
+            try:
+                conn = pool.acquire()
+                try:
+                    if rng.random() < write_ratio:
+                        conn.execute("UPDATE wishlist SET price = ? WHERE id = ?",
+                                     (rng.uniform(1, 500), rng.randint(1, 1000)))
+                        conn.commit()
+                        writes += 1
+                    else:
+                        conn.execute("""
+                            SELECT id, ebay_item_id, title, price, alert_price
+                            FROM wishlist WHERE deleted = FALSE LIMIT 100
+                        """).fetchall()
+                        reads += 1
+                finally:
+                    pool.release(conn)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+        with lock:
+            counts["reads"] += reads
+            counts["writes"] += writes
+            counts["locked"] += locked
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    counts["ops_per_second"] = round((counts["reads"] + counts["writes"]) / seconds, 1)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads, {args.seconds}s per profile, {args.write_ratio:.0%} writes")
+    for name, pragmas in (("default", DEFAULT_PRAGMAS), ("tuned", DB_PRAGMAS)):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.db")
+            create_database(path, args.rows)
+            pool = ConnectionPool(path, max_size=args.threads, pragmas=pragmas)
+            result = run_workload(pool, args.threads, args.seconds, args.write_ratio)
+            pool.close()
+        print(f"{name:>8}: {result['ops_per_second']:>10} ops/s  "
+              f"reads={result['reads']} writes={result['writes']} locked={result['locked']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures WishlistModel operation cost as the wishlist grows.
+
+For each size, fills a wishlist with that many items, then times the
+per-id operations (add, get_item_by_item_id, validate_item_id,
+remove_item_by_item_id) on a sample of ids, plus the price queries served
+by the sorted price index (get_item_by_price, get_items_in_price_range over
+a 1-unit band, get_cheapest(10)), and reports the mean cost of each. Lookups
+and validation by id are dict operations and stay flat from 10 items to 1M.
+Add and remove also update the two sorted price indexes, so they grow with
+the logarithm of the wishlist size. The price queries grow with the number
+of matches, not the wishlist.
+
+Usage:
+    python benchmarks/wishlist_model.py [--sizes 10 100 1000 10000 100000 1000000] [--ops 1000]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ebay.models.item_model import Item
+from ebay.models.wishlist_model import WishlistModel
+
+
+def make_item(item_id: int) -> Item:
+    return Item(item_id, f"v1|{item_id}|0", f"Item {item_id}", 10.0 + item_id % 500, 1, 0, 6.0)
+
+
+def time_per_op(fn, args) -> float:
+    started = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - started) / len(args) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=1000, help="Operations timed per size")
+    args = parser.parse_args()
+
+    # The model logs every operation; keep the logging cost out of the measurement
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+
+    print(f"{'items':>10} {'add':>10} {'get':>10} {'validate':>10} {'remove':>10} "
+          f"{'by price':>10} {'range':>10} {'cheapest':>10}   (microseconds per op)")
+    for size in args.sizes:
+        wishlist = WishlistModel()
+        for item_id in range(size):
+            wishlist.add_item_to_wishlist(make_item(item_id))
+
+        sample = rng.sample(range(size), min(size, args.ops))
+        new_items = [make_item(size + n) for n in range(len(sample))]
+        add = time_per_op(wishlist.add_item_to_wishlist, new_items)
+        get = time_per_op(wishlist.get_item_by_item_id, sample)
+        validate = time_per_op(wishlist.validate_item_id, sample)
+        prices = [10 + item_id % 500 for item_id in sample]
+        by_price = time_per_op(wishlist.get_item_by_price, prices)
+        price_range = time_per_op(lambda price: wishlist.get_items_in_price_range(price, price + 1), prices)
+        cheapest = time_per_op(wishlist.get_cheapest, [10] * len(sample))
+        remove = time_per_op(wishlist.remove_item_by_item_id, sample)
+        print(f"{size:>10,} {add:>10.2f} {get:>10.2f} {validate:>10.2f} {remove:>10.2f} "
+              f"{by_price:>10.2f} {price_range:>10.2f} {cheapest:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,38 @@
+import math
 import sqlite3
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
 from ebay.utils.logger import configure_logger
-from ebay.utils.sql_utils import get_db_connection
-from ebay.services.ebay_client import search_item_by_id
+from ebay.utils.sql_utils import DB_FETCH_SIZE, get_db_connection
+from ebay.services.ebay_client import BATCH_MAX_WORKERS, GET_ITEMS_MAX_IDS, get_item_details, get_items_details
+from ebay.services.rate_limiter import RateLimitExceeded
+from ebay.services.resilience import CircuitOpenError
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Rows per executemany call when bulk loading items
+BULK_CHUNK_SIZE = 1000
+
+# Items per commit when hydrating items from eBay ids
+HYDRATE_COMMIT_SIZE = 200
+
+_UPSERT_ITEM_SQL = """
+    INSERT INTO items (ebay_item_id, title, price, available_quantity, sold_quantity, alert_price)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ebay_item_id) DO UPDATE SET
+        title = excluded.title,
+        price = excluded.price,
+        available_quantity = excluded.available_quantity,
+        sold_quantity = excluded.sold_quantity,
+        alert_price = excluded.alert_price,
+        deleted = FALSE
+"""
+
 
 @dataclass
 class Item:
@@ -32,6 +56,29 @@ class Item:
         # Set default alert_price to 60% of the original price if not provided
         self.alert_price = self.price * 0.6
 
+
+@dataclass
+class CompactItem:
+    """
+    An Item without a per-instance __dict__, for holding many items in memory.
+
+    It has the same fields and validation as Item. Dropping the __dict__
+    saves about 50 bytes per instance on Python 3.11+, and a few hundred on
+    older versions. For large collections, ItemTable
+    (ebay.models.item_table) is much smaller.
+    """
+    __slots__ = ("id", "ebay_item_id", "title", "price", "available_quantity", "sold_quantity", "alert_price")
+
+    id: int
+    ebay_item_id: str
+    title: str
+    price: float
+    available_quantity: int
+    sold_quantity: int
+    alert_price: float
+
+    __post_init__ = Item.__post_init__
+
 def create_item(ebay_item_id: str, 
                 title: str, 
                 price: float, 
@@ -62,29 +109,23 @@ def create_item(ebay_item_id: str,
        raise sqlite3.Error(f"Database error: {str(e)}")
 
 def create_item_ebay_id(ebay_item_id):
-    data = search_item_by_id(ebay_item_id=ebay_item_id)
+    data = get_item_details(ebay_item_id)
     if not data:
         raise ValueError(f"No data found for ebay item id: {ebay_item_id}")
 
     try:
 
-        # Getting and parsing the data from the json
-        title = data.get("title")
+        # Getting the parsed data from the shared item cache
+        title = data["title"]
         if not title:
             raise ValueError("Title is missing from item data")
         
-        price_info = data.get("price", {})
-        price = float(price_info.get("value", 0))
+        price = data["price"]
         if price <= 0:
             raise ValueError(f"Invalid price: {price}")
 
-        estimated_availabilities = data.get("estimatedAvailabilities", [])
-        if estimated_availabilities:
-            available_quantity = estimated_availabilities[0].get("estimatedAvailableQuantity")
-            sold_quantity = estimated_availabilities[0].get("estimatedSoldQuantity")
-        else:
-            available_quantity = 0
-            sold_quantity = 0
+        available_quantity = data["available_quantity"]
+        sold_quantity = data["sold_quantity"]
 
         alert_price = price * 0.6
 
@@ -119,6 +160,294 @@ def create_item_ebay_id(ebay_item_id):
         logger.error("Database error while creating item: %s", str(e))
         raise sqlite3.Error(f"Database error: {str(e)}")
 
+def validate_item_row(row: dict) -> tuple:
+    """
+    Validates and normalizes one item row for a bulk insert.
+
+    Numbers may be given as strings, as they are when read from CSV. The
+    alert price defaults to 60% of the price when it is missing.
+
+    Args:
+        row (dict): The item's ebay_item_id, title, price, available_quantity,
+            and optionally sold_quantity and alert_price.
+
+    Returns:
+        tuple: The values in the column order of the items table.
+
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"Invalid row: {row!r} (must be an object).")
+
+    ebay_item_id = row.get("ebay_item_id")
+    if not isinstance(ebay_item_id, str) or not ebay_item_id.strip():
+        raise ValueError("ebay_item_id is required")
+    title = row.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("title is required")
+
+    price = _to_number(row.get("price"), float)
+    if price is None or price <= 0:
+        raise ValueError(f"Invalid price: {row.get('price')} (must be a positive number).")
+    available_quantity = _to_number(row.get("available_quantity"), int)
+    if available_quantity is None or available_quantity < 0:
+        raise ValueError(f"Invalid quantity: {row.get('available_quantity')} (must be a non-negative integer).")
+    sold_quantity = _to_number(row.get("sold_quantity", 0), int)
+    if sold_quantity is None or sold_quantity < 0:
+        raise ValueError(f"Invalid sold quantity: {row.get('sold_quantity')} (must be a non-negative integer).")
+
+    alert_price = row.get("alert_price")
+    if alert_price in (None, ""):
+        alert_price = price * 0.6
+    else:
+        alert_price = _to_number(alert_price, float)
+        if alert_price is None or alert_price < 0:
+            raise ValueError(f"Invalid alert price: {row.get('alert_price')} (must be a non-negative number).")
+
+    return (ebay_item_id.strip(), title.strip(), price, available_quantity, sold_quantity, alert_price)
+
+
+def _to_number(value, kind: type) -> Optional[float]:
+    """
+    Converts an int, float or numeric string to `kind`, or returns None if it is not one.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value.strip()) if kind is float else int(value.strip())
+        except ValueError:
+            return None
+    if kind is int:
+        return value if isinstance(value, int) else None
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def create_items_bulk(rows: Iterable[dict], chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """
+    Inserts or updates many items in one transaction.
+
+    Rows are validated as they are read, so `rows` can be a generator over a
+    large file. Valid rows are written in chunks with executemany. A row whose
+    ebay_item_id already exists updates that item (and restores it if it was
+    deleted) instead of failing the import; invalid rows are skipped and
+    reported. Either every valid row is written or, on a database error, none is.
+
+    Args:
+        rows (iterable[dict]): The items to load, as accepted by validate_item_row.
+        chunk_size (int): The number of rows per executemany call.
+
+    Returns:
+        dict: Counts of created, updated and failed rows, and a result for every
+        row with its index, ebay_item_id, status and any error.
+
+    Raises:
+        sqlite3.Error: If the database write fails. Nothing is committed.
+    """
+    results = []
+    seen = set()
+    counts = {"created": 0, "updated": 0, "failed": 0}
+    rows = iter(enumerate(rows))
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                chunk_results = []
+                valid = []
+                for index, row in chunk:
+                    try:
+                        values = validate_item_row(row)
+                    except ValueError as e:
+                        ebay_item_id = row.get("ebay_item_id") if isinstance(row, dict) else None
+                        chunk_results.append({"row": index, "ebay_item_id": ebay_item_id,
+                                              "status": "error", "error": str(e)})
+                        counts["failed"] += 1
+                        continue
+                    valid.append(values)
+                    chunk_results.append({"row": index, "ebay_item_id": values[0]})
+                results.extend(chunk_results)
+                if not valid:
+                    continue
+
+                # Ids already in the table (or earlier in this import) are updates rather than inserts
+                existing = _existing_ebay_item_ids(cursor, {values[0] for values in valid} - seen)
+
+                cursor.executemany(_UPSERT_ITEM_SQL, valid)
+
+                for result in chunk_results:
+                    if "status" not in result:
+                        ebay_item_id = result["ebay_item_id"]
+                        result["status"] = "updated" if ebay_item_id in existing or ebay_item_id in seen else "created"
+                        seen.add(ebay_item_id)
+                        counts[result["status"]] += 1
+
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error("Database error while bulk loading items: %s", str(e))
+        raise sqlite3.Error(f"Database error: {str(e)}")
+
+    logger.info("Bulk loaded items: %d created, %d updated, %d failed",
+                counts["created"], counts["updated"], counts["failed"])
+    return {**counts, "results": results}
+
+
+def _existing_ebay_item_ids(cursor: sqlite3.Cursor, ebay_item_ids: Iterable[str],
+                            live_only: bool = False) -> set:
+    """
+    Returns the subset of `ebay_item_ids` that already have a row in the items table.
+    """
+    ids = list(ebay_item_ids)
+    existing = set()
+    for start in range(0, len(ids), 500):
+        batch = ids[start:start + 500]
+        cursor.execute(
+            f"SELECT ebay_item_id FROM items WHERE ebay_item_id IN ({','.join('?' * len(batch))})"
+            + (" AND deleted = FALSE" if live_only else ""),
+            batch
+        )
+        existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+
+def create_items_ebay_ids(ebay_item_ids: Iterable[str],
+                          max_workers: int = BATCH_MAX_WORKERS,
+                          commit_size: int = HYDRATE_COMMIT_SIZE,
+                          progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """
+    Adds many items to the catalog from their eBay ids, the batch form of create_item_ebay_id.
+
+    Ids already in the catalog are skipped, so an interrupted run can simply
+    be started again. The rest are fetched from eBay in getItems groups by up
+    to `max_workers` threads, and the parsed items are written by the calling
+    thread alone, committing every `commit_size` items on a connection checked
+    out for that commit only. A crash therefore loses at most the items not yet
+    committed. Items that eBay does not return or that fail validation are
+    reported and do not stop the run.
+
+    If the rate limiter, the daily quota or a circuit breaker rejects a call,
+    the run stops: no new groups are fetched, the items already fetched are
+    committed, and the rest are left pending for a later run.
+
+    Args:
+        ebay_item_ids (iterable[str]): The eBay item IDs to add.
+        max_workers (int): The maximum number of concurrent eBay calls.
+        commit_size (int): The number of items written per transaction.
+        progress (callable, optional): Called as progress(done, total) after
+            every commit, with the number of ids processed so far.
+
+    Returns:
+        dict: The total number of distinct ids, counts of skipped, created,
+        failed and pending ids, a result per processed id with its status and
+        any error, and `stopped`, which is None unless the run was stopped
+        early, in which case it holds the error and its retry_after.
+
+    Raises:
+        sqlite3.Error: If a database write fails. Batches already committed are kept.
+    """
+    ebay_item_ids = list(dict.fromkeys(ebay_item_id.strip() for ebay_item_id in ebay_item_ids
+                                       if ebay_item_id and ebay_item_id.strip()))
+    counts = {"skipped": 0, "created": 0, "failed": 0, "pending": 0}
+    results = []
+    stopped = None
+
+    try:
+        with get_db_connection() as conn:
+            existing = _existing_ebay_item_ids(conn.cursor(), ebay_item_ids, live_only=True)
+        pending = [ebay_item_id for ebay_item_id in ebay_item_ids if ebay_item_id not in existing]
+        counts["skipped"] = len(ebay_item_ids) - len(pending)
+        if counts["skipped"]:
+            logger.info("Skipping %d eBay ids already in the catalog", counts["skipped"])
+
+        total = len(ebay_item_ids)
+        groups = iter([pending[i:i + GET_ITEMS_MAX_IDS] for i in range(0, len(pending), GET_ITEMS_MAX_IDS)])
+        batch, batch_results = [], []
+
+        def flush():
+            if batch:
+                with get_db_connection() as conn:
+                    conn.executemany(_UPSERT_ITEM_SQL, batch)
+                    conn.commit()
+            for result in batch_results:
+                if result["status"] == "created":
+                    counts["created"] += 1
+            results.extend(batch_results)
+            batch.clear()
+            batch_results.clear()
+            done = counts["skipped"] + len(results)
+            logger.info("Hydrated %d of %d eBay ids", done, total)
+            if progress is not None:
+                progress(done, total)
+
+        # Keep a bounded number of groups in flight so memory stays flat for long id lists
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            in_flight = {executor.submit(get_items_details, group, 1)
+                         for group in islice(groups, max(1, max_workers) * 2)}
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    try:
+                        hydrated = future.result()
+                    except (RateLimitExceeded, CircuitOpenError) as e:
+                        if stopped is None:
+                            stopped = {"error": str(e), "retry_after": round(e.retry_after, 2)}
+                            logger.warning("Stopping eBay id hydration, retry after %.0fs: %s",
+                                           e.retry_after, str(e))
+                            for queued in in_flight:
+                                queued.cancel()
+                        continue
+                    for details in hydrated:
+                        result = _hydrated_row(details)
+                        if result["status"] == "error":
+                            counts["failed"] += 1
+                            batch_results.append(result)
+                            continue
+                        batch.append(result.pop("values"))
+                        batch_results.append(result)
+                    next_group = None if stopped else next(groups, None)
+                    if next_group is not None:
+                        in_flight.add(executor.submit(get_items_details, next_group, 1))
+                    if len(batch_results) >= commit_size:
+                        flush()
+                in_flight = {future for future in in_flight if not future.cancelled()}
+        if batch_results or not results:
+            flush()
+    except sqlite3.Error as e:
+        logger.error("Database error while hydrating items: %s", str(e))
+        raise sqlite3.Error(f"Database error: {str(e)}")
+
+    counts["pending"] = len(ebay_item_ids) - counts["skipped"] - len(results)
+    logger.info("Hydrated items from eBay ids: %d created, %d skipped, %d failed, %d pending",
+                counts["created"], counts["skipped"], counts["failed"], counts["pending"])
+    return {"total": len(ebay_item_ids), **counts, "results": results, "stopped": stopped}
+
+
+def _hydrated_row(details: dict) -> dict:
+    """
+    Turns one get_items_details entry into a result, with the row values when it is valid.
+    """
+    ebay_item_id = details.get("ebay_item_id")
+    if "error" in details:
+        return {"ebay_item_id": ebay_item_id, "status": "error", "error": details["error"]}
+    try:
+        values = validate_item_row({
+            **details,
+            # eBay leaves out the estimates for some listings
+            "available_quantity": details.get("available_quantity") or 0,
+            "sold_quantity": details.get("sold_quantity") or 0,
+        })
+    except ValueError as e:
+        return {"ebay_item_id": ebay_item_id, "status": "error", "error": str(e)}
+    return {"ebay_item_id": ebay_item_id, "status": "created", "values": values}
+
+
 def delete_item(item_id: int) -> None:
    try:
        with get_db_connection() as conn:
@@ -182,7 +511,28 @@ def get_item_by_id(item_id: int) -> Item:
 
 
 
-def get_all_items() -> list[dict]:
+def get_all_items(limit: Optional[int] = None, after: Optional[int] = None) -> list[dict]:
+   """
+   Returns the non-deleted items in the catalog.
+
+   Passing `limit` or `after` returns one page in id order instead of the
+   whole catalog: the items with an id greater than `after`, at most `limit`
+   of them. Use the id of the last item as `after` to get the next page.
+
+   Args:
+       limit (int, optional): The maximum number of items to return.
+       after (int, optional): Only return items with a greater id.
+
+   Returns:
+       list[dict]: The items.
+   """
+   if limit is not None or after is not None:
+       try:
+           return list(iter_all_items(after=after, limit=limit))
+       except sqlite3.Error as e:
+           logger.error("Database error while retrieving items after ID %s: %s", after, str(e))
+           raise e
+
    try:
        with get_db_connection() as conn:
            cursor = conn.cursor()
@@ -219,6 +569,59 @@ def get_all_items() -> list[dict]:
        raise e
 
 
+def iter_all_items(after: Optional[int] = None, limit: Optional[int] = None,
+                   batch_size: int = DB_FETCH_SIZE) -> Iterator[dict]:
+   """
+   Yields the non-deleted items in id order, reading them a keyset page at a time.
+
+   Each page is read on a connection checked out just for that query, and the
+   connection is returned before the page is yielded, so a slow consumer does
+   not hold a pooled connection. Items added or deleted while iterating may or
+   may not be seen.
+
+   Args:
+       after (int, optional): Only yield items with a greater id.
+       limit (int, optional): The maximum number of items to yield.
+       batch_size (int): The number of rows read per page.
+
+   Yields:
+       dict: One item.
+   """
+   if limit is not None and limit < 0:
+       raise ValueError(f"Invalid limit: {limit} (must be a non-negative integer).")
+
+   after = after or 0
+   remaining = limit
+   while remaining is None or remaining > 0:
+       page_size = batch_size if remaining is None else min(batch_size, remaining)
+       with get_db_connection() as conn:
+           cursor = conn.cursor()
+           cursor.execute("""
+               SELECT id, ebay_item_id, title, price, available_quantity, sold_quantity, alert_price
+               FROM items
+               WHERE deleted = FALSE AND id > ?
+               ORDER BY id
+               LIMIT ?
+           """, (after, page_size))
+           rows = cursor.fetchall()
+
+       for row in rows:
+           yield {
+               "id": row[0],
+               "ebay_item_id": row[1],
+               "title": row[2],
+               "price": row[3],
+               "available_quantity": row[4],
+               "sold_quantity": row[5],
+               "alert_price": row[6]
+           }
+       if len(rows) < page_size:
+           return
+       after = rows[-1][0]
+       if remaining is not None:
+           remaining -= len(rows)
+
+
 def update_item_quantity(item_id: int, quantity: int) -> None:
    if not isinstance(quantity, int) or quantity < 0:
        raise ValueError(f"Invalid quantity: {quantity} (must be a non-negative integer).")
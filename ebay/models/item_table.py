@@ -0,0 +1,328 @@
+"""
+Columnar, memory-compact storage for large collections of items.
+
+An Item costs around 390 bytes with its strings and boxed numbers.
+ItemTable keeps the same fields in typed NumPy arrays instead: ids and
+prices as 8-byte numbers, quantities as 4-byte integers, eBay item ids as
+fixed-width bytes. Titles are interned, so each distinct title is stored
+once and rows hold a 4-byte code. A row then costs about 55 bytes when
+titles repeat. When every title is distinct, the title text dominates and a
+row costs about 230 bytes. See benchmarks/item_memory.py.
+
+Rows are read through ItemRow, a two-slot view that reads the columns on
+attribute access; nothing is copied until a caller asks for an Item. The
+numeric columns are also exposed as read-only arrays, e.g. to load an
+AlertEngine without building any per-item objects.
+
+Items are validated in bulk as they are added, with the rules of
+Item.__post_init__ plus those the typed columns need: ids and quantities
+must be whole numbers, and ids must be unique within the table. Unlike Item,
+a given alert price is kept; only a missing one (None or NaN) defaults to 60%
+of the price.
+"""
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from ebay.models.item_model import Item
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+_QUANTITY_MAX = np.iinfo(np.int32).max
+
+
+class ItemRow:
+    """
+    A read-only view of one row of an ItemTable.
+    """
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ItemTable", row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return int(self._table._ids[self._row])
+
+    @property
+    def ebay_item_id(self) -> str:
+        return self._table._ebay_item_ids[self._row].decode()
+
+    @property
+    def title(self) -> str:
+        return self._table._titles[self._table._title_codes[self._row]]
+
+    @property
+    def price(self) -> float:
+        return float(self._table._prices[self._row])
+
+    @property
+    def available_quantity(self) -> int:
+        return int(self._table._available_quantities[self._row])
+
+    @property
+    def sold_quantity(self) -> int:
+        return int(self._table._sold_quantities[self._row])
+
+    @property
+    def alert_price(self) -> float:
+        return float(self._table._alert_prices[self._row])
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "ebay_item_id": self.ebay_item_id,
+            "title": self.title,
+            "price": self.price,
+            "available_quantity": self.available_quantity,
+            "sold_quantity": self.sold_quantity,
+            "alert_price": self.alert_price,
+        }
+
+    def to_item(self) -> Item:
+        """
+        Copies the row into an Item, keeping its alert price.
+        """
+        item = Item(self.id, self.ebay_item_id, self.title, self.price,
+                    self.available_quantity, self.sold_quantity, self.alert_price)
+        item.alert_price = self.alert_price
+        return item
+
+    def __repr__(self) -> str:
+        return f"ItemRow({self.to_dict()})"
+
+
+class ItemTable:
+    """
+    Items stored column by column in typed arrays, with interned titles.
+
+    Append-only. Not thread-safe; the owner serializes writes.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity (int): The number of items to allocate room for up front.
+        """
+        self._size = 0
+        self._titles: List[str] = []
+        self._title_codes_by_title: Dict[str, int] = {}
+        self._sorted_ids: Optional[np.ndarray] = None
+        self._sorted_rows: Optional[np.ndarray] = None
+        self._allocate(max(1, capacity), id_width=1)
+
+    @classmethod
+    def from_items(cls, items: Iterable) -> "ItemTable":
+        """
+        Builds a table from Items, CompactItems or any objects with the Item fields.
+        """
+        return cls.from_rows((item.id, item.ebay_item_id, item.title, item.price, item.available_quantity,
+                              item.sold_quantity, item.alert_price) for item in items)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> "ItemTable":
+        """
+        Builds a table from tuples in Item field order, e.g. rows read from the items table.
+        """
+        rows = list(rows)
+        table = cls(capacity=len(rows))
+        if rows:
+            table.extend(*zip(*rows))
+        return table
+
+    def _allocate(self, capacity: int, id_width: int) -> None:
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._ebay_item_ids = np.zeros(capacity, dtype=f"S{id_width}")
+        self._title_codes = np.zeros(capacity, dtype=np.int32)
+        self._prices = np.zeros(capacity)
+        self._available_quantities = np.zeros(capacity, dtype=np.int32)
+        self._sold_quantities = np.zeros(capacity, dtype=np.int32)
+        self._alert_prices = np.zeros(capacity)
+
+    def _columns(self) -> tuple:
+        return (self._ids, self._ebay_item_ids, self._title_codes, self._prices,
+                self._available_quantities, self._sold_quantities, self._alert_prices)
+
+    def _grow(self, needed: int, id_width: int) -> None:
+        capacity = len(self._ids)
+        width = self._ebay_item_ids.dtype.itemsize
+        if needed <= capacity and id_width <= width:
+            return
+        while capacity < needed:
+            capacity *= 2
+        n = self._size
+        old = self._columns()
+        self._allocate(capacity, max(width, id_width))
+        for new_column, old_column in zip(self._columns(), old):
+            new_column[:n] = old_column[:n]
+
+    def extend(self, ids: Sequence[int], ebay_item_ids: Sequence[str], titles: Sequence[str],
+               prices: Sequence[float], available_quantities: Sequence[int], sold_quantities: Sequence[int],
+               alert_prices: Optional[Sequence[Optional[float]]] = None) -> None:
+        """
+        Appends items given column by column, validating them in bulk.
+
+        Args:
+            ids (sequence[int]): The item ids.
+            ebay_item_ids (sequence[str]): The eBay item ids.
+            titles (sequence[str]): The titles.
+            prices (sequence[float]): The prices.
+            available_quantities (sequence[int]): The available quantities.
+            sold_quantities (sequence[int]): The sold quantities.
+            alert_prices (sequence[float], optional): The alert prices. Missing
+                ones (None or NaN) default to 60% of the price.
+
+        Raises:
+            ValueError: If the columns differ in length or a value is invalid.
+                Nothing is appended.
+        """
+        n = len(ids)
+        columns = (ebay_item_ids, titles, prices, available_quantities, sold_quantities)
+        if any(len(column) != n for column in columns) or (alert_prices is not None and len(alert_prices) != n):
+            raise ValueError("All columns must have the same length.")
+        if n == 0:
+            return
+
+        ids = self._integers(ids, "Item id must be an integer")
+        _, first_rows, counts = np.unique(ids, return_index=True, return_counts=True)
+        duplicated = np.ones(n, dtype=bool)
+        duplicated[first_rows[counts == 1]] = False
+        self._check(~duplicated & ~np.isin(ids, self._ids[:self._size]), ids, "Item id must be unique")
+
+        prices = np.asarray(prices, dtype=float)
+        available_quantities = self._integers(available_quantities, "Available quantity must be an integer")
+        sold_quantities = self._integers(sold_quantities, "Sold quantity must be an integer")
+        self._check(prices >= 0, prices, "Price must be non-negative")
+        self._check((available_quantities >= 0) & (available_quantities <= _QUANTITY_MAX), available_quantities,
+                    "Available quantity must be a non-negative 32-bit integer")
+        self._check((sold_quantities >= 0) & (sold_quantities <= _QUANTITY_MAX), sold_quantities,
+                    "Sold quantity must be a non-negative 32-bit integer")
+
+        alert_prices = (np.full(n, np.nan) if alert_prices is None
+                        else np.array([np.nan if price is None else price for price in alert_prices], dtype=float))
+        missing = np.isnan(alert_prices)
+        alert_prices[missing] = prices[missing] * 0.6
+        self._check(alert_prices >= 0, alert_prices, "Alert price must be non-negative")
+
+        if not all(isinstance(ebay_item_id, str) for ebay_item_id in ebay_item_ids):
+            raise ValueError("eBay item ids must be strings.")
+        for title in titles:
+            if not isinstance(title, str):
+                raise ValueError(f"Invalid title: {title!r} (must be a string).")
+        encoded_ids = np.array([ebay_item_id.encode() for ebay_item_id in ebay_item_ids], dtype=bytes)
+        title_codes = np.fromiter((self._intern(title) for title in titles), dtype=np.int32, count=n)
+
+        start = self._size
+        self._grow(start + n, encoded_ids.dtype.itemsize)
+        end = start + n
+        self._ids[start:end] = ids
+        self._ebay_item_ids[start:end] = encoded_ids
+        self._title_codes[start:end] = title_codes
+        self._prices[start:end] = prices
+        self._available_quantities[start:end] = available_quantities
+        self._sold_quantities[start:end] = sold_quantities
+        self._alert_prices[start:end] = alert_prices
+        self._size = end
+        self._sorted_ids = self._sorted_rows = None
+
+    def append(self, item) -> None:
+        """
+        Appends one Item, CompactItem or object with the Item fields.
+        """
+        self.extend([item.id], [item.ebay_item_id], [item.title], [item.price], [item.available_quantity],
+                    [item.sold_quantity], [item.alert_price])
+
+    @staticmethod
+    def _check(valid: np.ndarray, values: np.ndarray, message: str) -> None:
+        bad = np.flatnonzero(~valid)
+        if len(bad):
+            row = int(bad[0])
+            raise ValueError(f"{message}, got {values[row]} (row {row})")
+
+    @classmethod
+    def _integers(cls, values: Sequence, message: str) -> np.ndarray:
+        """
+        Converts a column to int64, rejecting anything but whole numbers instead of truncating.
+        """
+        array = np.asarray(values)
+        if array.dtype.kind in "iu":
+            return array.astype(np.int64)
+        if array.dtype.kind != "f":
+            for row, value in enumerate(values):
+                if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+                    raise ValueError(f"{message}, got {value!r} (row {row})")
+            array = np.asarray(values, dtype=float)
+        cls._check(np.isfinite(array) & (array == np.trunc(array)), array, message)
+        return array.astype(np.int64)
+
+    def _intern(self, title: str) -> int:
+        code = self._title_codes_by_title.get(title)
+        if code is None:
+            code = self._title_codes_by_title[title] = len(self._titles)
+            self._titles.append(title)
+        return code
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[ItemRow]:
+        for row in range(self._size):
+            yield ItemRow(self, row)
+
+    def __getitem__(self, row: int) -> ItemRow:
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError(f"Row {row} is out of range for a table of {self._size} items")
+        return ItemRow(self, row)
+
+    def find(self, item_id: int) -> Optional[ItemRow]:
+        """
+        Looks an item up by id with a binary search over a sorted copy of the ids,
+        rebuilt on the first lookup after items are added.
+
+        Returns:
+            ItemRow: The item's row, or None if it is not in the table.
+        """
+        if self._sorted_ids is None:
+            self._sorted_rows = np.argsort(self._ids[:self._size], kind="stable")
+            self._sorted_ids = self._ids[self._sorted_rows]
+        position = int(np.searchsorted(self._sorted_ids, item_id))
+        if position < self._size and self._sorted_ids[position] == item_id:
+            return ItemRow(self, int(self._sorted_rows[position]))
+        return None
+
+    def _view(self, column: np.ndarray) -> np.ndarray:
+        view = column[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._view(self._ids)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._view(self._prices)
+
+    @property
+    def alert_prices(self) -> np.ndarray:
+        return self._view(self._alert_prices)
+
+    @property
+    def available_quantities(self) -> np.ndarray:
+        return self._view(self._available_quantities)
+
+    @property
+    def sold_quantities(self) -> np.ndarray:
+        return self._view(self._sold_quantities)
+
+    @property
+    def distinct_titles(self) -> int:
+        return len(self._titles)
@@ -0,0 +1,267 @@
+"""
+Price history for catalog items.
+
+Every observed price is appended to the price_history table; nothing is
+overwritten. A trigger on that table keeps hourly and daily rollups
+(min/max/avg/last per bucket) in price_rollups up to date as rows are
+inserted, and history queries are served from the rollups, so a year of
+daily points is one short index range scan however often the item was polled.
+"""
+from datetime import datetime, timezone
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Union
+
+from ebay.utils.logger import configure_logger
+from ebay.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Observations buffered by PriceHistoryWriter before they are written
+HISTORY_BATCH_SIZE = int(os.getenv("PRICE_HISTORY_BATCH_SIZE", 500))
+
+# Rollup bucket widths in seconds, as maintained by the price_history_rollup trigger
+RESOLUTIONS = {"hour": 3600, "day": 86400}
+
+# "auto" resolution uses hourly points for ranges up to this long, daily beyond
+AUTO_HOURLY_MAX_RANGE = 7 * 86400
+
+# Range returned when the caller gives no start
+DEFAULT_HISTORY_RANGE = 7 * 86400
+
+Timestamp = Union[int, float, str, datetime]
+
+
+def parse_timestamp(value: Timestamp) -> int:
+    """
+    Converts unix seconds, a datetime or an ISO 8601 string to unix seconds.
+
+    Naive datetimes and ISO strings without an offset are taken as UTC.
+
+    Raises:
+        ValueError: If the value is not a valid time.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(float(text))
+        except ValueError:
+            pass
+        try:
+            value = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {value!r} (use unix seconds or ISO 8601).")
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return int(value)
+    raise ValueError(f"Invalid timestamp: {value!r}")
+
+
+def format_timestamp(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _observation_row(observation: dict, now: int) -> tuple:
+    item_id = observation.get("item_id")
+    if isinstance(item_id, bool) or not isinstance(item_id, int):
+        raise ValueError(f"Invalid item id: {item_id!r} (must be an integer).")
+    price = observation.get("price")
+    if isinstance(price, bool) or not isinstance(price, (int, float)) or not math.isfinite(price) or price < 0:
+        raise ValueError(f"Invalid price: {price} (must be a non-negative number).")
+    observed_at = observation.get("observed_at")
+    return (
+        item_id,
+        now if observed_at is None else parse_timestamp(observed_at),
+        float(price),
+        observation.get("available_quantity"),
+        observation.get("sold_quantity"),
+    )
+
+
+def record_prices(observations: Iterable[dict]) -> int:
+    """
+    Appends price observations to the history in one transaction.
+
+    An observation for an item at a second that is already recorded is
+    ignored, so re-sending a batch after a failure does not skew the rollups.
+
+    Args:
+        observations (iterable[dict]): Each has item_id and price, and optionally
+            available_quantity, sold_quantity and observed_at (default now).
+
+    Returns:
+        int: The number of observations recorded.
+
+    Raises:
+        ValueError: If an observation is invalid. Nothing is written.
+        sqlite3.Error: If the write fails. Nothing is written.
+    """
+    now = int(time.time())
+    rows = [_observation_row(observation, now) for observation in observations]
+    if not rows:
+        return 0
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO price_history (item_id, observed_at, price, available_quantity, sold_quantity)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (item_id, observed_at) DO NOTHING
+            """, rows)
+            recorded = cursor.rowcount
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error("Database error while recording prices: %s", str(e))
+        raise sqlite3.Error(f"Database error: {str(e)}")
+
+    logger.info("Recorded %d of %d price observations", recorded, len(rows))
+    return recorded
+
+
+class PriceHistoryWriter:
+    """
+    Buffers price observations and appends them in batches.
+
+    Pollers call add() for every price they see; the buffer is written with
+    record_prices once it holds `batch_size` observations, on flush(), and when
+    the writer is used as a context manager, on exit. Safe to share between threads.
+    """
+
+    def __init__(self, batch_size: int = HISTORY_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __enter__(self) -> "PriceHistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def add(self, item_id: int, price: float, available_quantity: Optional[int] = None,
+            sold_quantity: Optional[int] = None, observed_at: Optional[Timestamp] = None) -> None:
+        """
+        Queues one observation, writing the buffer if it is full.
+
+        Raises:
+            ValueError: If the observation is invalid. It is not queued.
+        """
+        now = int(time.time())
+        observation = {
+            "item_id": item_id,
+            "price": price,
+            "available_quantity": available_quantity,
+            "sold_quantity": sold_quantity,
+            "observed_at": now if observed_at is None else observed_at,
+        }
+        _observation_row(observation, now)
+        with self._lock:
+            self._buffer.append(observation)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Writes the buffered observations.
+
+        Returns:
+            int: The number of observations recorded.
+        """
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            recorded = record_prices(batch)
+        except sqlite3.Error:
+            # Keep the batch for the next flush; duplicates are ignored on retry
+            with self._lock:
+                self._buffer[:0] = batch
+            raise
+        self.recorded += recorded
+        return recorded
+
+
+def get_price_history(item_id: int, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None,
+                      resolution: str = "auto") -> dict:
+    """
+    Returns an item's price history from the rollups.
+
+    Args:
+        item_id (int): The catalog item id.
+        start (optional): The start of the range. Defaults to 7 days before `end`.
+        end (optional): The end of the range. Defaults to now.
+        resolution (str): "hour", "day", or "auto" for hourly points up to a
+            7 day range and daily points beyond.
+
+    Returns:
+        dict: The item id, the resolution used, the range and the points, one per
+        bucket with observations: its start time, min, max, avg and last price,
+        the last quantities and the number of samples.
+
+    Raises:
+        ValueError: If the range or resolution is invalid.
+    """
+    end = int(time.time()) if end is None else parse_timestamp(end)
+    start = end - DEFAULT_HISTORY_RANGE if start is None else parse_timestamp(start)
+    if start > end:
+        raise ValueError("The start of the range must not be after its end.")
+    if resolution == "auto":
+        resolution = "hour" if end - start <= AUTO_HOURLY_MAX_RANGE else "day"
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Invalid resolution: {resolution} (must be one of auto, {', '.join(RESOLUTIONS)}).")
+    width = RESOLUTIONS[resolution]
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # Start from the bucket containing `start` so a partial first bucket is included
+            cursor.execute("""
+                SELECT bucket, min_price, max_price, sum_price, samples, last_price,
+                       last_available_quantity, last_sold_quantity
+                FROM price_rollups
+                WHERE item_id = ? AND resolution = ? AND bucket BETWEEN ? AND ?
+                ORDER BY bucket
+            """, (item_id, width, start - start % width, end))
+            rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while retrieving price history for item %s: %s", item_id, str(e))
+        raise e
+
+    return {
+        "item_id": item_id,
+        "resolution": resolution,
+        "from": format_timestamp(start),
+        "to": format_timestamp(end),
+        "points": [
+            {
+                "time": format_timestamp(row[0]),
+                "min": row[1],
+                "max": row[2],
+                "avg": round(row[3] / row[4], 2),
+                "last": row[5],
+                "available_quantity": row[6],
+                "sold_quantity": row[7],
+                "samples": row[4],
+            }
+            for row in rows
+        ],
+    }
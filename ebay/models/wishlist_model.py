@@ -1,5 +1,11 @@
+from collections.abc import MutableSequence
+from itertools import count
 import logging
-from typing import List, Optional
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
 from ebay.models.item_model import Item
 from ebay.utils.logger import configure_logger
 
@@ -14,14 +20,45 @@ class WishlistModel:
     This class provides methods to add, remove, and retrieve items 
     from a wishlist. It also includes utility functions for validating
     item attributes and handling wishlist state.
+
+    Items are kept in a dict keyed by item ID, which preserves insertion
+    order, so lookups, duplicate checks and removals by ID are O(1).
+
+    Two sorted indexes, maintained on add and remove, answer price queries
+    with a binary search: one ordered by price and one by how far each price
+    is above its alert price. They are SortedLists, so keeping them up to
+    date costs O(log n) per add and remove rather than the O(n) of
+    inserting into a plain list. Entries are (key, sequence, item ID) tuples;
+    the sequence number keeps items with equal keys in insertion order. An
+    item's price must be changed through update_item_price so the indexes
+    stay in step.
     """
 
     def __init__(self):
         """
         Initializes the WishlistModel with an empty wishlist.
         """
-        self.wishlist: List[Item] = []
-        
+        self._items: Dict[int, Item] = {}
+        self._by_price: SortedList = SortedList()
+        self._by_alert_headroom: SortedList = SortedList()
+        self._index_keys: Dict[int, Tuple[tuple, tuple]] = {}
+        self._sequence = count()
+
+    @property
+    def wishlist(self) -> "WishlistView":
+        """
+        The items in the wishlist, in the order they were added.
+
+        A live list-like view: changes made through it, e.g. append or
+        assigning a new list to `wishlist`, go through the model and keep
+        the indexes up to date.
+        """
+        return WishlistView(self)
+
+    @wishlist.setter
+    def wishlist(self, items: Iterable[Item]) -> None:
+        self._set_items(items)
+
 
     ##################################################
     # Wishlist Management Functions
@@ -43,11 +80,12 @@ class WishlistModel:
             logger.error("Item is not a valid Item instance")
             raise TypeError("Item is not a valid Item instance")
 
-        if item.id in [existing_item.id for existing_item in self.wishlist]:
+        if item.id in self._items:
             logger.error("Item with ID %d already exists in the wishlist", item.id)
             raise ValueError(f"Item with ID {item.id} already exists in the wishlist")
 
-        self.wishlist.append(item)
+        self._items[item.id] = item
+        self._index(item)
         logger.info("Item with ID %d added to the wishlist", item.id)
 
     def remove_item_by_item_id(self, item_id: int) -> None:
@@ -64,15 +102,31 @@ class WishlistModel:
         self.check_if_empty()
         item_id = self.validate_item_id(item_id)
 
-        initial_length = len(self.wishlist)
-        self.wishlist = [item for item in self.wishlist if item.id != item_id]
-        
-        if len(self.wishlist) == initial_length:
-            logger.error("Item with ID %d not found in the wishlist", item_id)
-            raise ValueError(f"Item with ID {item_id} not found in the wishlist")
-        
+        del self._items[item_id]
+        self._unindex(item_id)
         logger.info("Item with ID %d removed from the wishlist", item_id)
 
+    def replace_item(self, item: Item) -> None:
+        """
+        Replaces the wishlist item with the same ID, keeping its position and re-indexing its prices.
+
+        Args:
+            item (Item): The new version of the item.
+
+        Raises:
+            TypeError: If the item is not a valid Item instance.
+            ValueError: If no item with the same 'id' is in the wishlist.
+        """
+        if not isinstance(item, Item):
+            logger.error("Item is not a valid Item instance")
+            raise TypeError("Item is not a valid Item instance")
+        item_id = self.validate_item_id(item.id)
+
+        self._items[item_id] = item
+        self._unindex(item_id)
+        self._index(item)
+        logger.info("Item with ID %d replaced in the wishlist", item_id)
+
     def clear_wishlist(self) -> None:
         """
         Clears all items from the wishlist. If the wishlist is already empty, logs a warning.
@@ -80,7 +134,7 @@ class WishlistModel:
         logger.info("Clearing wishlist")
         if self.get_wishlist_length() == 0:
             logger.warning("Clearing an already empty wishlist")
-        self.wishlist.clear()
+        self._reset()
         logger.info("Wishlist has been cleared")
 
     ##################################################
@@ -92,11 +146,11 @@ class WishlistModel:
         Retrieves all items in the wishlist.
         
         Returns:
-            list: A list of all items in the wishlist.
+            list: A list of all items in the wishlist, in the order they were added.
         """
         if self.check_if_empty():
             return []  # Return an empty list if the wishlist is empty
-        return self.wishlist
+        return list(self._items.values())
 
 
     def get_item_by_item_id(self, item_id: int) -> Optional[Item]:
@@ -112,7 +166,13 @@ class WishlistModel:
         self.check_if_empty()
         item_id = self.validate_item_id(item_id)
         logger.info("Getting item with ID %d from the wishlist", item_id)
-        return next((item for item in self.wishlist if item.id == item_id), None)
+        return self._items.get(item_id)
+
+    def has_item(self, item_id: int) -> bool:
+        """
+        Checks whether an item is in the wishlist, without raising if it is not.
+        """
+        return item_id in self._items
 
     def get_item_by_price(self, price: int) -> List[Item]:
         """
@@ -127,7 +187,9 @@ class WishlistModel:
         self.check_if_empty()
         price = self.validate_price(price)
 
-        matching_items = [item for item in self.wishlist if item.price == price]
+        start = self._by_price.bisect_left((price,))
+        end = self._by_price.bisect_right((price, math.inf))
+        matching_items = [self._items[item_id] for _, _, item_id in self._by_price[start:end]]
         if not matching_items:
             logger.error("No items found with price %d", price)
             raise ValueError(f"No items found with price {price}")
@@ -135,16 +197,141 @@ class WishlistModel:
         logger.info("Found %d item(s) with price %d", len(matching_items), price)
         return matching_items
 
+    def get_items_in_price_range(self, min_price: float, max_price: float) -> List[Item]:
+        """
+        Retrieves the items priced between min_price and max_price, inclusive.
+
+        Args:
+            min_price (float): The lowest price to include.
+            max_price (float): The highest price to include.
+
+        Returns:
+            list: The matching items, cheapest first.
+
+        Raises:
+            ValueError: If a bound is not a non-negative number or min_price is above max_price.
+        """
+        min_price = self.validate_price_bound(min_price)
+        max_price = self.validate_price_bound(max_price)
+        if min_price > max_price:
+            logger.error("Invalid price range: %s to %s", min_price, max_price)
+            raise ValueError(f"Invalid price range: {min_price} to {max_price}")
+
+        start = self._by_price.bisect_left((min_price,))
+        end = self._by_price.bisect_right((max_price, math.inf))
+        logger.info("Found %d item(s) priced between %s and %s", end - start, min_price, max_price)
+        return [self._items[item_id] for _, _, item_id in self._by_price[start:end]]
+
+    def get_cheapest(self, n: int) -> List[Item]:
+        """
+        Retrieves the n cheapest items in the wishlist.
+
+        Args:
+            n (int): The number of items to retrieve.
+
+        Returns:
+            list: Up to n items, cheapest first.
+
+        Raises:
+            ValueError: If n is not a positive integer.
+        """
+        if isinstance(n, bool) or not isinstance(n, int) or n <= 0:
+            logger.error("Invalid number of items: %s", n)
+            raise ValueError(f"Invalid number of items: {n}")
+        return [self._items[item_id] for _, _, item_id in self._by_price[:n]]
+
+    def get_items_below_alert(self) -> List[Item]:
+        """
+        Retrieves the items priced at or below their alert price.
+
+        Returns:
+            list: The matching items, furthest below their alert price first.
+        """
+        end = self._by_alert_headroom.bisect_right((0.0, math.inf))
+        logger.info("Found %d item(s) at or below their alert price", end)
+        return [self._items[item_id] for _, _, item_id in self._by_alert_headroom[:end]]
+
     def get_wishlist_length(self) -> int:
         """
         Returns the number of items in the wishlist.
         """
-        return len(self.wishlist)
+        return len(self._items)
+
+    def update_item_price(self, item_id: int, price: float, alert_price: Optional[float] = None) -> None:
+        """
+        Changes an item's price, and optionally its alert price, keeping the price indexes in order.
+
+        Args:
+            item_id (int): The ID of the item to update.
+            price (float): The new price.
+            alert_price (float, optional): The new alert price. Unchanged if not given.
+
+        Raises:
+            ValueError: If the item is not in the wishlist or a price is invalid.
+        """
+        item_id = self.validate_item_id(item_id)
+        item = self._items[item_id]
+        item.price = self.validate_price_bound(price)
+        if alert_price is not None:
+            item.alert_price = self.validate_price_bound(alert_price)
+        self._unindex(item_id)
+        self._index(item)
+        logger.info("Price of item with ID %d updated to %s", item_id, item.price)
 
     ##################################################
     # Utility Functions
     ##################################################
 
+    def _reset(self) -> None:
+        self._items.clear()
+        self._by_price.clear()
+        self._by_alert_headroom.clear()
+        self._index_keys.clear()
+
+    def _set_items(self, items: Iterable[Item]) -> None:
+        """
+        Replaces the wishlist with the given items, in order. On an invalid
+        or duplicate item the wishlist is left as it was.
+        """
+        items = list(items)
+        previous = list(self._items.values())
+        self._reset()
+        try:
+            for item in items:
+                self.add_item_to_wishlist(item)
+        except (TypeError, ValueError):
+            self._reset()
+            for item in previous:
+                self._items[item.id] = item
+                self._index(item)
+            raise
+
+    def _index(self, item: Item) -> None:
+        sequence = next(self._sequence)
+        headroom = math.inf if item.alert_price is None else item.price - item.alert_price
+        price_key = (item.price, sequence, item.id)
+        alert_key = (headroom, sequence, item.id)
+        self._by_price.add(price_key)
+        self._by_alert_headroom.add(alert_key)
+        self._index_keys[item.id] = (price_key, alert_key)
+
+    def _unindex(self, item_id: int) -> None:
+        price_key, alert_key = self._index_keys.pop(item_id)
+        self._by_price.remove(price_key)
+        self._by_alert_headroom.remove(alert_key)
+
+    def validate_price_bound(self, price: float) -> float:
+        """
+        Validates a price used in a range query or update, ensuring it is a non-negative number.
+
+        Raises:
+            ValueError: If the price is invalid.
+        """
+        if isinstance(price, bool) or not isinstance(price, (int, float)) or not math.isfinite(price) or price < 0:
+            logger.error("Invalid price: %s", price)
+            raise ValueError(f"Invalid price: {price}")
+        return float(price)
+
     def validate_item_id(self, item_id: int, check_in_wishlist: bool = True) -> int:
         """
         Validates the given item ID, ensuring it is a non-negative integer.
@@ -165,7 +352,7 @@ class WishlistModel:
             logger.error("Invalid item ID: %s", item_id)
             raise ValueError(f"Invalid item ID: {item_id}")
 
-        if check_in_wishlist and item_id not in [item.id for item in self.wishlist]:
+        if check_in_wishlist and item_id not in self._items:
             logger.error("Item with ID %d not found in the wishlist", item_id)
             raise ValueError(f"Item with ID {item_id} not found in the wishlist")
 
@@ -199,8 +386,70 @@ class WishlistModel:
         Returns:
             bool: True if the wishlist is empty, False otherwise.
         """
-        if not self.wishlist:
+        if not self._items:
             logger.error("Wishlist is empty")
             return True
         return False
 
+
+class WishlistView(MutableSequence):
+    """
+    The list-like view returned by WishlistModel.wishlist.
+
+    Appending and removing by item go through the model in O(log n).
+    Positional reads, inserts and assignments copy the items, O(n), as
+    they would on a list.
+    """
+
+    def __init__(self, model: WishlistModel):
+        self._model = model
+
+    def __len__(self) -> int:
+        return len(self._model._items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._model._items.values())
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, Item) and self._model._items.get(item.id) == item
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __setitem__(self, index, value) -> None:
+        items = list(self)
+        items[index] = value
+        self._model._set_items(items)
+
+    def __delitem__(self, index) -> None:
+        items = list(self)
+        removed = items[index] if isinstance(index, slice) else [items[index]]
+        for item in removed:
+            self._model.remove_item_by_item_id(item.id)
+
+    def insert(self, index: int, value: Item) -> None:
+        if index >= len(self):
+            self._model.add_item_to_wishlist(value)
+            return
+        items = list(self)
+        items.insert(index, value)
+        self._model._set_items(items)
+
+    def append(self, value: Item) -> None:
+        self._model.add_item_to_wishlist(value)
+
+    def remove(self, value: Item) -> None:
+        if value not in self:
+            raise ValueError(f"{value!r} is not in the wishlist")
+        self._model.remove_item_by_item_id(value.id)
+
+    def clear(self) -> None:
+        self._model._reset()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (WishlistView, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
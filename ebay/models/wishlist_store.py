@@ -0,0 +1,442 @@
+"""
+Persistent per-user wishlists with a write-through in-memory cache.
+
+Wishlists live in the wishlist table, one per user (user_id). Each worker
+keeps the wishlists of recently used users in memory as WishlistModels, at
+most `cache_size` of them, evicting the least recently used. Whole-wishlist
+reads are served from the cache, while pages and streams are read from
+SQLite by id so they never build the whole list. Writes go to SQLite first,
+a whole batch of items in one transaction, and are applied to the cached
+wishlist once committed.
+
+Other workers write to the same database, so before serving from the cache
+the store checks PRAGMA data_version on its connection, which changes only
+when another connection has committed. When it has, the store compares the
+per-user counters in wishlist_versions (bumped by triggers on every change
+to a user's rows) with the versions it cached and drops the wishlists that
+changed. Writes to other tables, e.g. by the price refresher, cost one small
+query and invalidate nothing.
+
+The store does all of its work on one pooled connection: a connection does
+not see its own commits in data_version, so the store's own writes do not
+invalidate its cache.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ebay.models.item_model import Item, validate_item_row
+from ebay.models.wishlist_model import WishlistModel
+from ebay.utils import sql_utils
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Users whose wishlists each worker keeps in memory
+WISHLIST_CACHE_USERS = int(os.getenv("WISHLIST_CACHE_USERS", 1000))
+
+# Values bound to one IN (...) query
+_QUERY_CHUNK = 500
+
+_COLUMNS = "id, ebay_item_id, title, price, available_quantity, sold_quantity, alert_price"
+
+
+def _row_to_item(row: tuple) -> Item:
+    item = Item(*row)
+    # Item defaults the alert price to 60% of the price; keep the stored one
+    item.alert_price = row[6]
+    return item
+
+
+def validate_user_id(user_id: int) -> int:
+    """
+    Raises:
+        ValueError: If the user ID is not a positive integer.
+    """
+    if isinstance(user_id, bool) or not isinstance(user_id, int) or user_id <= 0:
+        raise ValueError(f"Invalid user ID: {user_id} (must be a positive integer).")
+    return user_id
+
+
+class WishlistStore:
+    """
+    SQLite-backed wishlists for many users, cached per user with LRU eviction.
+
+    Safe to share between threads; calls are serialized on the store's connection.
+    """
+
+    def __init__(self, path: str, cache_size: int = WISHLIST_CACHE_USERS):
+        """
+        Args:
+            path (str): The SQLite database file.
+            cache_size (int): The number of users' wishlists to keep in memory.
+        """
+        if cache_size <= 0:
+            raise ValueError(f"Invalid cache_size: {cache_size} (must be a positive integer).")
+        self.path = path
+        self.cache_size = cache_size
+        # A single connection, so PRAGMA data_version is always read on the connection that wrote
+        self._pool = sql_utils.ConnectionPool(path, max_size=1)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._cache: "OrderedDict[int, Tuple[WishlistModel, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "transactions": 0,
+        }
+
+    ##################################################
+    # Reads
+    ##################################################
+
+    def get_items(self, user_id: int, after: Optional[int] = None, limit: Optional[int] = None) -> List[dict]:
+        """
+        Returns a user's wishlist in id order.
+
+        The whole wishlist is served from the cache. A page (`after` or `limit`
+        given) is read with a keyset query instead, so paging through a large
+        wishlist never builds the whole list.
+
+        Args:
+            user_id (int): The user.
+            after (int, optional): Only return items with a greater id.
+            limit (int, optional): The maximum number of items to return.
+
+        Raises:
+            ValueError: If the user ID is invalid.
+            sqlite3.Error: If the wishlist could not be read.
+        """
+        if after is None and limit is None:
+            return self._read(user_id, lambda model: [asdict(item) for item in model.get_all_items()])
+
+        user_id = validate_user_id(user_id)
+        with self._lock, self._connection() as conn:
+            cursor = conn.execute(f"""
+                SELECT {_COLUMNS} FROM wishlist
+                WHERE user_id = ? AND deleted = FALSE AND id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (user_id, after or 0, -1 if limit is None else limit))
+            return [asdict(_row_to_item(row)) for row in sql_utils.fetch_in_batches(cursor)]
+
+    def iter_items(self, user_id: int, after: Optional[int] = None, limit: Optional[int] = None,
+                   batch_size: int = sql_utils.DB_FETCH_SIZE) -> Iterator[dict]:
+        """
+        Yields a user's wishlist in id order, reading it a keyset page at a time.
+
+        The store's lock and connection are held only while a page is read,
+        not while the caller consumes it.
+
+        Args:
+            user_id (int): The user.
+            after (int, optional): Only yield items with a greater id.
+            limit (int, optional): The maximum number of items to yield.
+            batch_size (int): The number of items read per page.
+
+        Raises:
+            ValueError: If the user ID is invalid.
+            sqlite3.Error: If a page could not be read.
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            items = self.get_items(user_id, after, page_size)
+            yield from items
+            if len(items) < page_size:
+                return
+            after = items[-1]["id"]
+            if remaining is not None:
+                remaining -= len(items)
+
+    def get_wishlist(self, user_id: int) -> WishlistModel:
+        """
+        Returns a copy of a user's wishlist, loading it from the database on a cache miss.
+
+        Raises:
+            ValueError: If the user ID is invalid.
+            sqlite3.Error: If the wishlist could not be read.
+        """
+        def copy(model: WishlistModel) -> WishlistModel:
+            wishlist = WishlistModel()
+            for item in model.get_all_items():
+                wishlist.add_item_to_wishlist(_row_to_item(tuple(asdict(item).values())))
+            return wishlist
+
+        return self._read(user_id, copy)
+
+    ##################################################
+    # Writes
+    ##################################################
+
+    def add_items(self, user_id: int, items: Sequence[dict]) -> List[dict]:
+        """
+        Adds items to a user's wishlist in one transaction.
+
+        An item whose eBay item ID is already on the wishlist is updated in place.
+
+        Args:
+            user_id (int): The user.
+            items (sequence[dict]): Each has ebay_item_id, title, price,
+                available_quantity, and optionally sold_quantity and alert_price
+                (default 60% of the price).
+
+        Returns:
+            list[dict]: The stored items, with their wishlist ids, in the order given.
+
+        Raises:
+            ValueError: If the user ID or an item is invalid. Nothing is written.
+            sqlite3.Error: If the write fails. Nothing is written.
+        """
+        user_id = validate_user_id(user_id)
+        rows = [validate_item_row(item) for item in items]
+        if not rows:
+            return []
+
+        def write(cursor: sqlite3.Cursor) -> List[tuple]:
+            cursor.executemany("""
+                INSERT INTO wishlist (user_id, ebay_item_id, title, price, available_quantity, sold_quantity, alert_price)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (user_id, ebay_item_id) WHERE deleted = FALSE DO UPDATE SET
+                    title = excluded.title,
+                    price = excluded.price,
+                    available_quantity = excluded.available_quantity,
+                    sold_quantity = excluded.sold_quantity,
+                    alert_price = excluded.alert_price
+            """, [(user_id, *row) for row in rows])
+            ebay_item_ids = list(dict.fromkeys(row[0] for row in rows))
+            stored = {}
+            for start in range(0, len(ebay_item_ids), _QUERY_CHUNK):
+                chunk = ebay_item_ids[start:start + _QUERY_CHUNK]
+                cursor.execute(f"""
+                    SELECT {_COLUMNS} FROM wishlist
+                    WHERE user_id = ? AND deleted = FALSE AND ebay_item_id IN ({", ".join("?" * len(chunk))})
+                """, (user_id, *chunk))
+                stored.update((row[1], row) for row in cursor.fetchall())
+            return [stored[row[0]] for row in rows]
+
+        def apply(model: WishlistModel, stored: List[tuple]) -> None:
+            # Updated rows keep their id, so replace them in place; new rows
+            # get ids above every existing one, so appending keeps id order
+            for row in stored:
+                if model.has_item(row[0]):
+                    model.replace_item(_row_to_item(row))
+                else:
+                    model.add_item_to_wishlist(_row_to_item(row))
+
+        stored = self._write(user_id, write, apply)
+        logger.info("Added %d item(s) to the wishlist of user %d", len(rows), user_id)
+        return [asdict(_row_to_item(row)) for row in stored]
+
+    def add_item(self, user_id: int, item: dict) -> dict:
+        """
+        Adds one item to a user's wishlist. See add_items.
+        """
+        return self.add_items(user_id, [item])[0]
+
+    def remove_items(self, user_id: int, item_ids: Iterable[int]) -> int:
+        """
+        Removes items from a user's wishlist in one transaction.
+
+        Returns:
+            int: The number of items removed.
+
+        Raises:
+            ValueError: If the user ID is invalid or an item is not on the
+                user's wishlist. Nothing is removed.
+            sqlite3.Error: If the write fails. Nothing is removed.
+        """
+        user_id = validate_user_id(user_id)
+        item_ids = self._read(user_id, lambda model: [model.validate_item_id(item_id)
+                                                      for item_id in dict.fromkeys(item_ids)])
+        if not item_ids:
+            return 0
+
+        def write(cursor: sqlite3.Cursor) -> int:
+            cursor.executemany("UPDATE wishlist SET deleted = TRUE WHERE user_id = ? AND id = ? AND deleted = FALSE",
+                               [(user_id, item_id) for item_id in item_ids])
+            return cursor.rowcount
+
+        def apply(model: WishlistModel, removed: int) -> None:
+            for item_id in item_ids:
+                if model.has_item(item_id):
+                    model.remove_item_by_item_id(item_id)
+
+        removed = self._write(user_id, write, apply)
+        logger.info("Removed %d item(s) from the wishlist of user %d", removed, user_id)
+        return removed
+
+    def remove_item(self, user_id: int, item_id: int) -> None:
+        """
+        Removes one item from a user's wishlist. See remove_items.
+        """
+        self.remove_items(user_id, [item_id])
+
+    ##################################################
+    # Cache
+    ##################################################
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's hit, miss, eviction and invalidation counters and the number of write transactions.
+        """
+        with self._lock:
+            stats = dict(self._metrics)
+            stats.update({"size": len(self._cache), "maxsize": self.cache_size})
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._conn = None
+            self._data_version = None
+            self._pool.close()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Checks out the store's connection and drops cached wishlists changed by other connections.
+        Must be called with the lock held.
+        """
+        conn = self._pool.acquire()
+        try:
+            if conn is not self._conn:
+                # A replacement connection has its own data_version; nothing cached can be trusted
+                self._conn = conn
+                self._data_version = None
+                self._cache.clear()
+            self._sync(conn)
+            yield conn
+        finally:
+            self._pool.release(conn)
+
+    def _read(self, user_id: int, read: Callable[[WishlistModel], object]):
+        """
+        Runs `read` on a user's up-to-date cached wishlist, under the lock.
+        """
+        user_id = validate_user_id(user_id)
+        with self._lock, self._connection() as conn:
+            return read(self._cached(conn, user_id))
+
+    def _sync(self, conn: sqlite3.Connection) -> None:
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+
+        versions = self._versions(conn, list(self._cache))
+        for user_id, (_, version) in list(self._cache.items()):
+            if versions.get(user_id, 0) != version:
+                del self._cache[user_id]
+                self._metrics["invalidations"] += 1
+                logger.info("Wishlist of user %d changed in another connection; dropped from cache", user_id)
+
+    def _versions(self, conn: sqlite3.Connection, user_ids: List[int]) -> Dict[int, int]:
+        versions = {}
+        for start in range(0, len(user_ids), _QUERY_CHUNK):
+            chunk = user_ids[start:start + _QUERY_CHUNK]
+            versions.update(conn.execute(
+                f"SELECT user_id, version FROM wishlist_versions WHERE user_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ).fetchall())
+        return versions
+
+    def _cached(self, conn: sqlite3.Connection, user_id: int) -> WishlistModel:
+        entry = self._cache.get(user_id)
+        if entry is not None:
+            self._cache.move_to_end(user_id)
+            self._metrics["hits"] += 1
+            return entry[0]
+
+        self._metrics["misses"] += 1
+        # Read the version first: a commit landing between the two reads leaves
+        # the cached version behind, so the next check reloads the wishlist
+        version = self._versions(conn, [user_id]).get(user_id, 0)
+        model = WishlistModel()
+        cursor = conn.execute(
+            f"SELECT {_COLUMNS} FROM wishlist WHERE user_id = ? AND deleted = FALSE ORDER BY id", (user_id,))
+        for row in sql_utils.fetch_in_batches(cursor):
+            model.add_item_to_wishlist(_row_to_item(row))
+        self._store(user_id, model, version)
+        return model
+
+    def _store(self, user_id: int, model: WishlistModel, version: int) -> None:
+        self._cache[user_id] = (model, version)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self._metrics["evictions"] += 1
+
+    def _write(self, user_id: int, write: Callable[[sqlite3.Cursor], object],
+               apply: Callable[[WishlistModel, object], None]):
+        """
+        Runs `write` in one transaction, then applies the committed change to the cached wishlist.
+
+        The transaction takes the write lock up front, so the user's version
+        read at its start is the one the change is made on top of. The cached
+        wishlist is updated only if it was at that version; otherwise it is
+        dropped and reloaded on its next read.
+        """
+        with self._lock, self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                before = self._versions(conn, [user_id]).get(user_id, 0)
+                result = write(cursor)
+                after = self._versions(conn, [user_id]).get(user_id, 0)
+                conn.commit()
+            except sqlite3.Error as e:
+                self._cache.pop(user_id, None)
+                logger.error("Database error while writing the wishlist of user %d: %s", user_id, str(e))
+                raise
+            self._metrics["transactions"] += 1
+
+            entry = self._cache.get(user_id)
+            if entry is not None:
+                if entry[1] == before:
+                    apply(entry[0], result)
+                    self._store(user_id, entry[0], after)
+                else:
+                    del self._cache[user_id]
+                    self._metrics["invalidations"] += 1
+            return result
+
+
+_stores: Dict[str, WishlistStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_wishlist_store() -> WishlistStore:
+    """
+    Returns the wishlist store for the current DB_PATH, creating it on first use.
+    """
+    path = sql_utils.DB_PATH
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = _stores[path] = WishlistStore(path)
+    return store
+
+
+def close_wishlist_stores() -> None:
+    """
+    Closes every wishlist store and empties its cache, e.g. at shutdown or between tests.
+    """
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
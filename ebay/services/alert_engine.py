@@ -0,0 +1,235 @@
+"""
+Vectorized price-alert evaluation over the whole tracked catalog.
+
+The engine keeps the catalog in columnar NumPy arrays (item id, current
+price, alert price, last-notified time) and finds every triggered alert in
+one pass over them. Refreshed prices are written into the arrays in place,
+so a pass costs the same however the prices arrived.
+
+An alert fires when an armed item's price is at or below its alert price.
+Firing disarms the item (hysteresis): it only fires again after its price
+has recovered above alert_price * (1 + rearm_ratio) and dropped back, so a
+price hovering around the threshold does not fire on every refresh. On top
+of that, an item never fires twice within `cooldown` seconds.
+
+To keep a pass to a single comparison, the engine also keeps a headroom
+column, price - alert_price for armed items and +inf for disarmed ones, and
+updates it alongside the prices; the pass is then `headroom <= 0`.
+"""
+from dataclasses import dataclass
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Seconds before an item may fire again, even if it re-armed in between
+ALERT_COOLDOWN = float(os.getenv("ALERT_COOLDOWN", 3600))
+
+# How far above its alert price (as a fraction of it) a price must recover to re-arm the alert
+ALERT_REARM_RATIO = float(os.getenv("ALERT_REARM_RATIO", 0.05))
+
+
+@dataclass(frozen=True)
+class PriceAlert:
+    item_id: int
+    price: float
+    alert_price: float
+
+
+class AlertEngine:
+    """
+    Columnar price-alert state for the tracked catalog.
+
+    Not thread-safe; the owner (e.g. the price refresher) serializes calls.
+    """
+
+    def __init__(self,
+                 cooldown: float = ALERT_COOLDOWN,
+                 rearm_ratio: float = ALERT_REARM_RATIO,
+                 capacity: int = 1024,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            cooldown (float): The minimum seconds between two alerts for an item.
+            rearm_ratio (float): How far above the alert price a price must recover to re-arm.
+            capacity (int): The number of items to allocate room for up front.
+            clock (callable): Time source, overridable for tests.
+        """
+        if cooldown < 0 or rearm_ratio < 0:
+            raise ValueError(f"Invalid alert settings: cooldown={cooldown}, rearm_ratio={rearm_ratio} "
+                             "(must be non-negative).")
+        self.cooldown = cooldown
+        self.rearm_ratio = rearm_ratio
+        self._clock = clock
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.prices = np.full(capacity, np.nan)
+        self.alert_prices = np.full(capacity, np.nan)
+        self.last_notified = np.full(capacity, -np.inf)
+        self.armed = np.ones(capacity, dtype=bool)
+        self._headroom = np.full(capacity, np.inf)
+        self._hits = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        n = self._size
+        old = (self.ids, self.prices, self.alert_prices, self.last_notified, self.armed, self._headroom)
+        self._allocate(capacity)
+        for new_column, old_column in zip(
+                (self.ids, self.prices, self.alert_prices, self.last_notified, self.armed, self._headroom), old):
+            new_column[:n] = old_column[:n]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    def _lookup(self, item_ids: Sequence[int]) -> np.ndarray:
+        try:
+            return np.fromiter((self._rows[item_id] for item_id in item_ids), dtype=np.intp, count=len(item_ids))
+        except KeyError as e:
+            raise KeyError(f"Item {e.args[0]} is not tracked by the alert engine") from None
+
+    def _refresh_rows(self, rows: np.ndarray) -> None:
+        """
+        Re-arms the given rows whose price has recovered and recomputes their headroom.
+        """
+        prices, alert_prices = self.prices[rows], self.alert_prices[rows]
+        armed = self.armed[rows] | (prices > alert_prices * (1 + self.rearm_ratio))
+        self.armed[rows] = armed
+        self._headroom[rows] = np.where(armed, prices - alert_prices, np.inf)
+
+    def load(self, item_ids: Sequence[int], prices: Sequence[float], alert_prices: Sequence[float],
+             last_notified: Optional[Sequence[float]] = None) -> None:
+        """
+        Replaces the tracked items.
+
+        Items that were already tracked keep their alert state. For the others,
+        `last_notified` (unix seconds, NaN for never) restores it: an item that
+        was notified and has not recovered since starts disarmed, so restarting
+        does not repeat alerts.
+
+        Args:
+            item_ids (sequence[int]): The catalog item ids.
+            prices (sequence[float]): The current prices. None or NaN never fires.
+            alert_prices (sequence[float]): The alert prices. None or NaN never fires.
+            last_notified (sequence[float], optional): When each item last fired.
+        """
+        ids = np.asarray(item_ids, dtype=np.int64)
+        n = len(ids)
+        notified = np.full(n, np.nan) if last_notified is None else np.asarray(last_notified, dtype=float)
+        notified = np.where(np.isnan(notified), -np.inf, notified)
+        armed = np.isneginf(notified)
+
+        old_rows = np.fromiter((self._rows.get(item_id, -1) for item_id in ids.tolist()), dtype=np.intp, count=n)
+        known = old_rows >= 0
+        if known.any():
+            notified[known] = np.maximum(notified[known], self.last_notified[old_rows[known]])
+            armed[known] = self.armed[old_rows[known]]
+
+        self._allocate(max(1024, n))
+        self._size = n
+        self.ids[:n] = ids
+        self.prices[:n] = np.asarray(prices, dtype=float)
+        self.alert_prices[:n] = np.asarray(alert_prices, dtype=float)
+        self.last_notified[:n] = notified
+        self.armed[:n] = armed
+        self._rows = dict(zip(ids.tolist(), range(n)))
+        self._refresh_rows(np.arange(n))
+
+    def upsert(self, item_id: int, price: Optional[float], alert_price: Optional[float]) -> None:
+        """
+        Starts tracking an item, or updates its price and alert price.
+        """
+        row = self._rows.get(item_id)
+        if row is None:
+            self._grow(self._size + 1)
+            row = self._size
+            self._size += 1
+            self._rows[item_id] = row
+            self.ids[row] = item_id
+            self.last_notified[row] = -np.inf
+            self.armed[row] = True
+        self.prices[row] = np.nan if price is None else price
+        self.alert_prices[row] = np.nan if alert_price is None else alert_price
+        self._refresh_rows(np.array([row]))
+
+    def update_prices(self, item_ids: Sequence[int], prices: Sequence[float],
+                      alert_prices: Optional[Sequence[float]] = None) -> None:
+        """
+        Writes refreshed prices, and optionally alert prices, for tracked items.
+
+        Raises:
+            KeyError: If an item is not tracked.
+        """
+        rows = self._lookup(item_ids)
+        self.prices[rows] = np.asarray(prices, dtype=float)
+        if alert_prices is not None:
+            self.alert_prices[rows] = np.asarray(alert_prices, dtype=float)
+        self._refresh_rows(rows)
+
+    def remove(self, item_ids: Iterable[int]) -> None:
+        """
+        Stops tracking items, moving the last row into each freed slot.
+        """
+        columns = (self.ids, self.prices, self.alert_prices, self.last_notified, self.armed, self._headroom)
+        for item_id in item_ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                for column in columns:
+                    column[row] = column[last]
+                self._rows[int(self.ids[row])] = row
+            self._size = last
+
+    def evaluate(self, now: Optional[float] = None) -> List[PriceAlert]:
+        """
+        Finds every item whose alert fires now, and marks those items notified.
+
+        Returns:
+            list[PriceAlert]: The alerts, in row order.
+        """
+        now = self._clock() if now is None else now
+        n = self._size
+        hits = self._hits[:n]
+        np.less_equal(self._headroom[:n], 0.0, out=hits)
+        rows = np.flatnonzero(hits)
+        if len(rows):
+            # Armed and below the threshold, but notified too recently
+            rows = rows[now - self.last_notified[rows] >= self.cooldown]
+        if not len(rows):
+            return []
+
+        self.armed[rows] = False
+        self._headroom[rows] = np.inf
+        self.last_notified[rows] = now
+        return [PriceAlert(int(item_id), float(price), float(alert_price))
+                for item_id, price, alert_price in zip(self.ids[rows], self.prices[rows], self.alert_prices[rows])]
+
+    def stats(self) -> dict:
+        n = self._size
+        return {
+            "tracked": n,
+            "armed": int(self.armed[:n].sum()),
+            "below_alert_price": int((self.prices[:n] <= self.alert_prices[:n]).sum()),
+        }
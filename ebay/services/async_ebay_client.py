@@ -0,0 +1,322 @@
+import asyncio
+import base64
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+import aiohttp
+
+from ebay.services import ebay_client
+from ebay.services.ebay_client import (
+    API_BASE_URL,
+    CLIENT_ID,
+    CLIENT_SECRET,
+    ITEM_PATH,
+    OAUTH_SCOPE,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+    RETRY_STATUSES,
+    SEARCH_PATH,
+    TOKEN_PATH,
+    TOKEN_REFRESH_SKEW,
+    bucket_limit,
+    normalize_query,
+    parse_item_details,
+    parse_item_summaries,
+)
+from ebay.services.rate_limiter import RateLimitExceeded
+from ebay.services.resilience import retry_with_backoff_async
+from ebay.utils.cache import FRESH
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Maximum number of eBay calls a single client runs at once
+ASYNC_MAX_CONCURRENCY = int(os.getenv("EBAY_ASYNC_MAX_CONCURRENCY", 10))
+# Default per-call timeout in seconds
+ASYNC_TIMEOUT = float(os.getenv("EBAY_ASYNC_TIMEOUT", 10))
+
+
+class AsyncTokenManager:
+    """
+    The asyncio counterpart of TokenManager.
+
+    Tokens close to expiry are refreshed in a background task while callers
+    keep receiving the current token. Callers without a valid token all await
+    the same refresh task.
+    """
+
+    def __init__(self,
+                 fetch_token: Callable[[], Awaitable[Tuple[str, float]]],
+                 refresh_skew: float = TOKEN_REFRESH_SKEW,
+                 retry_interval: float = 30,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            fetch_token (callable): Coroutine function returning a (token, expires_in) pair.
+            refresh_skew (float): Seconds before expiry at which to refresh.
+            retry_interval (float): Seconds to wait after a failed background refresh.
+            clock (callable): Time source, overridable for tests.
+        """
+        self._fetch_token = fetch_token
+        self.refresh_skew = refresh_skew
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._token: Optional[str] = None
+        self._expiry = 0.0
+        self._retry_at = 0.0
+        self._refresh_task: Optional[asyncio.Future] = None
+        self.refreshes = 0
+
+    async def get_token(self) -> str:
+        """
+        Returns a valid access token, fetching one if none is held.
+
+        Returns:
+            str: The access token.
+        """
+        now = self._clock()
+        if self._token and now < self._expiry:
+            if (now >= self._expiry - self.refresh_skew and now >= self._retry_at
+                    and self._refresh_task is None):
+                self._start_refresh().add_done_callback(self._log_background_failure)
+            return self._token
+
+        task = self._refresh_task or self._start_refresh()
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        """
+        Drops the current token so the next caller fetches a new one.
+        """
+        self._token = None
+        self._expiry = 0.0
+
+    def _start_refresh(self) -> asyncio.Future:
+        self._refresh_task = asyncio.ensure_future(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> str:
+        try:
+            token, expires_in = await self._fetch_token()
+        except BaseException:
+            self._retry_at = self._clock() + self.retry_interval
+            raise
+        finally:
+            self._refresh_task = None
+
+        self._token = token
+        self._expiry = self._clock() + expires_in
+        self.refreshes += 1
+        logger.info("Access token refreshed, expires in %d seconds", expires_in)
+        return token
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background token refresh failed, keeping current token: %s", str(task.exception()))
+
+
+class AsyncEbayClient:
+    """
+    An asyncio client for the eBay Browse API.
+
+    All calls share one aiohttp session, and a semaphore caps how many of
+    them are in flight at once. Calls count against the same rate limits,
+    daily quotas and circuit breakers as the synchronous client, are retried
+    the same way, and share its in-memory search and item caches. Use it as
+    an async context manager:
+
+        async with AsyncEbayClient() as client:
+            items = await client.search_items("laptop")
+    """
+
+    def __init__(self,
+                 max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 timeout: float = ASYNC_TIMEOUT,
+                 base_url: str = API_BASE_URL,
+                 client_id: Optional[str] = CLIENT_ID,
+                 client_secret: Optional[str] = CLIENT_SECRET):
+        """
+        Args:
+            max_concurrency (int): The maximum number of concurrent eBay calls.
+            timeout (float): The default total timeout of a call, in seconds.
+            base_url (str): The eBay API host.
+            client_id (str): The eBay application client id.
+            client_secret (str): The eBay application client secret.
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/")
+        credentials = f"{client_id or ''}:{client_secret or ''}".encode()
+        self._basic_auth = f"Basic {base64.b64encode(credentials).decode()}"
+        self.tokens = AsyncTokenManager(self._request_token)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncEbayClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Opens the HTTP session. Must be called from inside the event loop that will use it.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def search_items(self, query: str, limit: int = 5, timeout: Optional[float] = None) -> list:
+        """
+        Searches for items on eBay using the Browse API, served from the search cache when fresh.
+
+        Args:
+            query (str): The search query.
+            limit (int): The number of results to return.
+            timeout (float, optional): Overrides the default timeout for this call.
+
+        Returns:
+            list[dict]: A list of items matching the search query.
+        """
+        key = normalize_query(query)
+        entry = ebay_client._search_cache.lookup(key, accept=lambda cached: cached["limit"] >= limit)
+        if entry is not None and entry.state == FRESH:
+            return [dict(item) for item in entry.value["items"][:limit]]
+
+        fetch_limit = bucket_limit(limit)
+        data = await self._get_json("search", SEARCH_PATH, params={"q": key, "limit": fetch_limit}, timeout=timeout)
+        items = parse_item_summaries(key, data)
+        ebay_client._search_cache.set(key, {"limit": fetch_limit, "items": items})
+        return [dict(item) for item in items[:limit]]
+
+    async def search_item_by_id(self, ebay_item_id: str, timeout: Optional[float] = None) -> dict:
+        """
+        Retrieves the raw Browse API payload of an item.
+
+        Args:
+            ebay_item_id (str): The eBay item ID.
+            timeout (float, optional): Overrides the default timeout for this call.
+
+        Returns:
+            dict: The item attributes.
+        """
+        return await self._get_json("item", f"{ITEM_PATH}/{ebay_item_id}", timeout=timeout)
+
+    async def get_item_details(self, ebay_item_id: str, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Retrieves and parses the details of an item, served from the item caches when fresh.
+
+        Args:
+            ebay_item_id (str): The eBay item ID.
+            timeout (float, optional): Overrides the default timeout for this call.
+
+        Returns:
+            dict: The parsed item details, or None if eBay returned no data.
+        """
+        cached = ebay_client._cached_item_details(ebay_item_id)
+        if cached is not None:
+            return cached
+
+        data = await self.search_item_by_id(ebay_item_id, timeout=timeout)
+        if not data:
+            return None
+        details = parse_item_details(ebay_item_id, data)
+        ebay_client._store_item_details(details)
+        return details
+
+    async def _request_token(self) -> Tuple[str, float]:
+        await self.start()
+        headers = {
+            "Authorization": self._basic_auth,
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        data = {"grant_type": "client_credentials", "scope": OAUTH_SCOPE}
+        try:
+            response_data = await self._send("oauth", "POST", TOKEN_PATH, self.timeout, data=data, headers=headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RuntimeError(f"Failed to fetch access token: {e!r}")
+
+        return response_data["access_token"], response_data.get("expires_in", 7200)
+
+    async def _get_json(self, family: str, path: str, params: Optional[dict] = None,
+                        timeout: Optional[float] = None):
+        await self.start()
+        token = await self.tokens.get_token()
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        try:
+            return await self._send(family, "GET", path, timeout if timeout is not None else self.timeout,
+                                    params=params, headers=headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RuntimeError(f"Error searching for items: {e!r}")
+
+    async def _send(self, family: str, method: str, path: str, timeout: float, **kwargs):
+        """
+        Sends a request to eBay and returns its JSON body, the asyncio form of ebay_client._send.
+
+        Each attempt is guarded by the family's circuit breaker and, once the
+        breaker lets it through, rate limited. GETs are retried on connection
+        errors, timeouts and 5xx responses.
+
+        Raises:
+            RateLimitExceeded: If the local limiter or eBay itself rejects the call.
+            CircuitOpenError: If the family's circuit breaker is open.
+            aiohttp.ClientError, asyncio.TimeoutError: If the call still fails after retries.
+        """
+        breaker = ebay_client._circuit_breakers[family]
+
+        async def attempt():
+            # Check the breaker first so calls that fail fast do not use up rate limit or quota
+            breaker.before_call()
+            try:
+                # The limiter may sleep and the daily quota is kept in SQLite, so keep both off the event loop
+                await asyncio.to_thread(ebay_client._rate_limiter.acquire, family)
+            except BaseException:
+                breaker.cancel_call()
+                raise
+            try:
+                async with self._semaphore:
+                    async with self._session.request(method, f"{self.base_url}{path}",
+                                                     timeout=aiohttp.ClientTimeout(total=timeout),
+                                                     **kwargs) as response:
+                        if response.status >= 500:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+
+                        if response.status == 429:
+                            retry_after = ebay_client._parse_retry_after(response.headers.get("Retry-After"))
+                            logger.warning("eBay rejected a %s call with 429, retry after %ss", family, retry_after)
+                            raise RateLimitExceeded(f"eBay rate limit exceeded for {family} calls",
+                                                    retry_after=retry_after)
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                breaker.record_failure()
+                raise
+
+        max_attempts = RETRY_MAX_ATTEMPTS if method == "GET" else 1
+        return await retry_with_backoff_async(attempt, max_attempts, _is_transient,
+                                              base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY)
+
+
+def _is_transient(error: BaseException) -> bool:
+    if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, aiohttp.ClientResponseError) and error.status in RETRY_STATUSES
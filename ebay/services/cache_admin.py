@@ -0,0 +1,128 @@
+"""
+Command line tools for the shared on-disk eBay response cache.
+
+Usage:
+    python -m ebay.services.cache_admin inspect [--kind item|search] [--limit N]
+    python -m ebay.services.cache_admin purge [--all] [--kind item|search]
+    python -m ebay.services.cache_admin warm FILE
+
+`warm` reads eBay item ids, one per line ("-" for stdin), and fetches any
+that are not already cached so that workers start with a warm cache.
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+from typing import Iterable, List, Optional
+
+from ebay.services import ebay_client
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def inspect_cache(kind: Optional[str] = None, limit: int = 50) -> dict:
+    """
+    Summarizes the disk cache and lists its most recent entries.
+
+    Args:
+        kind (str, optional): Restricts the listing to "item" or "search" entries.
+        limit (int): The maximum number of entries to list.
+
+    Returns:
+        dict: The cache statistics and the listed entries.
+    """
+    cache = _require_disk_cache()
+    return {"stats": cache.stats(), "entries": cache.entries(kind=kind, limit=limit)}
+
+
+def purge_cache(everything: bool = False, kind: Optional[str] = None) -> int:
+    """
+    Deletes expired entries, or every entry, from the disk cache.
+
+    Args:
+        everything (bool): If True, unexpired entries are deleted as well.
+        kind (str, optional): Restricts the purge to "item" or "search" entries.
+
+    Returns:
+        int: The number of entries deleted.
+    """
+    return _require_disk_cache().purge(expired_only=not everything, kind=kind)
+
+
+def warm_cache(ebay_item_ids: Iterable[str]) -> dict:
+    """
+    Fetches items into the disk cache using batched getItems calls.
+
+    Args:
+        ebay_item_ids (iterable[str]): The eBay item IDs to load.
+
+    Returns:
+        dict: The number of ids requested, loaded and failed, and the failures.
+    """
+    _require_disk_cache()
+    ebay_item_ids = list(dict.fromkeys(ebay_item_ids))
+    results = ebay_client.get_items_details(ebay_item_ids)
+    failures = [result for result in results if "error" in result]
+    logger.info("Warmed disk cache with %d of %d items", len(results) - len(failures), len(ebay_item_ids))
+    return {
+        "requested": len(ebay_item_ids),
+        "loaded": len(results) - len(failures),
+        "failed": len(failures),
+        "failures": failures,
+    }
+
+
+def read_item_ids(lines: Iterable[str]) -> List[str]:
+    """
+    Extracts item ids from lines of text, skipping blank lines and # comments.
+    """
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _require_disk_cache():
+    if ebay_client._disk_cache is None:
+        raise RuntimeError("The disk cache is disabled (EBAY_DISK_CACHE=false)")
+    return ebay_client._disk_cache
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ebay.services.cache_admin",
+                                     description="Inspect, purge or pre-warm the on-disk eBay response cache.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    inspect_parser = commands.add_parser("inspect", help="Show cache statistics and recent entries")
+    inspect_parser.add_argument("--kind", choices=("item", "search"))
+    inspect_parser.add_argument("--limit", type=int, default=50)
+
+    purge_parser = commands.add_parser("purge", help="Delete expired entries")
+    purge_parser.add_argument("--all", action="store_true", help="Delete unexpired entries too")
+    purge_parser.add_argument("--kind", choices=("item", "search"))
+
+    warm_parser = commands.add_parser("warm", help="Fetch items listed in a file into the cache")
+    warm_parser.add_argument("file", help="A file of eBay item ids, one per line, or - for stdin")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "inspect":
+            output = inspect_cache(kind=args.kind, limit=args.limit)
+        elif args.command == "purge":
+            output = {"deleted": purge_cache(everything=args.all, kind=args.kind)}
+        elif args.file == "-":
+            output = warm_cache(read_item_ids(sys.stdin))
+        else:
+            with open(args.file) as f:
+                output = warm_cache(read_item_ids(f))
+    except (RuntimeError, OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
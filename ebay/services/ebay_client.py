@@ -1,8 +1,23 @@
+import logging
 import requests
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from ebay.services.http_client import get_http_client
+from ebay.services.rate_limiter import RateLimiter, RateLimitExceeded
+from ebay.services.resilience import CircuitBreaker, CircuitOpenError, retry_with_backoff
+from ebay.services.token_manager import TokenManager
+from ebay.utils.cache import EXPIRED, FRESH, STALE, CacheEntry, StaleWhileRevalidate, TTLCache
+from ebay.utils.disk_cache import DiskCache
+from ebay.utils.singleflight import SingleFlight
+from ebay.utils.logger import configure_logger
+from ebay.utils.sql_utils import DB_PATH
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
 # Load environment variables
 load_dotenv()
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.secrets.env'))
@@ -11,56 +26,246 @@ CLIENT_ID = os.getenv("EBAY_PROD_CLIENT_ID")
 CLIENT_SECRET = os.getenv("EBAY_PROD_CLIENT_SECRET")
 ENVIRONMENT = os.getenv("EBAY_ENVIRONMENT", "production")
 
-# Global variables to store token and expiration time
-_access_token = None
-_token_expiry = None
+API_BASE_URL = "https://api.ebay.com"
+TOKEN_PATH = "/identity/v1/oauth2/token"
+SEARCH_PATH = "/buy/browse/v1/item_summary/search"
+ITEM_PATH = "/buy/browse/v1/item"
+TOKEN_URL = f"{API_BASE_URL}{TOKEN_PATH}"
+SEARCH_URL = f"{API_BASE_URL}{SEARCH_PATH}"
+ITEM_URL = f"{API_BASE_URL}{ITEM_PATH}"
+OAUTH_SCOPE = "https://api.ebay.com/oauth/api_scope"
+
+# Refresh the token this many seconds before eBay says it expires
+TOKEN_REFRESH_SKEW = float(os.getenv("EBAY_TOKEN_REFRESH_SKEW", 300))
+
+# Search results are cached per normalized query. Limits are rounded up to
+# the next bucket so that one upstream call can answer any smaller limit.
+SEARCH_CACHE_TTL = float(os.getenv("EBAY_SEARCH_CACHE_TTL", 30))
+SEARCH_CACHE_SIZE = int(os.getenv("EBAY_SEARCH_CACHE_SIZE", 512))
+SEARCH_LIMIT_BUCKETS = (5, 10, 25, 50, 100, 200)
+
+# Once past its TTL an entry is served stale while it is refreshed in the
+# background, for up to the stale TTL. After that callers wait for the
+# refresh, but if eBay fails the old data is still served for up to
+# CACHE_STALE_IF_ERROR seconds rather than returning an error.
+SEARCH_CACHE_STALE_TTL = float(os.getenv("EBAY_SEARCH_CACHE_STALE_TTL", 120))
+CACHE_STALE_IF_ERROR = float(os.getenv("EBAY_CACHE_STALE_IF_ERROR", 3600))
+CACHE_REFRESH_WORKERS = int(os.getenv("EBAY_CACHE_REFRESH_WORKERS", 2))
+
+_search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL,
+                         stale_ttl=SEARCH_CACHE_STALE_TTL, stale_if_error=CACHE_STALE_IF_ERROR)
+_revalidator = StaleWhileRevalidate(max_workers=CACHE_REFRESH_WORKERS)
+
+# Parsed item details are cached per ebay_item_id. Price and quantities move
+# quickly and get a short TTL; the title rarely changes and is kept longer.
+ITEM_CACHE_SIZE = int(os.getenv("EBAY_ITEM_CACHE_SIZE", 2048))
+ITEM_VOLATILE_TTL = float(os.getenv("EBAY_ITEM_VOLATILE_TTL", 60))
+ITEM_STABLE_TTL = float(os.getenv("EBAY_ITEM_STABLE_TTL", 3600))
+ITEM_VOLATILE_STALE_TTL = float(os.getenv("EBAY_ITEM_VOLATILE_STALE_TTL", 240))
+ITEM_STABLE_STALE_TTL = float(os.getenv("EBAY_ITEM_STABLE_STALE_TTL", 86400))
+VOLATILE_FIELDS = ("price", "available_quantity", "sold_quantity")
+STABLE_FIELDS = ("title",)
+
+_item_volatile_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_VOLATILE_TTL,
+                                stale_ttl=ITEM_VOLATILE_STALE_TTL, stale_if_error=CACHE_STALE_IF_ERROR)
+_item_stable_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_STABLE_TTL,
+                              stale_ttl=ITEM_STABLE_STALE_TTL, stale_if_error=CACHE_STALE_IF_ERROR)
+
+# Raw item and search payloads are also kept in a SQLite file shared by every
+# worker process, behind the in-memory caches. Entries expire after the
+# in-memory TTL so a refresh never reads back data that is already stale.
+DISK_CACHE_ENABLED = os.getenv("EBAY_DISK_CACHE", "true").lower() == "true"
+DISK_CACHE_PATH = os.getenv("EBAY_DISK_CACHE_PATH", os.path.join(os.path.dirname(DB_PATH), "ebay_cache.db"))
+
+_disk_cache = DiskCache(DISK_CACHE_PATH) if DISK_CACHE_ENABLED else None
+
+# Batch lookups fan out over a bounded thread pool. eBay's getItems call
+# accepts at most 20 item ids per request.
+BATCH_MAX_WORKERS = int(os.getenv("EBAY_BATCH_MAX_WORKERS", 8))
+GET_ITEMS_MAX_IDS = 20
+
+# The Browse API returns at most 200 results per page and 10,000 per query
+SEARCH_MAX_PAGE_SIZE = 200
+SEARCH_MAX_RESULTS = 10000
+
+# Concurrent cache misses for the same item or search share one upstream call
+_search_flight = SingleFlight()
+_item_flight = SingleFlight()
+
+# Client-side token buckets and daily quota, per endpoint family
+_rate_limiter = RateLimiter()
+
+# Idempotent GETs are retried on transient errors with full-jitter backoff
+RETRY_MAX_ATTEMPTS = int(os.getenv("EBAY_RETRY_MAX_ATTEMPTS", 3))
+RETRY_BASE_DELAY = float(os.getenv("EBAY_RETRY_BASE_DELAY", 0.2))
+RETRY_MAX_DELAY = float(os.getenv("EBAY_RETRY_MAX_DELAY", 2))
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# One circuit breaker per endpoint family fails calls fast while eBay is degraded
+_circuit_breakers = {
+    family: CircuitBreaker(
+        family,
+        failure_threshold=float(os.getenv("EBAY_BREAKER_FAILURE_RATE", 0.5)),
+        min_calls=int(os.getenv("EBAY_BREAKER_MIN_CALLS", 10)),
+        window=float(os.getenv("EBAY_BREAKER_WINDOW", 60)),
+        open_duration=float(os.getenv("EBAY_BREAKER_OPEN_SECONDS", 30)),
+    )
+    for family in ("search", "item", "oauth")
+}
+
+
+def _send(family, method, url, **kwargs):
+    """
+    Sends a request to eBay through the pooled HTTP client.
+
+    Each attempt is guarded by the family's circuit breaker and, once the
+    breaker lets it through, rate limited.
+    GETs are retried on connection errors, timeouts and 5xx responses.
+
+    Args:
+        family (str): The endpoint family the call counts against: search, item or oauth.
+        method (str): The HTTP method.
+        url (str): The request URL.
+
+    Returns:
+        requests.Response: The successful response.
+
+    Raises:
+        RateLimitExceeded: If the local limiter or eBay itself rejects the call.
+        CircuitOpenError: If the family's circuit breaker is open.
+        requests.exceptions.RequestException: If the call still fails after retries.
+    """
+    breaker = _circuit_breakers[family]
+
+    def attempt():
+        # Check the breaker first so calls that fail fast do not use up rate limit or quota
+        breaker.before_call()
+        try:
+            _rate_limiter.acquire(family)
+        except BaseException:
+            breaker.cancel_call()
+            raise
+        try:
+            response = get_http_client().request(method, url, **kwargs)
+        except BaseException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if response.status_code == 429:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            logger.warning("eBay rejected a %s call with 429, retry after %ss", family, retry_after)
+            raise RateLimitExceeded(f"eBay rate limit exceeded for {family} calls", retry_after=retry_after)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        return response
+
+    max_attempts = RETRY_MAX_ATTEMPTS if method == "GET" else 1
+    return retry_with_backoff(attempt, max_attempts, _is_transient,
+                              base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY)
+
+
+def _is_transient(error):
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUSES
+    return False
+
+
+def _parse_retry_after(value, default=60.0):
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return default
 
 
 def get_access_token():
     """
-    Fetches a new access token if none exists or if the token is expired.
+    Returns a valid access token, fetching one if none exists or if the token is expired.
+
+    The token is refreshed in the background shortly before it expires, and
+    only one refresh is ever in flight.
 
     Returns:
         str: A valid eBay access token.
     """
-    global _access_token, _token_expiry
+    return _token_manager.get_token()
 
-    # If the token is still valid, reuse it
-    if _access_token and _token_expiry and time.time() < _token_expiry:
-        return _access_token
 
+def _request_token():
+    """
+    Requests a new application token from the eBay OAuth endpoint.
+
+    Returns:
+        tuple: The access token and its lifetime in seconds.
+    """
     # Generate a new token
-    url = f"https://api.ebay.com/identity/v1/oauth2/token"
+    url = TOKEN_URL
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     data = {
         "grant_type": "client_credentials",
-        "scope": "https://api.ebay.com/oauth/api_scope"
+        "scope": OAUTH_SCOPE
     }
 
     try:
-        print(f"Requesting token from: {url}")
-        print(f"Using CLIENT_ID: {CLIENT_ID} and CLIENT_SECRET: {CLIENT_SECRET[:5]}***")
+        logger.info("Requesting token from: %s", url)
 
-        response = requests.post(
-            url, headers=headers, data=data, auth=(CLIENT_ID, CLIENT_SECRET)
+        response = _send(
+            "oauth", "POST", url, headers=headers, data=data, auth=(CLIENT_ID, CLIENT_SECRET)
         )
-        response.raise_for_status()  # Raise an exception for HTTP errors
         response_data = response.json()
 
-        # Save the token and expiration time
-        _access_token = response_data["access_token"]
+        access_token = response_data["access_token"]
         expires_in = response_data.get("expires_in", 7200)  # Default to 2 hours if not provided
-        _token_expiry = time.time() + expires_in
 
-        return _access_token
+        return access_token, expires_in
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Failed to fetch access token: {e}")
 
 
+_token_manager = TokenManager(_request_token, refresh_skew=TOKEN_REFRESH_SKEW)
+
+
+def normalize_query(query):
+    """
+    Normalizes a search query for use as a cache key.
+
+    Args:
+        query (str): The search query.
+
+    Returns:
+        str: The query lowercased with runs of whitespace collapsed.
+    """
+    return " ".join(query.split()).lower()
+
+
+def bucket_limit(limit):
+    """
+    Rounds a result limit up to the nearest cache bucket.
+
+    Args:
+        limit (int): The requested number of results.
+
+    Returns:
+        int: The limit to request from eBay.
+    """
+    for bucket in SEARCH_LIMIT_BUCKETS:
+        if limit <= bucket:
+            return bucket
+    return limit
+
+
 def search_items(query, limit=5):
     """
     Searches for items on eBay using the Browse API.
 
+    Results are served from an in-process cache when a recent search for the
+    same normalized query fetched at least `limit` items.
+
     Args:
         query (str): The search query.
         limit (int): The number of results to return.
@@ -68,19 +273,159 @@ def search_items(query, limit=5):
     Returns:
         list[dict]: A list of items matching the search query.
     """
+    return search_items_cached(query, limit).value
+
+
+def search_items_cached(query, limit=5):
+    """
+    Searches for items on eBay, reporting how fresh the cached results are.
+
+    Stale results are returned immediately and refreshed in the background.
+    If eBay fails while only expired results are cached, those are returned
+    instead of raising.
+
+    Args:
+        query (str): The search query.
+        limit (int): The number of results to return.
+
+    Returns:
+        CacheResult: The list of items, the X-Cache status (HIT, STALE,
+        STALE-IF-ERROR or MISS) and the age of the results in seconds.
+    """
+    key = normalize_query(query)
+    entry = _search_cache.lookup(key, accept=lambda cached: cached["limit"] >= limit)
+    # A refresh keeps at least as many results as the entry it replaces
+    fetch_limit = max(bucket_limit(limit), entry.value["limit"] if entry else 0)
+    result = _revalidator.serve(
+        ("search", key), entry,
+        lambda: _search_flight.do((key, fetch_limit), lambda: _load_search(key, fetch_limit))
+    )
+    return result._replace(value=[dict(item) for item in result.value["items"][:limit]])
+
+
+def get_top_item(query):
+    """
+    Returns the top search result for a query.
+
+    Any cached summary for the query can answer this, so popular queries are
+    served without calling eBay.
+
+    Args:
+        query (str): The search query.
+
+    Returns:
+        dict: The first item of the search results, or None if there are none.
+    """
+    items = search_items(query, 1)
+    return items[0] if items else None
+
+
+def _load_search(query, limit):
+    """
+    Fetches a search from the disk cache or eBay and stores it in the search cache.
+    """
+    items, age = _fetch_search_items(query, limit)
+    cached = {"limit": limit, "items": items}
+    _search_cache.set(query, cached, age=age)
+    return cached
+
+
+def _fetch_search_items(query, limit):
+    """
+    Returns the parsed item summaries of a search and their age in seconds,
+    reading the raw page from the disk cache when another worker fetched it recently.
+    """
+    key = f"search:{limit}:{query}"
+    if _disk_cache is not None:
+        hit = _disk_cache.get(key)
+        if hit is not None:
+            data, age = hit
+            return parse_item_summaries(query, data), age
+
+    data = _fetch_search_page(query, limit)
+    if _disk_cache is not None:
+        _disk_cache.set(key, data, SEARCH_CACHE_TTL, kind="search")
+    return parse_item_summaries(query, data), 0.0
+
+
+def _fetch_search_page(query, limit, offset=0):
+    """
+    Calls the Browse API search endpoint and returns one raw page of results.
+    """
     token = get_access_token()  # Ensure a valid token is available
 
-    url = f"https://api.ebay.com/buy/browse/v1/item_summary/search?q={query}&limit={limit}"
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        data = response.json()
+        response = _send("search", "GET", SEARCH_URL, headers=headers,
+                         params={"q": query, "limit": limit, "offset": offset})
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        raise RuntimeError(f"Error searching for items: {e}")
+
+
+def iter_search_items(query, max_items=1000, page_size=SEARCH_MAX_PAGE_SIZE):
+    """
+    Lazily yields search results across as many pages as needed.
+
+    Follows the Browse API offset pagination until `max_items` results have
+    been yielded or eBay reports no next page. The next page is fetched in
+    the background while the caller works through the current one.
+
+    Args:
+        query (str): The search query.
+        max_items (int): The maximum number of items to yield.
+        page_size (int): The number of items to request per page.
+
+    Yields:
+        dict: The parsed item, with its ebay_item_id, title and price.
+    """
+    max_items = min(max_items, SEARCH_MAX_RESULTS)
+    page_size = max(1, min(page_size, SEARCH_MAX_PAGE_SIZE, max_items))
+    if max_items <= 0:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        offset = 0
+        pending = executor.submit(_fetch_search_page, query, page_size, offset)
+        yielded = 0
+        while pending is not None:
+            data = pending.result()
+            offset += page_size
+            pending = None
+            if data.get("next") and offset < max_items:
+                pending = executor.submit(_fetch_search_page, query, min(page_size, max_items - offset), offset)
 
+            if not data.get("itemSummaries"):
+                break
+            for item in parse_item_summaries(query, data):
+                yield item
+                yielded += 1
+                if yielded >= max_items:
+                    return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_item_summaries(query, data):
+    """
+    Extracts the id, title and price of each item in a search response.
+
+    Args:
+        query (str): The search query, used in error messages.
+        data (dict): The raw search response.
+
+    Returns:
+        list[dict]: The parsed items.
+
+    Raises:
+        ValueError: If the response has no items or an item is malformed.
+    """
+    try:
         # Iterate directly over the "itemSummaries" list
         if "itemSummaries" not in data:
             raise ValueError(f"No items found for query: {query}")
@@ -104,8 +449,6 @@ def search_items(query, limit=5):
             })
 
         return processed_items
-    except requests.exceptions.RequestException as e:
-        raise RuntimeError(f"Error searching for items: {e}")
     except KeyError as e:
         raise ValueError(f"Missing expected data in response: {e}")
 
@@ -122,17 +465,342 @@ def search_item_by_id(ebay_item_id):
     """
     token = get_access_token()  # Ensure a valid token is available
 
-    url = f"https://api.ebay.com/buy/browse/v1/item/{ebay_item_id}"
+    url = f"{ITEM_URL}/{ebay_item_id}"
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise an exception for HTTP errors
+        response = _send("item", "GET", url, headers=headers)
         data = response.json()
 
         return data
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Error searching for items: {e}")
+
+
+def parse_item_details(ebay_item_id, data):
+    """
+    Extracts the fields the service uses from a Browse API item payload.
+
+    Args:
+        ebay_item_id (str): The eBay item ID the payload belongs to.
+        data (dict): The raw item payload.
+
+    Returns:
+        dict: The item's ebay_item_id, title, price, available_quantity and sold_quantity.
+    """
+    price_info = data.get("price", {})
+    estimated_availabilities = data.get("estimatedAvailabilities", [])
+    if estimated_availabilities:
+        available_quantity = estimated_availabilities[0].get("estimatedAvailableQuantity")
+        sold_quantity = estimated_availabilities[0].get("estimatedSoldQuantity")
+    else:
+        available_quantity = 0
+        sold_quantity = 0
+
+    return {
+        "ebay_item_id": ebay_item_id,
+        "title": data.get("title"),
+        "price": float(price_info.get("value", 0)),
+        "available_quantity": available_quantity,
+        "sold_quantity": sold_quantity,
+    }
+
+
+def get_item_details(ebay_item_id, fields=STABLE_FIELDS + VOLATILE_FIELDS):
+    """
+    Returns parsed details for an item, served from cache when fresh.
+
+    Volatile fields (price and quantities) and stable fields (title) expire
+    independently, so callers that only need the title are not forced to
+    refetch when the price has aged out.
+
+    Args:
+        ebay_item_id (str): The eBay item ID.
+        fields (tuple): The fields the caller needs.
+
+    Returns:
+        dict: The item details, or None if eBay returned no data.
+    """
+    return get_item_details_cached(ebay_item_id, fields).value
+
+
+def get_item_details_cached(ebay_item_id, fields=STABLE_FIELDS + VOLATILE_FIELDS):
+    """
+    Returns parsed details for an item, reporting how fresh they are.
+
+    Stale details are returned immediately and refreshed in the background.
+    If eBay fails while only expired details are cached, those are returned
+    instead of raising.
+
+    Args:
+        ebay_item_id (str): The eBay item ID.
+        fields (tuple): The fields the caller needs.
+
+    Returns:
+        CacheResult: The item details (or None if eBay returned no data), the
+        X-Cache status and the age of the oldest requested field in seconds.
+    """
+    return _revalidator.serve(
+        ("item", ebay_item_id), _lookup_item_details(ebay_item_id, fields),
+        lambda: _item_flight.do(ebay_item_id, lambda: _load_item_details(ebay_item_id))
+    )
+
+
+def _lookup_item_details(ebay_item_id, fields):
+    """
+    Combines an item's cache entries into one entry as old and as stale as the oldest of them.
+    """
+    entries = [_item_stable_cache.lookup(ebay_item_id)]
+    if any(field in VOLATILE_FIELDS for field in fields):
+        entries.append(_item_volatile_cache.lookup(ebay_item_id))
+    if any(entry is None for entry in entries):
+        return None
+
+    details = {"ebay_item_id": ebay_item_id}
+    for entry in entries:
+        details.update(entry.value)
+    freshness = (FRESH, STALE, EXPIRED)
+    state = max((entry.state for entry in entries), key=freshness.index)
+    return CacheEntry(details, max(entry.age for entry in entries), state)
+
+
+def _cached_item_details(ebay_item_id, fields=STABLE_FIELDS + VOLATILE_FIELDS):
+    """
+    Returns an item's details from the caches if every requested field is fresh.
+    """
+    stable = _item_stable_cache.get(ebay_item_id)
+    if any(field in VOLATILE_FIELDS for field in fields):
+        volatile = _item_volatile_cache.get(ebay_item_id)
+    else:
+        volatile = {}
+
+    if stable is not None and volatile is not None:
+        return {"ebay_item_id": ebay_item_id, **stable, **volatile}
+    return None
+
+
+def _store_item_details(details, age=0.0):
+    _item_stable_cache.set(details["ebay_item_id"], {field: details[field] for field in STABLE_FIELDS}, age=age)
+    _item_volatile_cache.set(details["ebay_item_id"], {field: details[field] for field in VOLATILE_FIELDS}, age=age)
+
+
+def _load_item_details(ebay_item_id):
+    """
+    Fetches an item from the disk cache or eBay, parses it and stores it in the item caches.
+    """
+    data, age = _fetch_item_payload(ebay_item_id)
+    if not data:
+        return None
+
+    details = parse_item_details(ebay_item_id, data)
+    _store_item_details(details, age)
+    return details
+
+
+def _item_disk_key(ebay_item_id):
+    return f"item:{ebay_item_id}"
+
+
+def _fetch_item_payload(ebay_item_id):
+    """
+    Returns an item's raw payload and its age in seconds, reading it from the
+    disk cache when another worker fetched it recently.
+    """
+    if _disk_cache is not None:
+        hit = _disk_cache.get(_item_disk_key(ebay_item_id))
+        if hit is not None:
+            return hit
+
+    data = search_item_by_id(ebay_item_id)
+    if data and _disk_cache is not None:
+        _disk_cache.set(_item_disk_key(ebay_item_id), data, ITEM_VOLATILE_TTL, kind="item")
+    return data, 0.0
+
+
+def search_items_by_ids(ebay_item_ids):
+    """
+    Searches for many items on eBay at once using the Browse API getItems call.
+
+    Args:
+        ebay_item_ids (list[str]): The eBay item IDs to retrieve.
+
+    Returns:
+        dict: The raw item payloads keyed by eBay item ID. Ids eBay did not
+        return are absent.
+    """
+    token = get_access_token()  # Ensure a valid token is available
+
+    url = f"{ITEM_URL}/"
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+
+    try:
+        response = _send("item", "GET", url, headers=headers, params={"item_ids": ",".join(ebay_item_ids)})
+        data = response.json()
+
+        return {item["itemId"]: item for item in data.get("items", []) if item.get("itemId")}
+    except requests.exceptions.RequestException as e:
+        raise RuntimeError(f"Error searching for items: {e}")
+
+
+def get_items_details(ebay_item_ids, max_workers=BATCH_MAX_WORKERS):
+    """
+    Returns parsed details for many items, fetching uncached ones in parallel.
+
+    Duplicate ids are looked up once. Uncached ids are fetched in groups of
+    up to 20 with getItems; if a group fails, its ids are retried one by one
+    so that a single bad id does not fail the rest. A call rejected by the
+    rate limiter or a circuit breaker is not retried; the error is raised.
+
+    Args:
+        ebay_item_ids (list[str]): The eBay item IDs to retrieve.
+        max_workers (int): The maximum number of concurrent eBay calls.
+
+    Returns:
+        list[dict]: One entry per distinct id, in request order. Each entry is
+        either the item details or a dict with the ebay_item_id and an error.
+
+    Raises:
+        RateLimitExceeded: If the local limiter or eBay rejects a call.
+        CircuitOpenError: If the item circuit breaker is open.
+    """
+    ebay_item_ids = list(dict.fromkeys(ebay_item_ids))
+    results = {}
+    for ebay_item_id in ebay_item_ids:
+        cached = _cached_item_details(ebay_item_id)
+        if cached is not None:
+            results[ebay_item_id] = cached
+
+    missing = [ebay_item_id for ebay_item_id in ebay_item_ids if ebay_item_id not in results]
+    if missing and _disk_cache is not None:
+        payloads = _disk_cache.get_many(_item_disk_key(ebay_item_id) for ebay_item_id in missing)
+        for ebay_item_id in missing:
+            hit = payloads.get(_item_disk_key(ebay_item_id))
+            if hit is not None:
+                data, age = hit
+                details = parse_item_details(ebay_item_id, data)
+                _store_item_details(details, age)
+                results[ebay_item_id] = details
+        missing = [ebay_item_id for ebay_item_id in missing if ebay_item_id not in results]
+
+    chunks = [missing[i:i + GET_ITEMS_MAX_IDS] for i in range(0, len(missing), GET_ITEMS_MAX_IDS)]
+
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            retry_one_by_one = []
+            for chunk, outcome in zip(chunks, executor.map(_load_items_chunk, chunks)):
+                if isinstance(outcome, (RateLimitExceeded, CircuitOpenError)):
+                    raise outcome
+                if isinstance(outcome, Exception):
+                    logger.warning("getItems failed for %d ids, retrying individually: %s", len(chunk), str(outcome))
+                    retry_one_by_one.extend(chunk)
+                else:
+                    results.update(outcome)
+
+            for ebay_item_id, outcome in zip(retry_one_by_one,
+                                             executor.map(_load_item_details_safely, retry_one_by_one)):
+                results[ebay_item_id] = outcome
+
+    return [results[ebay_item_id] for ebay_item_id in ebay_item_ids]
+
+
+def _load_items_chunk(ebay_item_ids):
+    """
+    Loads one getItems group into the caches. Returns the exception instead of raising it.
+    """
+    try:
+        payloads = search_items_by_ids(ebay_item_ids)
+    except Exception as e:
+        return e
+
+    if _disk_cache is not None:
+        _disk_cache.set_many({_item_disk_key(ebay_item_id): data for ebay_item_id, data in payloads.items()},
+                             ITEM_VOLATILE_TTL, kind="item")
+
+    results = {}
+    for ebay_item_id in ebay_item_ids:
+        data = payloads.get(ebay_item_id)
+        if not data:
+            results[ebay_item_id] = {"ebay_item_id": ebay_item_id, "error": "No item found for the given eBay item ID"}
+            continue
+        try:
+            details = parse_item_details(ebay_item_id, data)
+        except (TypeError, ValueError) as e:
+            results[ebay_item_id] = {"ebay_item_id": ebay_item_id, "error": str(e)}
+            continue
+        _store_item_details(details)
+        results[ebay_item_id] = details
+    return results
+
+
+def _load_item_details_safely(ebay_item_id):
+    try:
+        details = get_item_details(ebay_item_id)
+    except (RateLimitExceeded, CircuitOpenError):
+        raise
+    except Exception as e:
+        return {"ebay_item_id": ebay_item_id, "error": str(e)}
+    if not details:
+        return {"ebay_item_id": ebay_item_id, "error": "No item found for the given eBay item ID"}
+    return details
+
+
+def get_coalescing_stats():
+    """
+    Returns counters for upstream calls that were run or coalesced.
+
+    Returns:
+        dict: Counters keyed by lookup type.
+    """
+    return {"search": _search_flight.stats(), "item": _item_flight.stats()}
+
+
+def get_pool_stats():
+    """
+    Returns connection reuse counters for the shared eBay HTTP client.
+
+    Returns:
+        dict: Pool hits, misses, hit rate and configured pool size.
+    """
+    return get_http_client().get_pool_stats()
+
+
+def get_circuit_breaker_states():
+    """
+    Returns the state and recent error rate of each endpoint family's circuit breaker.
+
+    Returns:
+        dict: Breaker states keyed by endpoint family.
+    """
+    return {family: breaker.state() for family, breaker in _circuit_breakers.items()}
+
+
+def get_rate_limit_stats():
+    """
+    Returns available tokens and today's call counts for each endpoint family.
+
+    Returns:
+        dict: Counters keyed by endpoint family.
+    """
+    return _rate_limiter.stats()
+
+
+def get_cache_stats():
+    """
+    Returns hit, miss and eviction counters for the eBay response caches.
+
+    Returns:
+        dict: Counters keyed by cache name.
+    """
+    return {
+        "search": _search_cache.stats(),
+        "item_volatile": _item_volatile_cache.stats(),
+        "item_stable": _item_stable_cache.stats(),
+        "revalidation": _revalidator.stats(),
+        "disk": _disk_cache.stats() if _disk_cache is not None else None,
+    }
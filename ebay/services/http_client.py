@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Pool configuration, overridable from the environment
+POOL_CONNECTIONS = int(os.getenv("EBAY_HTTP_POOL_CONNECTIONS", 4))
+POOL_MAXSIZE = int(os.getenv("EBAY_HTTP_POOL_MAXSIZE", 20))
+# Connection-level retries inside urllib3. ebay_client retries whole calls
+# with backoff, so this defaults to 0 to avoid multiplying the attempts.
+MAX_RETRIES = int(os.getenv("EBAY_HTTP_MAX_RETRIES", 0))
+KEEP_ALIVE = os.getenv("EBAY_HTTP_KEEP_ALIVE", "true").lower() == "true"
+CONNECT_TIMEOUT = float(os.getenv("EBAY_HTTP_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.getenv("EBAY_HTTP_READ_TIMEOUT", 10))
+
+
+class PoolStats:
+    """
+    Thread-safe counters for connection pool checkouts.
+
+    A hit is a checkout that got back a connection with a live socket, i.e.
+    the TCP+TLS handshake was skipped. A miss is a checkout that had to open
+    a new connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, reused: bool) -> None:
+        with self._lock:
+            if reused:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+def _counting_pool_class(base: type, stats: PoolStats) -> type:
+    """
+    Builds a urllib3 pool class that records a hit or miss on every checkout.
+    """
+    def _get_conn(self, timeout=None):
+        conn = base._get_conn(self, timeout)
+        stats.record(getattr(conn, "sock", None) is not None)
+        return conn
+
+    return type(f"Counting{base.__name__}", (base,), {"_get_conn": _get_conn})
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connection pools report reuse to a PoolStats instance.
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self._stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+
+class EbayHttpClient:
+    """
+    A shared, keep-alive HTTP client for the eBay APIs.
+
+    Wraps a single requests.Session mounted with a pooled adapter so that
+    repeated calls to api.ebay.com reuse open connections instead of paying
+    a fresh TCP+TLS handshake each time.
+    """
+
+    def __init__(self,
+                 pool_connections: int = POOL_CONNECTIONS,
+                 pool_maxsize: int = POOL_MAXSIZE,
+                 max_retries: int = MAX_RETRIES,
+                 keep_alive: bool = KEEP_ALIVE,
+                 timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT)):
+        """
+        Args:
+            pool_connections (int): Number of per-host pools to keep.
+            pool_maxsize (int): Maximum connections kept open per host.
+            max_retries (int): Retries for failed connection attempts.
+            keep_alive (bool): If False, connections are closed after each call.
+            timeout (tuple): Default (connect, read) timeout in seconds.
+        """
+        self.timeout = timeout
+        self.stats = PoolStats()
+        self.pool_maxsize = pool_maxsize
+
+        retries = Retry(total=max_retries, connect=max_retries, read=0, status=0,
+                        backoff_factor=0.2, raise_on_status=False)
+        adapter = _CountingHTTPAdapter(self.stats,
+                                       pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       max_retries=retries,
+                                       pool_block=False)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request through the pooled session, applying the default timeout.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_pool_stats(self) -> dict:
+        """
+        Returns the connection reuse counters for this client.
+        """
+        stats = self.stats.to_dict()
+        stats["pool_maxsize"] = self.pool_maxsize
+        return stats
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[EbayHttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> EbayHttpClient:
+    """
+    Returns the process-wide EbayHttpClient, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = EbayHttpClient()
+                logger.info("Created pooled eBay HTTP client (pool_maxsize=%d)", _client.pool_maxsize)
+    return _client
@@ -0,0 +1,134 @@
+"""
+Bulk imports tracked items from CSV or NDJSON files, or from a list of eBay ids.
+
+CSV files need a header row naming the columns: ebay_item_id, title, price,
+available_quantity and optionally sold_quantity and alert_price. NDJSON
+files hold one JSON object per line with the same keys. With --ebay-ids the
+file holds one eBay item id per line and the item data is fetched from eBay;
+ids already in the catalog are skipped, so an interrupted import can be rerun.
+
+Usage:
+    python -m ebay.services.item_import FILE [--format csv|ndjson] [--chunk-size N]
+    python -m ebay.services.item_import FILE --ebay-ids [--workers N] [--commit-size N]
+
+Use "-" as FILE to read from stdin (the format must then be given).
+"""
+import argparse
+import csv
+import json
+import logging
+import sqlite3
+import sys
+from typing import IO, Iterable, Iterator, List, Optional
+
+from ebay.models.item_model import BULK_CHUNK_SIZE, HYDRATE_COMMIT_SIZE, create_items_bulk, create_items_ebay_ids
+from ebay.services.ebay_client import BATCH_MAX_WORKERS
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Yields one dict per CSV data row, keyed by the header row.
+    """
+    for row in csv.DictReader(lines):
+        yield {key.strip(): value for key, value in row.items() if key is not None}
+
+
+def read_ndjson_rows(lines: Iterable[str]) -> Iterator:
+    """
+    Yields the JSON value on each non-blank line.
+
+    A line that is not valid JSON is yielded as the raw text, so the bulk
+    loader reports it as an invalid row instead of aborting the import.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line.strip()
+
+
+def detect_format(path: str) -> str:
+    return "ndjson" if path.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def import_items(f: IO[str], fmt: str, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """
+    Loads every item in an open CSV or NDJSON file.
+
+    Args:
+        f (file): The open file.
+        fmt (str): "csv" or "ndjson".
+        chunk_size (int): The number of rows per executemany call.
+
+    Returns:
+        dict: The summary returned by create_items_bulk.
+    """
+    rows = read_csv_rows(f) if fmt == "csv" else read_ndjson_rows(f)
+    return create_items_bulk(rows, chunk_size=chunk_size)
+
+
+def read_ebay_ids(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yields the eBay item id on each non-blank line, ignoring # comments.
+    """
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield line
+
+
+def report_progress(done: int, total: int) -> None:
+    print(f"{done}/{total} eBay ids processed", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ebay.services.item_import",
+                                     description="Bulk import tracked items from a CSV or NDJSON file.")
+    parser.add_argument("file", help="The file to import, or - for stdin")
+    parser.add_argument("--format", choices=("csv", "ndjson"),
+                        help="The file format (guessed from the extension by default)")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE)
+    parser.add_argument("--errors-only", action="store_true", help="Only list the rows that failed")
+    parser.add_argument("--ebay-ids", action="store_true",
+                        help="The file lists eBay item ids to fetch from eBay, one per line")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS,
+                        help="Concurrent eBay calls with --ebay-ids")
+    parser.add_argument("--commit-size", type=int, default=HYDRATE_COMMIT_SIZE,
+                        help="Items per transaction with --ebay-ids")
+    args = parser.parse_args(argv)
+
+    if args.file == "-" and not args.format and not args.ebay_ids:
+        parser.error("--format is required when reading from stdin")
+    fmt = args.format or detect_format(args.file)
+
+    try:
+        with (sys.stdin if args.file == "-" else open(args.file, newline="")) as f:
+            if args.ebay_ids:
+                summary = create_items_ebay_ids(read_ebay_ids(f), max_workers=args.workers,
+                                                commit_size=args.commit_size, progress=report_progress)
+            else:
+                summary = import_items(f, fmt, args.chunk_size)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.errors_only:
+        summary["results"] = [result for result in summary["results"] if result["status"] == "error"]
+    print(json.dumps(summary, indent=2))
+    if summary.get("stopped"):
+        print(f"Stopped with {summary['pending']} eBay ids pending: {summary['stopped']['error']}. "
+              f"Run again in {summary['stopped']['retry_after']:.0f}s to resume.", file=sys.stderr)
+    return 1 if summary["failed"] or summary.get("stopped") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
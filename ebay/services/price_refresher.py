@@ -0,0 +1,510 @@
+"""
+Background price refresher for the tracked items in the catalog.
+
+Re-polls every live item through search_item_by_id, records each price in
+the price history, updates the item's price and quantities, and feeds the
+price into an AlertEngine, which is evaluated over the whole catalog every
+REFRESH_STATUS_INTERVAL; each alert is logged and its time saved on the item.
+
+Items wait on a priority queue ordered by when they are next due. An item's
+refresh interval shrinks from REFRESH_MAX_INTERVAL towards
+REFRESH_MIN_INTERVAL the closer its price is to its alert price and the more
+its price has moved over the last day, and it is due that long after it was
+last checked; so the items most likely to cross their alert price are polled
+most often, and when the worker falls behind, the ones overdue longest go
+first. eBay calls are paced by a token bucket to stay within
+REFRESH_CALLS_PER_MINUTE.
+
+The worker runs as its own process and writes its queue depth and lag to the
+refresher_status table, which the web app reports at /api/refresher/status.
+
+Usage:
+    python -m ebay.services.price_refresher [--calls-per-minute N] [--once]
+"""
+import argparse
+from collections import deque
+from dataclasses import dataclass
+import heapq
+import json
+import logging
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ebay.models.item_model import iter_all_items
+from ebay.models.price_history_model import RESOLUTIONS, PriceHistoryWriter
+from ebay.services.alert_engine import AlertEngine, PriceAlert
+from ebay.services.ebay_client import parse_item_details, search_item_by_id
+from ebay.services.rate_limiter import RateLimitExceeded, TokenBucket
+from ebay.services.resilience import CircuitOpenError
+from ebay.utils.logger import configure_logger
+from ebay.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# eBay item calls the refresher may make per minute, leaving the rest of the quota to the app
+REFRESH_CALLS_PER_MINUTE = float(os.getenv("REFRESH_CALLS_PER_MINUTE", 30))
+
+# Bounds of an item's refresh interval in seconds: the most urgent items are
+# checked every REFRESH_MIN_INTERVAL, quiet ones every REFRESH_MAX_INTERVAL
+REFRESH_MIN_INTERVAL = float(os.getenv("REFRESH_MIN_INTERVAL", 300))
+REFRESH_MAX_INTERVAL = float(os.getenv("REFRESH_MAX_INTERVAL", 6 * 3600))
+
+# How often the catalog is reloaded and the status row written, in seconds
+REFRESH_RELOAD_INTERVAL = float(os.getenv("REFRESH_RELOAD_INTERVAL", 60))
+REFRESH_STATUS_INTERVAL = float(os.getenv("REFRESH_STATUS_INTERVAL", 5))
+
+# Items priced this far above their alert price (as a fraction of the price)
+# are not close to it at all; the default alert price of 60% sits exactly here
+ALERT_GAP_SCALE = 0.4
+
+# A price range this wide relative to the mean over the last day counts as fully volatile
+VOLATILITY_FULL_SCALE = 0.2
+VOLATILITY_WINDOW = 86400
+
+
+@dataclass
+class TrackedItem:
+    id: int
+    ebay_item_id: str
+    price: float
+    alert_price: float
+    volatility: float = 0.0
+    last_checked: Optional[float] = None
+    failures: int = 0
+    due_at: float = 0.0
+
+
+def alert_closeness(price: Optional[float], alert_price: Optional[float]) -> float:
+    """
+    Returns how close a price is to its alert price, from 0 (far above it) to 1 (at or below it).
+    """
+    if not price or alert_price is None:
+        return 0.0
+    if price <= alert_price:
+        return 1.0
+    gap = (price - alert_price) / price
+    return max(0.0, 1.0 - gap / ALERT_GAP_SCALE)
+
+
+def urgency(item: TrackedItem) -> float:
+    """
+    Combines alert closeness and volatility into one score from 0 to 1.
+
+    Either factor alone can make an item urgent: the score is 1 - (1 - a)(1 - b).
+    """
+    return 1.0 - (1.0 - alert_closeness(item.price, item.alert_price)) * (1.0 - item.volatility)
+
+
+def refresh_interval(score: float, min_interval: float = REFRESH_MIN_INTERVAL,
+                     max_interval: float = REFRESH_MAX_INTERVAL) -> float:
+    """
+    Maps an urgency score to a refresh interval, geometrically from max_interval (0) to min_interval (1).
+    """
+    score = min(1.0, max(0.0, score))
+    return max_interval * (min_interval / max_interval) ** score
+
+
+class RefreshQueue:
+    """
+    A priority queue of tracked items keyed by when each is next due.
+
+    Rescheduling an item pushes a new heap entry; entries that no longer
+    match the item's due time, or whose item was dropped, are skipped when
+    they reach the top.
+    """
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._items: Dict[int, TrackedItem] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._items
+
+    def get(self, item_id: int) -> Optional[TrackedItem]:
+        return self._items.get(item_id)
+
+    def schedule(self, item: TrackedItem, due_at: float) -> None:
+        """
+        Adds an item, or moves it, to be due at `due_at`. Among items due at
+        the same time, the more urgent comes first.
+        """
+        item.due_at = due_at
+        self._items[item.id] = item
+        heapq.heappush(self._heap, (due_at, -urgency(item), item.id))
+
+    def retain(self, item_ids: set) -> None:
+        """
+        Drops every item whose id is not in `item_ids`.
+        """
+        for item_id in [item_id for item_id in self._items if item_id not in item_ids]:
+            del self._items[item_id]
+
+    def pop_due(self, now: float) -> Optional[TrackedItem]:
+        """
+        Removes and returns the item due earliest if it is due by `now`.
+        """
+        while self._heap:
+            due_at, _, item_id = self._heap[0]
+            item = self._items.get(item_id)
+            if item is None or item.due_at != due_at:
+                heapq.heappop(self._heap)
+                continue
+            if due_at > now:
+                return None
+            heapq.heappop(self._heap)
+            del self._items[item_id]
+            return item
+        return None
+
+    def next_due(self) -> Optional[float]:
+        """
+        Returns when the earliest item is due, or None if the queue is empty.
+        """
+        while self._heap:
+            due_at, _, item_id = self._heap[0]
+            item = self._items.get(item_id)
+            if item is not None and item.due_at == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def depth(self, now: float) -> int:
+        """
+        Returns the number of items that are due.
+        """
+        return sum(1 for item in self._items.values() if item.due_at <= now)
+
+    def lag(self, now: float) -> float:
+        """
+        Returns how long the most overdue item has been waiting, in seconds.
+        """
+        next_due = self.next_due()
+        return max(0.0, now - next_due) if next_due is not None else 0.0
+
+
+def _fetch_item(ebay_item_id: str) -> dict:
+    data = search_item_by_id(ebay_item_id)
+    if not data:
+        raise ValueError(f"No data found for ebay item id: {ebay_item_id}")
+    return parse_item_details(ebay_item_id, data)
+
+
+class PriceRefresher:
+    """
+    Re-polls tracked items within an eBay call budget.
+    """
+
+    def __init__(self,
+                 calls_per_minute: float = REFRESH_CALLS_PER_MINUTE,
+                 worker: Optional[str] = None,
+                 fetch: Callable[[str], dict] = _fetch_item,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Optional[Callable[[float], None]] = None):
+        """
+        Args:
+            calls_per_minute (float): The eBay call budget.
+            worker (str, optional): The name the status is recorded under. Defaults to host:pid.
+            fetch (callable): Returns parsed item details for an eBay item id.
+            clock (callable): Time source, overridable for tests.
+            sleep (callable, optional): Sleep function, overridable for tests. By
+                default the worker waits on its stop event.
+        """
+        if calls_per_minute <= 0:
+            raise ValueError(f"Invalid call budget: {calls_per_minute} (must be positive).")
+        self.calls_per_minute = calls_per_minute
+        self.worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = RefreshQueue()
+        # Allow a burst of at most 5 seconds' worth of calls
+        self.bucket = TokenBucket(calls_per_minute / 60, max(1, int(calls_per_minute / 12)), clock=clock)
+        self.history = PriceHistoryWriter()
+        self.alerts = AlertEngine(clock=clock)
+        self._fetch = fetch
+        self._clock = clock
+        self._sleep = sleep
+        self._updates: List[tuple] = []
+        self._notified: List[tuple] = []
+        self._calls = deque()
+        self.started_at = clock()
+        self.loaded_at: Optional[float] = None
+        self.status_written_at: Optional[float] = None
+        self.counts = {"refreshed": 0, "errors": 0, "alerts": 0}
+
+    def load_items(self) -> None:
+        """
+        Syncs the queue with the live items in the catalog.
+
+        New items are scheduled from when their price was last recorded, or
+        now if it never was; items no longer in the catalog are dropped; items
+        already queued keep their schedule but pick up price and alert changes.
+        The alert engine is reloaded with the same items.
+        """
+        self.flush()
+        now = self._clock()
+        observed = self._recent_observations(now)
+        notified = self._last_notified()
+        live = set()
+        columns = ([], [], [], [])
+        for row in iter_all_items():
+            live.add(row["id"])
+            for column, value in zip(columns, (row["id"], row["price"], row["alert_price"],
+                                               notified.get(row["id"], float("nan")))):
+                column.append(value)
+            item = self.queue.get(row["id"])
+            last_checked, volatility = observed.get(row["id"], (None, 0.0))
+            if item is not None:
+                item.price, item.alert_price, item.volatility = row["price"], row["alert_price"], volatility
+                continue
+            item = TrackedItem(row["id"], row["ebay_item_id"], row["price"], row["alert_price"],
+                               volatility=volatility, last_checked=last_checked)
+            due_at = now if last_checked is None else min(now, last_checked + refresh_interval(urgency(item)))
+            self.queue.schedule(item, due_at)
+
+        self.queue.retain(live)
+        self.alerts.load(*columns)
+        self.loaded_at = now
+        logger.info("Tracking %d items, %d due", len(self.queue), self.queue.depth(now))
+
+    def _last_notified(self) -> Dict[int, float]:
+        with get_db_connection() as conn:
+            return dict(conn.execute(
+                "SELECT id, last_notified_at FROM items WHERE deleted = FALSE AND last_notified_at IS NOT NULL"
+            ).fetchall())
+
+    def _recent_observations(self, now: float) -> Dict[int, tuple]:
+        """
+        Returns each item's last observation time and volatility over the last day, from the hourly rollups.
+        """
+        with get_db_connection() as conn:
+            rows = conn.execute("""
+                SELECT item_id, MAX(last_observed_at), MIN(min_price), MAX(max_price), SUM(sum_price) / SUM(samples)
+                FROM price_rollups
+                WHERE resolution = ? AND bucket >= ?
+                GROUP BY item_id
+            """, (RESOLUTIONS["hour"], int(now - VOLATILITY_WINDOW))).fetchall()
+        return {
+            item_id: (last_observed, min(1.0, (high - low) / mean / VOLATILITY_FULL_SCALE) if mean else 0.0)
+            for item_id, last_observed, low, high, mean in rows
+        }
+
+    def refresh(self, item: TrackedItem) -> None:
+        """
+        Polls one item, records its price and schedules its next check.
+
+        Raises:
+            RateLimitExceeded, CircuitOpenError: If eBay cannot be called right now.
+                The item is put back to be retried when the wait is over.
+        """
+        now = self._clock()
+        self._calls.append(now)
+        try:
+            details = self._fetch(item.ebay_item_id)
+            price = details["price"]
+            if not price or price <= 0:
+                raise ValueError(f"Invalid price: {price}")
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            self.queue.schedule(item, now + e.retry_after)
+            raise
+        except Exception as e:
+            item.failures += 1
+            self.counts["errors"] += 1
+            backoff = min(REFRESH_MAX_INTERVAL, REFRESH_MIN_INTERVAL * 2 ** item.failures)
+            logger.warning("Refreshing item %s (%s) failed, retrying in %ds: %s",
+                           item.id, item.ebay_item_id, backoff, str(e))
+            self.queue.schedule(item, now + backoff)
+            return
+
+        item.price, item.last_checked, item.failures = price, now, 0
+        self.alerts.update_prices([item.id], [price])
+        self.history.add(item.id, price, details.get("available_quantity"), details.get("sold_quantity"),
+                         observed_at=now)
+        self._updates.append((price, details.get("available_quantity"), details.get("sold_quantity"), item.id))
+        self.counts["refreshed"] += 1
+        self.queue.schedule(item, now + refresh_interval(urgency(item)))
+        if len(self._updates) >= self.history.batch_size:
+            self.flush()
+
+    def check_alerts(self) -> List[PriceAlert]:
+        """
+        Evaluates the alert engine and logs every alert that fires.
+        """
+        now = self._clock()
+        alerts = self.alerts.evaluate(now)
+        for alert in alerts:
+            item = self.queue.get(alert.item_id)
+            logger.warning("Price alert: item %s (%s) is at %.2f, at or below its alert price of %.2f",
+                           alert.item_id, item.ebay_item_id if item else "?", alert.price, alert.alert_price)
+            self._notified.append((now, alert.item_id))
+        self.counts["alerts"] += len(alerts)
+        return alerts
+
+    def flush(self) -> None:
+        """
+        Writes the buffered price observations, item updates and alert times.
+        """
+        self.history.flush()
+        if self._updates:
+            updates, self._updates = self._updates, []
+            with get_db_connection() as conn:
+                conn.executemany("""
+                    UPDATE items
+                    SET price = ?,
+                        available_quantity = COALESCE(?, available_quantity),
+                        sold_quantity = COALESCE(?, sold_quantity)
+                    WHERE id = ?
+                """, updates)
+                conn.commit()
+        if self._notified:
+            notified, self._notified = self._notified, []
+            with get_db_connection() as conn:
+                conn.executemany("UPDATE items SET last_notified_at = ? WHERE id = ?", notified)
+                conn.commit()
+
+    def step(self) -> Optional[float]:
+        """
+        Does the next piece of work: reloads the catalog or writes the status
+        if it is time, then refreshes the most overdue item if the budget allows.
+
+        Returns:
+            float: 0 if an item was refreshed, otherwise the seconds to wait for the next due item
+            or call token, or None if nothing is due.
+        """
+        now = self._clock()
+        if self.loaded_at is None or now - self.loaded_at >= REFRESH_RELOAD_INTERVAL:
+            self.load_items()
+        if self.status_written_at is None or now - self.status_written_at >= REFRESH_STATUS_INTERVAL:
+            self.check_alerts()
+            self.flush()
+            self.write_status()
+
+        next_due = self.queue.next_due()
+        if next_due is None:
+            return None
+        if next_due > now:
+            return next_due - now
+        wait = self.bucket.try_acquire()
+        if wait:
+            return wait
+
+        item = self.queue.pop_due(now)
+        try:
+            self.refresh(item)
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            logger.warning("eBay unavailable to the refresher, pausing %.1fs: %s", e.retry_after, str(e))
+            return e.retry_after
+        return 0.0
+
+    def run(self, stop: Optional[threading.Event] = None, once: bool = False) -> None:
+        """
+        Refreshes items until `stop` is set, or with `once`, until no item is due.
+        """
+        stop = stop or threading.Event()
+        logger.info("Price refresher %s started with a budget of %g calls per minute",
+                    self.worker, self.calls_per_minute)
+        try:
+            while not stop.is_set():
+                wait = self.step()
+                if once:
+                    next_due = self.queue.next_due()
+                    if next_due is None or next_due > self._clock():
+                        break
+                if wait:
+                    # Wake up at least once per status interval to reload and report
+                    (self._sleep or stop.wait)(min(wait, REFRESH_STATUS_INTERVAL))
+        finally:
+            self.check_alerts()
+            self.flush()
+            self.write_status()
+            logger.info("Price refresher %s stopped: %s", self.worker, json.dumps(self.counts))
+
+    def status(self) -> dict:
+        """
+        Returns the worker's queue depth, lag, call rate and counters.
+        """
+        now = self._clock()
+        while self._calls and self._calls[0] <= now - 60:
+            self._calls.popleft()
+        return {
+            "worker": self.worker,
+            "pid": os.getpid(),
+            "started_at": int(self.started_at),
+            "updated_at": int(now),
+            "tracked": len(self.queue),
+            "queue_depth": self.queue.depth(now),
+            "lag_seconds": round(self.queue.lag(now), 1),
+            "calls_last_minute": len(self._calls),
+            "calls_per_minute": self.calls_per_minute,
+            **self.counts,
+        }
+
+    def write_status(self) -> None:
+        """
+        Saves the status to the refresher_status table. Failures are logged, not raised.
+        """
+        status = self.status()
+        columns = list(status)
+        try:
+            with get_db_connection() as conn:
+                conn.execute(f"""
+                    INSERT INTO refresher_status ({', '.join(columns)})
+                    VALUES ({', '.join('?' * len(columns))})
+                    ON CONFLICT (worker) DO UPDATE SET
+                        {', '.join(f'{column} = excluded.{column}' for column in columns[1:])}
+                """, [status[column] for column in columns])
+                conn.commit()
+            self.status_written_at = self._clock()
+        except sqlite3.Error as e:
+            logger.error("Could not save the refresher status: %s", str(e))
+
+
+def get_refresher_status(stale_after: float = 3 * REFRESH_STATUS_INTERVAL) -> List[dict]:
+    """
+    Returns the last status saved by each refresher worker.
+
+    A worker whose status is older than `stale_after` seconds is marked stale:
+    it has most likely stopped.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.execute("SELECT * FROM refresher_status ORDER BY worker")
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    now = time.time()
+    for row in rows:
+        row["stale"] = now - row["updated_at"] > stale_after
+    return rows
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ebay.services.price_refresher",
+                                     description="Re-poll tracked item prices from eBay in the background.")
+    parser.add_argument("--calls-per-minute", type=float, default=REFRESH_CALLS_PER_MINUTE,
+                        help="The eBay call budget")
+    parser.add_argument("--worker", help="The name to record the status under (default host:pid)")
+    parser.add_argument("--once", action="store_true", help="Exit once no item is due")
+    args = parser.parse_args(argv)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    try:
+        PriceRefresher(args.calls_per_minute, worker=args.worker).run(stop, once=args.once)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
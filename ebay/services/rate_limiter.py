@@ -0,0 +1,253 @@
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from ebay.utils.logger import configure_logger
+from ebay.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Refill rate (calls per second) and burst size for each endpoint family
+RATE_LIMITS = {
+    "search": (float(os.getenv("EBAY_RATE_SEARCH", 5)), int(os.getenv("EBAY_BURST_SEARCH", 10))),
+    "item": (float(os.getenv("EBAY_RATE_ITEM", 10)), int(os.getenv("EBAY_BURST_ITEM", 20))),
+    "oauth": (float(os.getenv("EBAY_RATE_OAUTH", 1)), int(os.getenv("EBAY_BURST_OAUTH", 2))),
+}
+# Daily call quota for each endpoint family
+DAILY_QUOTAS = {
+    "search": int(os.getenv("EBAY_DAILY_QUOTA_SEARCH", 5000)),
+    "item": int(os.getenv("EBAY_DAILY_QUOTA_ITEM", 5000)),
+    "oauth": int(os.getenv("EBAY_DAILY_QUOTA_OAUTH", 1000)),
+}
+# "block" waits for a token, "fail" raises RateLimitExceeded straight away
+RATE_LIMIT_MODE = os.getenv("EBAY_RATE_LIMIT_MODE", "block")
+# The longest a blocking caller will wait before giving up
+RATE_LIMIT_MAX_WAIT = float(os.getenv("EBAY_RATE_LIMIT_MAX_WAIT", 5))
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a call would exceed the eBay rate limit or daily quota.
+
+    Attributes:
+        retry_after (float): Seconds until the call can be retried.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that refills continuously at a fixed rate.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): The maximum number of tokens held, i.e. the burst size.
+            clock (callable): Time source, overridable for tests.
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError(f"Invalid token bucket: rate={rate}, capacity={capacity} (must be positive).")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def available(self) -> float:
+        with self._lock:
+            elapsed = self._clock() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class QuotaStore:
+    """
+    Counts calls per endpoint family per UTC day in SQLite.
+
+    The counter lives in the application database so that it survives
+    restarts and is shared by every worker process. If the database cannot
+    be reached, counting continues in memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._memory: Dict[Tuple[str, str], int] = {}
+        self._table_ready = False
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def reserve(self, family: str, quota: int) -> bool:
+        """
+        Counts one call against today's quota if there is room for it.
+
+        Args:
+            family (str): The endpoint family.
+            quota (int): The daily quota for the family.
+
+        Returns:
+            bool: True if the call was counted, False if the quota is used up.
+        """
+        day = self.today()
+        try:
+            with get_db_connection() as conn:
+                self._ensure_table(conn)
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT calls FROM api_quota WHERE day = ? AND family = ?",
+                                   (day, family)).fetchone()
+                calls = row[0] if row else 0
+                if calls >= quota:
+                    conn.rollback()
+                    return False
+                conn.execute("""
+                    INSERT INTO api_quota (day, family, calls) VALUES (?, ?, 1)
+                    ON CONFLICT(day, family) DO UPDATE SET calls = calls + 1
+                """, (day, family))
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            logger.warning("Quota store unavailable, counting in memory: %s", str(e))
+            with self._lock:
+                calls = self._memory.get((day, family), 0)
+                if calls >= quota:
+                    return False
+                self._memory[(day, family)] = calls + 1
+                return True
+
+    def calls_today(self, family: str) -> int:
+        day = self.today()
+        try:
+            with get_db_connection() as conn:
+                self._ensure_table(conn)
+                row = conn.execute("SELECT calls FROM api_quota WHERE day = ? AND family = ?",
+                                   (day, family)).fetchone()
+                return row[0] if row else 0
+        except sqlite3.Error:
+            with self._lock:
+                return self._memory.get((day, family), 0)
+
+    def _ensure_table(self, conn: sqlite3.Connection) -> None:
+        if not self._table_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_quota (
+                    day TEXT NOT NULL,
+                    family TEXT NOT NULL,
+                    calls INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, family)
+                )
+            """)
+            conn.commit()
+            self._table_ready = True
+
+
+def seconds_until_utc_midnight() -> float:
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+class RateLimiter:
+    """
+    Client-side rate limiting and daily quota accounting for the eBay APIs.
+
+    Each endpoint family (search, item, oauth) has its own token bucket and
+    daily quota. Callers either block until a token is available or fail
+    fast with RateLimitExceeded, which carries the retry-after time.
+    """
+
+    def __init__(self,
+                 rate_limits: Dict[str, Tuple[float, int]] = RATE_LIMITS,
+                 daily_quotas: Dict[str, int] = DAILY_QUOTAS,
+                 mode: str = RATE_LIMIT_MODE,
+                 max_wait: float = RATE_LIMIT_MAX_WAIT,
+                 quota_store: Optional[QuotaStore] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate_limits (dict): (calls per second, burst size) for each family.
+            daily_quotas (dict): The daily call quota for each family.
+            mode (str): "block" to wait for a token, "fail" to raise immediately.
+            max_wait (float): The longest a blocking caller waits, in seconds.
+            quota_store (QuotaStore, optional): Where daily call counts are kept.
+            sleep (callable): Sleep function, overridable for tests.
+        """
+        if mode not in ("block", "fail"):
+            raise ValueError(f"Invalid rate limit mode: {mode} (must be 'block' or 'fail').")
+        self.mode = mode
+        self.max_wait = max_wait
+        self.daily_quotas = dict(daily_quotas)
+        self.buckets = {family: TokenBucket(rate, burst) for family, (rate, burst) in rate_limits.items()}
+        self.quota_store = quota_store or QuotaStore()
+        self._sleep = sleep
+
+    def acquire(self, family: str, block: Optional[bool] = None) -> None:
+        """
+        Waits for, or checks, permission to make one call in an endpoint family.
+
+        Args:
+            family (str): The endpoint family: search, item or oauth.
+            block (bool, optional): Overrides the limiter's mode for this call.
+
+        Raises:
+            RateLimitExceeded: If the call is not allowed, with the seconds to wait before retrying.
+        """
+        block = self.mode == "block" if block is None else block
+        bucket = self.buckets[family]
+        waited = 0.0
+        while True:
+            wait = bucket.try_acquire()
+            if wait == 0:
+                break
+            if not block or waited + wait > self.max_wait:
+                logger.warning("Rate limit reached for eBay %s calls, retry after %.2fs", family, wait)
+                raise RateLimitExceeded(f"Rate limit exceeded for eBay {family} calls", retry_after=wait)
+            self._sleep(wait)
+            waited += wait
+
+        quota = self.daily_quotas.get(family)
+        if quota is not None and not self.quota_store.reserve(family, quota):
+            retry_after = seconds_until_utc_midnight()
+            logger.error("Daily eBay quota of %d %s calls used up", quota, family)
+            raise RateLimitExceeded(f"Daily quota exceeded for eBay {family} calls", retry_after=retry_after)
+
+    def stats(self) -> dict:
+        """
+        Returns available tokens and today's call count for each family.
+        """
+        return {
+            family: {
+                "tokens_available": round(bucket.available(), 2),
+                "calls_today": self.quota_store.calls_today(family),
+                "daily_quota": self.daily_quotas.get(family),
+            }
+            for family, bucket in self.buckets.items()
+        }
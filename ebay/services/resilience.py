@@ -0,0 +1,227 @@
+import asyncio
+from collections import deque
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling eBay while a circuit breaker is open.
+
+    Attributes:
+        retry_after (float): Seconds until the breaker lets a trial call through.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker driven by the error rate over a rolling window.
+
+    While closed, calls go through and their outcomes are recorded. Once at
+    least `min_calls` calls in the last `window` seconds have an error rate of
+    `failure_threshold` or more, the breaker opens and calls fail fast for
+    `open_duration` seconds. It then half-opens and lets `half_open_calls`
+    trial calls through: a success closes it, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self,
+                 name: str,
+                 failure_threshold: float = 0.5,
+                 min_calls: int = 10,
+                 window: float = 60,
+                 open_duration: float = 30,
+                 half_open_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name (str): A label used in logs and errors.
+            failure_threshold (float): The error rate, between 0 and 1, that opens the breaker.
+            min_calls (int): The minimum calls in the window before the rate is considered.
+            window (float): The length of the rolling window, in seconds.
+            open_duration (float): Seconds to fail fast before letting a trial call through.
+            half_open_calls (int): The number of concurrent trial calls allowed when half-open.
+            clock (callable): Time source, overridable for tests.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.window = window
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+
+    def before_call(self) -> None:
+        """
+        Checks whether a call may go through.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its trial calls in use.
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.open_duration - self._clock()
+                if remaining > 0:
+                    raise CircuitOpenError(f"eBay {self.name} calls are failing, circuit is open", remaining)
+                self._state = self.HALF_OPEN
+                self._trials = 0
+                logger.info("Circuit for eBay %s calls is half-open", self.name)
+
+            if self._state == self.HALF_OPEN:
+                if self._trials >= self.half_open_calls:
+                    raise CircuitOpenError(f"eBay {self.name} calls are failing, circuit is half-open",
+                                           self.open_duration)
+                self._trials += 1
+
+    def cancel_call(self) -> None:
+        """
+        Gives back the trial slot of a call allowed by before_call that was never sent.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                logger.info("Circuit for eBay %s calls closed", self.name)
+                return
+            self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (self._state == self.CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_threshold):
+                self._open()
+
+    def state(self) -> dict:
+        """
+        Returns the breaker's state and the error rate over the current window.
+        """
+        with self._lock:
+            self._prune(self._clock())
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            state = {
+                "state": self._state,
+                "calls": calls,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+            }
+            if self._state == self.OPEN:
+                state["retry_after"] = round(max(self._opened_at + self.open_duration - self._clock(), 0), 2)
+            return state
+
+    def _record(self, ok: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, ok))
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        logger.error("Circuit for eBay %s calls opened for %ss", self.name, self.open_duration)
+
+
+def retry_with_backoff(fn: Callable[[], T],
+                       max_attempts: int,
+                       is_retryable: Callable[[BaseException], bool],
+                       base_delay: float = 0.2,
+                       max_delay: float = 2.0,
+                       sleep: Callable[[float], None] = time.sleep,
+                       rng: Optional[random.Random] = None) -> T:
+    """
+    Calls `fn`, retrying retryable errors with full-jitter exponential backoff.
+
+    Before retry n (starting at 0) the caller sleeps a random time between 0
+    and min(max_delay, base_delay * 2 ** n), which spreads retries from many
+    threads instead of having them hit eBay in lockstep.
+
+    Args:
+        fn (callable): The zero-argument call to make.
+        max_attempts (int): The total number of attempts, including the first.
+        is_retryable (callable): Returns True for errors worth retrying.
+        base_delay (float): The backoff ceiling of the first retry, in seconds.
+        max_delay (float): The largest backoff ceiling, in seconds.
+        sleep (callable): Sleep function, overridable for tests.
+        rng (random.Random, optional): Random source, overridable for tests.
+
+    Returns:
+        The result of the first successful call.
+    """
+    rng = rng or random
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not is_retryable(e):
+                raise
+            delay = _backoff_delay(rng, attempt, base_delay, max_delay)
+            logger.warning("Retrying eBay call in %.2fs after error (attempt %d of %d): %s",
+                           delay, attempt + 1, max_attempts, str(e))
+            sleep(delay)
+
+
+async def retry_with_backoff_async(fn: Callable[[], Awaitable[T]],
+                                   max_attempts: int,
+                                   is_retryable: Callable[[BaseException], bool],
+                                   base_delay: float = 0.2,
+                                   max_delay: float = 2.0,
+                                   sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+                                   rng: Optional[random.Random] = None) -> T:
+    """
+    The asyncio form of retry_with_backoff: awaits `fn`, with the same full-jitter backoff between retries.
+    """
+    rng = rng or random
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not is_retryable(e):
+                raise
+            delay = _backoff_delay(rng, attempt, base_delay, max_delay)
+            logger.warning("Retrying eBay call in %.2fs after error (attempt %d of %d): %s",
+                           delay, attempt + 1, max_attempts, str(e))
+            await sleep(delay)
+
+
+def _backoff_delay(rng, attempt: int, base_delay: float, max_delay: float) -> float:
+    return rng.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class TokenManager:
+    """
+    A thread-safe cache for an OAuth access token that refreshes ahead of expiry.
+
+    Once the token is within `refresh_skew` seconds of expiring, a single
+    background refresh is started and callers keep receiving the current
+    token until the new one arrives. Callers only block when there is no
+    valid token at all, and even then only one of them calls the token
+    endpoint while the rest wait for its result.
+    """
+
+    def __init__(self,
+                 fetch_token: Callable[[], Tuple[str, float]],
+                 refresh_skew: float = 300,
+                 retry_interval: float = 30,
+                 clock: Callable[[], float] = time.time,
+                 proactive: bool = True):
+        """
+        Args:
+            fetch_token (callable): Returns a new (token, expires_in) pair.
+            refresh_skew (float): Seconds before expiry at which to refresh.
+            retry_interval (float): Seconds to wait after a failed background refresh.
+            clock (callable): Time source, overridable for tests.
+            proactive (bool): If True, schedules a refresh timer after every refresh.
+        """
+        self._fetch_token = fetch_token
+        self.refresh_skew = refresh_skew
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._proactive = proactive
+        self._cond = threading.Condition()
+        self._token: Optional[str] = None
+        self._expiry = 0.0
+        self._retry_at = 0.0
+        self._refreshing = False
+        self._generation = 0
+        self._last_error: Optional[BaseException] = None
+        self._timer: Optional[threading.Timer] = None
+        self.refreshes = 0
+
+    def get_token(self) -> str:
+        """
+        Returns a valid access token, fetching one if none is held.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            RuntimeError: If no token is held and the refresh fails.
+        """
+        with self._cond:
+            now = self._clock()
+            if self._token and now < self._expiry:
+                if (now >= self._expiry - self.refresh_skew and now >= self._retry_at
+                        and not self._refreshing):
+                    self._start_background_refresh()
+                return self._token
+
+            if self._refreshing:
+                generation = self._generation
+                while self._generation == generation:
+                    self._cond.wait()
+                if self._token and self._clock() < self._expiry:
+                    return self._token
+                raise RuntimeError(f"Failed to fetch access token: {self._last_error}")
+
+            self._refreshing = True
+
+        return self._refresh()
+
+    def invalidate(self) -> None:
+        """
+        Drops the current token so the next caller fetches a new one.
+        """
+        with self._cond:
+            self._token = None
+            self._expiry = 0.0
+
+    def stop(self) -> None:
+        """
+        Cancels the scheduled proactive refresh, if any.
+        """
+        with self._cond:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _start_background_refresh(self) -> None:
+        # Must be called with self._cond held
+        self._refreshing = True
+        thread = threading.Thread(target=self._refresh_quietly, name="ebay-token-refresh", daemon=True)
+        thread.start()
+
+    def _scheduled_refresh(self) -> None:
+        with self._cond:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._refresh_quietly()
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self._refresh()
+        except Exception as e:
+            logger.error("Background token refresh failed, keeping current token: %s", str(e))
+
+    def _refresh(self) -> str:
+        # The caller has set self._refreshing; exactly one refresh runs at a time
+        try:
+            token, expires_in = self._fetch_token()
+        except BaseException as e:
+            with self._cond:
+                self._last_error = e
+                self._retry_at = self._clock() + self.retry_interval
+                self._refreshing = False
+                self._generation += 1
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._token = token
+            self._expiry = self._clock() + expires_in
+            self._last_error = None
+            self._refreshing = False
+            self._generation += 1
+            self.refreshes += 1
+            self._cond.notify_all()
+            if self._proactive:
+                self._schedule(max(expires_in - self.refresh_skew, expires_in / 2))
+        logger.info("Access token refreshed, expires in %d seconds", expires_in)
+        return token
+
+    def _schedule(self, delay: float) -> None:
+        # Must be called with self._cond held
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._scheduled_refresh)
+        self._timer.daemon = True
+        self._timer.start()
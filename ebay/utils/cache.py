@@ -0,0 +1,262 @@
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+_MISSING = object()
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+# A cached value with its age in seconds and its freshness state
+CacheEntry = namedtuple("CacheEntry", "value age state")
+
+# What a caller was served: the value, an X-Cache style status and the age in seconds
+CacheResult = namedtuple("CacheResult", "value status age")
+
+
+class TTLCache:
+    """
+    A bounded, thread-safe LRU cache with a per-entry time to live.
+
+    Entries are evicted least-recently-used first once the cache holds
+    `maxsize` entries. An entry is fresh for `ttl` seconds. It is then stale
+    for another `stale_ttl` seconds, during which `lookup` still returns it so
+    it can be served while it is revalidated. After that it is kept for
+    `stale_if_error` more seconds purely as a fallback for failed refreshes.
+    `get` only ever returns fresh entries.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0, stale_if_error: float = 0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): The maximum number of entries to keep.
+            ttl (float): The default time an entry stays fresh, in seconds.
+            stale_ttl (float): How long after going stale an entry may still be served.
+            stale_if_error (float): How long after that an entry is kept as an error fallback.
+            clock (callable): Time source, overridable for tests.
+        """
+        if maxsize <= 0:
+            raise ValueError(f"Invalid maxsize: {maxsize} (must be a positive integer).")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None,
+            accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Retrieves a fresh entry, marking it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Returned when the key is absent or no longer fresh.
+            accept (callable, optional): If given, a stored value for which this
+                returns False is counted as a miss and left in place.
+
+        Returns:
+            The cached value, or `default`.
+        """
+        with self._lock:
+            entry = self._find(key, accept)
+            if entry is None or entry.state != FRESH:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry.value
+
+    def lookup(self, key: Hashable, accept: Optional[Callable[[Any], bool]] = None) -> Optional[CacheEntry]:
+        """
+        Retrieves an entry whether it is fresh, stale or only kept as an error fallback.
+
+        Args:
+            key: The cache key.
+            accept (callable, optional): If given, a stored value for which this
+                returns False is counted as a miss and left in place.
+
+        Returns:
+            CacheEntry: The value, its age and its state, or None if there is no usable entry.
+        """
+        with self._lock:
+            entry = self._find(key, accept)
+            if entry is None or entry.state == EXPIRED:
+                self.misses += 1
+            elif entry.state == STALE:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, age: float = 0.0) -> None:
+        """
+        Stores an entry, evicting the least recently used one if the cache is full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl (float, optional): Overrides the default time the entry stays fresh.
+            age (float): How old the value already is, e.g. when it was read from
+                a shared cache. Its TTLs are counted from when it was fetched.
+        """
+        now = self._clock() - age
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        stale_until = fresh_until + self.stale_ttl
+        keep_until = stale_until + self.stale_if_error
+        with self._lock:
+            self._data[key] = (value, now, fresh_until, stale_until, keep_until)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def _find(self, key: Hashable, accept: Optional[Callable[[Any], bool]]) -> Optional[CacheEntry]:
+        """
+        Looks an entry up without counting it, dropping it if it has outlived every TTL.
+        Must be called with the lock held.
+        """
+        now = self._clock()
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return None
+        value, stored_at, fresh_until, stale_until, keep_until = entry
+        if keep_until <= now:
+            del self._data[key]
+            self.expirations += 1
+            return None
+        if accept is not None and not accept(value):
+            return None
+
+        self._data.move_to_end(key)
+        if now < fresh_until:
+            state = FRESH
+        elif now < stale_until:
+            state = STALE
+        else:
+            state = EXPIRED
+        return CacheEntry(value, now - stored_at, state)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Returns hit, miss and eviction counters for the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class StaleWhileRevalidate:
+    """
+    Serves cache entries with stale-while-revalidate semantics.
+
+    A fresh entry is served as a HIT. A stale entry is served straight away
+    as STALE while it is refreshed on a background thread; at most one
+    background refresh per key is queued at a time. With no usable entry the
+    caller blocks on the refresh (a MISS). If that refresh fails and an
+    expired entry is still held, it is served as STALE-IF-ERROR instead.
+    """
+
+    def __init__(self, max_workers: int = 2, executor: Optional[Executor] = None):
+        """
+        Args:
+            max_workers (int): Threads used for background refreshes.
+            executor (Executor, optional): Runs background refreshes instead of a private pool.
+        """
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix="cache-refresh")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.background_refreshes = 0
+        self.stale_if_error = 0
+
+    def serve(self, key: Hashable, entry: Optional[CacheEntry], refresh: Callable[[], Any]) -> CacheResult:
+        """
+        Args:
+            key: Identifies the entry, so background refreshes of it are not queued twice.
+            entry (CacheEntry): The current entry from TTLCache.lookup, or None.
+            refresh (callable): Fetches the value upstream, stores it in the cache and returns it.
+
+        Returns:
+            CacheResult: The value served, its X-Cache status and its age in seconds.
+        """
+        if entry is not None and entry.state == FRESH:
+            return CacheResult(entry.value, "HIT", entry.age)
+
+        if entry is not None and entry.state == STALE:
+            self._refresh_in_background(key, refresh)
+            return CacheResult(entry.value, "STALE", entry.age)
+
+        try:
+            return CacheResult(refresh(), "MISS", 0.0)
+        except Exception as e:
+            if entry is None:
+                raise
+            with self._lock:
+                self.stale_if_error += 1
+            logger.warning("Refresh of %s failed, serving stale data %.0fs old: %s", key, entry.age, str(e))
+            return CacheResult(entry.value, "STALE-IF-ERROR", entry.age)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "background_refreshes": self.background_refreshes,
+                "pending_refreshes": len(self._pending),
+                "stale_if_error": self.stale_if_error,
+            }
+
+    def _refresh_in_background(self, key: Hashable, refresh: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            self.background_refreshes += 1
+        try:
+            self._executor.submit(self._run_refresh, key, refresh)
+        except RuntimeError:
+            # The executor is shutting down; the entry will be refreshed on a later request
+            with self._lock:
+                self._pending.discard(key)
+
+    def _run_refresh(self, key: Hashable, refresh: Callable[[], Any]) -> None:
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning("Background refresh of %s failed, keeping stale data: %s", key, str(e))
+        finally:
+            with self._lock:
+                self._pending.discard(key)
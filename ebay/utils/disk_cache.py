@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# SQLite limits the number of bound parameters, so multi-key reads are chunked
+_MAX_KEYS_PER_QUERY = 500
+
+
+class DiskCache:
+    """
+    A persistent key-value cache with expiry, stored in a SQLite file.
+
+    Every process that opens the same file shares its entries, so a value
+    fetched by one worker is served to the others and survives restarts.
+    Values are stored as JSON. The file is opened in WAL mode so readers do
+    not block the writer.
+
+    The cache is best-effort: if the file cannot be opened or written, reads
+    behave as misses and writes are dropped, with a warning logged.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path (str): The SQLite file to store entries in. Its directory is created if needed.
+            busy_timeout (float): Seconds to wait for another process's write lock.
+            clock (callable): Wall-clock time source, shared across processes. Overridable for tests.
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Retrieves an unexpired entry.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            tuple: The value and its age in seconds, or None if there is no unexpired entry.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, float]]:
+        """
+        Retrieves the unexpired entries for several keys in as few queries as possible.
+
+        Args:
+            keys (iterable[str]): The cache keys.
+
+        Returns:
+            dict: (value, age in seconds) keyed by cache key. Keys without an unexpired entry are absent.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = self._clock()
+        try:
+            conn = self._connection()
+            for start in range(0, len(keys), _MAX_KEYS_PER_QUERY):
+                chunk = keys[start:start + _MAX_KEYS_PER_QUERY]
+                rows = conn.execute(
+                    f"SELECT key, value, stored_at FROM cache_entries "
+                    f"WHERE key IN ({','.join('?' * len(chunk))}) AND expires_at > ?",
+                    (*chunk, now)
+                ).fetchall()
+                for key, value, stored_at in rows:
+                    found[key] = (json.loads(value), max(now - stored_at, 0.0))
+        except (sqlite3.Error, OSError) as e:
+            self._record_error("read", e)
+            found = {}
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value: Any, ttl: float, kind: str = "") -> None:
+        """
+        Stores an entry, replacing any existing one.
+
+        Args:
+            key (str): The cache key.
+            value: A JSON-serializable value.
+            ttl (float): Seconds until the entry expires.
+            kind (str): A label used to group entries when inspecting or purging.
+        """
+        self.set_many({key: value}, ttl, kind)
+
+    def set_many(self, values: Dict[str, Any], ttl: float, kind: str = "") -> None:
+        """
+        Stores several entries in one transaction.
+
+        Args:
+            values (dict): JSON-serializable values keyed by cache key.
+            ttl (float): Seconds until the entries expire.
+            kind (str): A label used to group entries when inspecting or purging.
+        """
+        if not values:
+            return
+        now = self._clock()
+        rows = [(key, kind, json.dumps(value), now, now + ttl) for key, value in values.items()]
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO cache_entries (key, kind, value, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        kind = excluded.kind, value = excluded.value,
+                        stored_at = excluded.stored_at, expires_at = excluded.expires_at
+                """, rows)
+        except (sqlite3.Error, OSError) as e:
+            self._record_error("write", e)
+
+    def delete(self, key: str) -> None:
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError) as e:
+            self._record_error("write", e)
+
+    def purge(self, expired_only: bool = True, kind: Optional[str] = None) -> int:
+        """
+        Deletes entries from the cache.
+
+        Args:
+            expired_only (bool): If True, only entries past their expiry are deleted.
+            kind (str, optional): Restricts the purge to one kind of entry.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+        clauses, params = [], []
+        if expired_only:
+            clauses.append("expires_at <= ?")
+            params.append(self._clock())
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connection()
+        with conn:
+            deleted = conn.execute(f"DELETE FROM cache_entries{where}", params).rowcount
+        logger.info("Purged %d entries from the disk cache at %s", deleted, self.path)
+        return deleted
+
+    def entries(self, kind: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """
+        Lists the most recently stored entries without their values.
+
+        Args:
+            kind (str, optional): Restricts the listing to one kind of entry.
+            limit (int): The maximum number of entries to list.
+
+        Returns:
+            list[dict]: The key, kind, size in bytes, age and remaining TTL of each entry.
+        """
+        now = self._clock()
+        sql = "SELECT key, kind, LENGTH(value), stored_at, expires_at FROM cache_entries"
+        params: list = []
+        if kind is not None:
+            sql += " WHERE kind = ?"
+            params.append(kind)
+        sql += " ORDER BY stored_at DESC LIMIT ?"
+        params.append(limit)
+
+        rows = self._connection().execute(sql, params).fetchall()
+        return [
+            {
+                "key": key,
+                "kind": entry_kind,
+                "bytes": size,
+                "age": round(now - stored_at, 1),
+                "ttl_remaining": round(max(expires_at - now, 0.0), 1),
+            }
+            for key, entry_kind, size, stored_at, expires_at in rows
+        ]
+
+    def stats(self) -> dict:
+        """
+        Returns this process's hit and miss counters along with entry counts from the file.
+        """
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "errors": self.errors, "path": self.path}
+        try:
+            rows = self._connection().execute("""
+                SELECT kind, COUNT(*), SUM(expires_at <= ?), COALESCE(SUM(LENGTH(value)), 0)
+                FROM cache_entries GROUP BY kind
+            """, (self._clock(),)).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            self._record_error("read", e)
+            return stats
+
+        stats["kinds"] = {
+            kind: {"entries": entries, "expired": expired, "bytes": size}
+            for kind, entries, expired, size in rows
+        }
+        stats["entries"] = sum(kind_stats["entries"] for kind_stats in stats["kinds"].values())
+        return stats
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection, opening the file and creating the table on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS cache_entries (
+                        key TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL DEFAULT '',
+                        value TEXT NOT NULL,
+                        stored_at REAL NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries (expires_at)")
+            self._local.conn = conn
+        return conn
+
+    def _record_error(self, operation: str, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        logger.warning("Disk cache %s failed for %s: %s", operation, self.path, str(error))
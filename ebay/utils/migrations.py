@@ -0,0 +1,239 @@
+"""
+Versioned schema migrations for the application database.
+
+Migrations are the SQL files in sql/migrations, named <version>_<name>.sql
+and applied in version order. Each upgrade runs in a single transaction and
+records what it applied in the schema_migrations table (and in
+PRAGMA user_version), so running it again is a no-op. Migrations change the
+schema in place; files containing DROP TABLE are rejected. Rows a migration
+cannot keep are moved to a table whose name ends in _archive, and the upgrade
+logs how many it moved.
+
+Usage:
+    python -m ebay.utils.migrations upgrade [--db PATH] [--target VERSION]
+    python -m ebay.utils.migrations status [--db PATH]
+"""
+import argparse
+from dataclasses import dataclass
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+from typing import Dict, List, Optional
+
+from ebay.utils import sql_utils
+from ebay.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+MIGRATIONS_DIR = os.getenv(
+    "DB_MIGRATIONS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "sql", "migrations")
+)
+
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+_DROP_TABLE = re.compile(r"\bDROP\s+TABLE\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Reads the migration files in a directory.
+
+    Args:
+        directory (str): The directory holding <version>_<name>.sql files.
+
+    Returns:
+        list[Migration]: The migrations, ordered by version.
+
+    Raises:
+        ValueError: If two files share a version or a file contains DROP TABLE.
+    """
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        version, name = int(match.group(1)), match.group(2)
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {filename}")
+
+        with open(os.path.join(directory, filename)) as f:
+            sql = f.read()
+        if _DROP_TABLE.search(_strip_comments(sql)):
+            raise ValueError(f"Migration {filename} contains DROP TABLE; migrations must upgrade in place.")
+        migrations[version] = Migration(version, name, sql)
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Returns the latest migration version applied to a database, or 0 if none.
+    """
+    _ensure_version_table(conn)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+
+def upgrade(db_path: Optional[str] = None, target: Optional[int] = None,
+            directory: str = MIGRATIONS_DIR) -> List[int]:
+    """
+    Applies every pending migration, up to `target` if given, in one transaction.
+
+    The database is locked for writing while the version is checked, so
+    workers starting at the same time do not apply a migration twice.
+
+    Args:
+        db_path (str, optional): The database file. Defaults to DB_PATH.
+        target (int, optional): The highest version to apply.
+        directory (str): The directory holding the migration files.
+
+    Returns:
+        list[int]: The versions applied, empty if the schema was already current.
+
+    Raises:
+        sqlite3.Error: If a migration fails. Nothing from the upgrade is kept.
+    """
+    db_path = db_path or sql_utils.DB_PATH
+    migrations = load_migrations(directory)
+    directory_of_db = os.path.dirname(db_path)
+    if directory_of_db:
+        os.makedirs(directory_of_db, exist_ok=True)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    applied = []
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        current = get_schema_version(conn)
+        for migration in migrations:
+            if migration.version <= current or (target is not None and migration.version > target):
+                continue
+            logger.info("Applying migration %d (%s)", migration.version, migration.name)
+            archived = _archive_counts(conn)
+            try:
+                for statement in _split_statements(migration.sql):
+                    conn.execute(statement)
+            except sqlite3.Error as e:
+                raise sqlite3.Error(f"Migration {migration.version} ({migration.name}) failed: {e}") from e
+            for table, rows in _archive_counts(conn).items():
+                if rows > archived.get(table, 0):
+                    logger.warning("Migration %d (%s) moved %d row(s) to %s for review",
+                                   migration.version, migration.name, rows - archived.get(table, 0), table)
+            conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                         (migration.version, migration.name))
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+            applied.append(migration.version)
+        conn.execute("COMMIT")
+    except BaseException as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        logger.error("Database migration failed, rolled back: %s", str(e))
+        raise
+    finally:
+        conn.close()
+
+    if applied:
+        logger.info("Database at %s upgraded to schema version %d", db_path, applied[-1])
+    else:
+        logger.info("Database at %s is at schema version %d, nothing to apply", db_path, current)
+    return applied
+
+
+def status(db_path: Optional[str] = None, directory: str = MIGRATIONS_DIR) -> dict:
+    """
+    Reports which migrations have been applied to a database and which are pending.
+
+    Returns:
+        dict: The current version, the applied migrations and the pending versions.
+    """
+    db_path = db_path or sql_utils.DB_PATH
+    migrations = load_migrations(directory)
+    conn = sqlite3.connect(db_path)
+    try:
+        current = get_schema_version(conn)
+        applied = conn.execute(
+            "SELECT version, name, applied_at FROM schema_migrations ORDER BY version"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return {
+        "db_path": db_path,
+        "version": current,
+        "latest": migrations[-1].version if migrations else 0,
+        "applied": [{"version": v, "name": name, "applied_at": at} for v, name, at in applied],
+        "pending": [migration.version for migration in migrations if migration.version > current],
+    }
+
+
+def _ensure_version_table(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _archive_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    tables = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%\\_archive' ESCAPE '\\'"
+    ).fetchall()
+    return {name: conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] for (name,) in tables}
+
+
+def _strip_comments(sql: str) -> str:
+    return "\n".join(line.split("--", 1)[0] for line in sql.splitlines())
+
+
+def _split_statements(sql: str) -> List[str]:
+    """
+    Splits a SQL script into complete statements, so they can run inside the upgrade transaction.
+    """
+    statements, buffer = [], ""
+    for line in _strip_comments(sql).splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        raise ValueError(f"Incomplete SQL statement in migration: {buffer.strip()[:80]}")
+    return statements
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ebay.utils.migrations",
+                                     description="Apply or inspect database schema migrations.")
+    parser.add_argument("command", choices=("upgrade", "status"))
+    parser.add_argument("--db", help="The database file (defaults to DB_PATH)")
+    parser.add_argument("--target", type=int, help="The highest version to apply")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "upgrade":
+            applied = upgrade(args.db, target=args.target)
+            output = {"applied": applied, **status(args.db)}
+        else:
+            output = status(args.db)
+    except (sqlite3.Error, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
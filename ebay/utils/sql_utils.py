@@ -1,7 +1,11 @@
 from contextlib import contextmanager
 import logging
 import os
+import re
 import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
 
 from ebay.utils.logger import configure_logger
 
@@ -13,14 +17,298 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "./db/ebay_prices.db")
 
+# Connection pool configuration, overridable from the environment
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+
+# Rows fetched from the cursor at a time when streaming query results
+DB_FETCH_SIZE = int(os.getenv("DB_FETCH_SIZE", 500))
+
+# Pragmas applied to every pooled connection when it is opened. WAL lets
+# readers run alongside a writer, and busy_timeout makes a writer wait for
+# the lock instead of failing with "database is locked".
+DB_PRAGMAS = {
+    "journal_mode": os.getenv("DB_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("DB_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000)),
+    # Negative values are in KiB, so this is a 20 MB page cache per connection
+    "cache_size": int(os.getenv("DB_CACHE_SIZE", -20000)),
+    "mmap_size": int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024)),
+    "temp_store": os.getenv("DB_TEMP_STORE", "MEMORY"),
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """
+    Raised when no pooled connection becomes free within the checkout timeout.
+    """
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of SQLite connections to one database file.
+
+    Connections are reused across calls instead of being opened and closed
+    every time. A thread gets back the connection it used last when that one
+    is idle, otherwise any idle connection, otherwise a new one while fewer
+    than `max_size` exist; past that, checkouts wait for a connection to be
+    returned. Every checkout runs a cheap health check and replaces a broken
+    connection, and every return rolls back anything left uncommitted.
+    """
+
+    def __init__(self, path: str, max_size: int = DB_POOL_MAX_SIZE, timeout: float = DB_POOL_TIMEOUT,
+                 pragmas: Optional[Dict[str, object]] = None):
+        """
+        Args:
+            path (str): The SQLite database file.
+            max_size (int): The maximum number of open connections.
+            timeout (float): Seconds a checkout waits for a free connection.
+            pragmas (dict, optional): Pragmas applied to each new connection. Defaults to DB_PRAGMAS.
+        """
+        if max_size <= 0:
+            raise ValueError(f"Invalid max_size: {max_size} (must be a positive integer).")
+        self.pragmas = dict(DB_PRAGMAS if pragmas is None else pragmas)
+        for name, value in self.pragmas.items():
+            if not _PRAGMA_VALUE.match(name) or not _PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid pragma: {name}={value}")
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: List[sqlite3.Connection] = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+        self._metrics = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "thread_reuses": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "rollbacks_on_return": 0,
+        }
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Checks a healthy connection out of the pool.
+
+        Returns:
+            sqlite3.Connection: The connection, which must be given back with `release`.
+
+        Raises:
+            PoolTimeout: If no connection became free within the timeout.
+            sqlite3.Error: If a new connection could not be opened.
+        """
+        while True:
+            conn = self._checkout()
+            if conn is None:
+                conn = self._connect()
+            if self._is_healthy(conn):
+                self._local.last = conn
+                return conn
+            self._discard(conn)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Returns a connection to the pool, rolling back any transaction left open.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+                self._count("rollbacks_on_return")
+        except sqlite3.Error as e:
+            logger.warning("Discarding pooled connection that failed to roll back: %s", str(e))
+            self._discard(conn)
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append(conn)
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    def close(self) -> None:
+        """
+        Closes every idle connection. Connections checked out are closed when returned to a closed pool.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._metrics["connections_closed"] += len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the pool's size, usage and reuse counters.
+        """
+        with self._cond:
+            stats = dict(self._metrics)
+            stats.update({
+                "path": self.path,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+            })
+        return stats
+
+    def _checkout(self) -> Optional[sqlite3.Connection]:
+        """
+        Takes an idle connection, or returns None once there is room to open a new one.
+        """
+        deadline = time.monotonic() + self.timeout
+        last = getattr(self._local, "last", None)
+        with self._cond:
+            waited = False
+            while True:
+                if self._idle:
+                    self._metrics["checkouts"] += 1
+                    if last is not None and last in self._idle:
+                        self._idle.remove(last)
+                        self._metrics["thread_reuses"] += 1
+                        return last
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._metrics["checkouts"] += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection became free within {self.timeout}s "
+                                      f"(max_size={self.max_size})")
+                if not waited:
+                    self._metrics["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = None
+        try:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._apply_pragmas(conn)
+        except sqlite3.Error:
+            if conn is not None:
+                conn.close()
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._count("connections_created")
+        logger.info("Opened pooled database connection to %s", self.path)
+        return conn
+
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        for name, value in self.pragmas.items():
+            result = conn.execute(f"PRAGMA {name} = {value};").fetchone()
+            # journal_mode reports the mode actually in use, e.g. in-memory databases cannot use WAL
+            if name == "journal_mode" and result and str(result[0]).lower() != str(value).lower():
+                logger.warning("Requested journal_mode=%s for %s but got %s", value, self.path, result[0])
+
+    def settings(self) -> dict:
+        """
+        Reads back the configured pragmas from a pooled connection.
+
+        Returns:
+            dict: The value SQLite reports for each pragma in the profile.
+        """
+        conn = self.acquire()
+        try:
+            return {name: conn.execute(f"PRAGMA {name};").fetchone()[0] for name in self.pragmas}
+        finally:
+            self.release(conn)
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error as e:
+            self._count("health_check_failures")
+            logger.warning("Pooled database connection failed its health check: %s", str(e))
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._metrics["connections_closed"] += 1
+            self._cond.notify()
+
+    def _count(self, metric: str) -> None:
+        with self._cond:
+            self._metrics[metric] += 1
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the connection pool for the current DB_PATH, creating it on first use.
+    """
+    pool = _pools.get(DB_PATH)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(DB_PATH)
+            if pool is None:
+                pool = _pools[DB_PATH] = ConnectionPool(DB_PATH)
+    return pool
+
+
+def get_db_pool_stats() -> dict:
+    """
+    Returns the metrics of the connection pool for the current DB_PATH.
+    """
+    return get_pool().stats()
+
+
+def get_db_settings() -> dict:
+    """
+    Returns the pragma settings active on connections to the current DB_PATH.
+    """
+    return get_pool().settings()
+
+
+def close_pools() -> None:
+    """
+    Closes the idle connections of every pool, e.g. at shutdown or between tests.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def fetch_in_batches(cursor: sqlite3.Cursor, batch_size: int = DB_FETCH_SIZE) -> Iterator[tuple]:
+    """
+    Yields the rows of an executed query, reading them with fetchmany so only
+    `batch_size` rows are held in memory at a time.
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
 
 def check_database_connection():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            # This ensures the connection is actually active
+            conn.execute("SELECT 1;")
     except sqlite3.Error as e:
         error_message = f"Database connection error: {e}"
         logger.error(error_message)
@@ -28,10 +316,8 @@ def check_database_connection():
 
 def check_table_exists(tablename: str):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            conn.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
     except sqlite3.Error as e:
         error_message = f"Table check error: {e}"
         logger.error(error_message)
@@ -45,14 +331,23 @@ def check_table_exists(tablename: str):
 ###################################################
 @contextmanager
 def get_db_connection():
+    """
+    Checks a connection out of the pool for the current DB_PATH.
+
+    The connection goes back to the pool when the block exits; anything not
+    committed by then is rolled back.
+
+    Yields:
+        sqlite3.Connection: A pooled connection.
+    """
+    pool = get_pool()
     conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = pool.acquire()
         yield conn
     except sqlite3.Error as e:
         logger.error("Database connection error: %s", str(e))
         raise e
     finally:
         if conn:
-            conn.close()
-            logger.info("Database connection closed.")
\ No newline at end of file
+            pool.release(conn)
\ No newline at end of file
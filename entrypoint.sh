@@ -11,15 +11,20 @@ if [ -f .secrets.env ]; then
     export $(cat .secrets.env | xargs)
 fi
 
-# Debugging: Print the CREATE_DB value
-echo "CREATE_DB is set to: $CREATE_DB"
-
-# Check if CREATE_DB is true, and run the database creation script if so
-if [ "$CREATE_DB" = "true" ]; then
-    echo "Creating the database..."
-    ./sql/create_db.sh
+# Apply any pending schema migrations unless MIGRATE_DB is false. This is
+# safe to run on every start: applied migrations are skipped.
+if [ "$MIGRATE_DB" != "false" ]; then
+    echo "Applying database migrations..."
+    python3 -m ebay.utils.migrations upgrade || exit 1
 else
-    echo "Skipping database creation."
+    echo "Skipping database migrations."
+fi
+
+# Start the background price refresher instead of the web app when asked:
+#   docker run ... ebay_prices /app/entrypoint.sh refresher
+if [ "$1" = "refresher" ]; then
+    shift
+    exec python3 -m ebay.services.price_refresher "$@"
 fi
 
 # Start the Python application
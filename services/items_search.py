@@ -3,6 +3,7 @@ import os
 import time
 from dotenv import load_dotenv
 
+from ebay.services.http_client import get_http_client
 from  services.tokenGeneration import get_access_token
 
 # Load environment variables
@@ -30,7 +31,7 @@ def search_items(query, limit=5):
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http_client().get(url, headers=headers)
         response.raise_for_status()  # Raise an exception for HTTP errors
         data = response.json()
 
@@ -2,6 +2,9 @@
 
 BASE_URL="http://localhost:5000/api"
 
+# Wishlists are per user; the smoke tests use this one
+USER_ID=${USER_ID:-1}
+
 ECHO_JSON=false
 
 while [ "$#" -gt 0 ]; do
@@ -135,7 +138,7 @@ check_available_quantity() {
 add_item_to_wishlist() {
   local ebay_item_id=$1
   echo "Adding item '$ebay_item_id' to wishlist..."
-  response=$(curl -s -o /dev/null -w "%{http_code}" -X POST http://localhost:5000/api/add-item-to-wishlist -H "Content-Type: application/json" -d '{
+  response=$(curl -s -o /dev/null -w "%{http_code}" -X POST http://localhost:5000/api/add-item-to-wishlist -H "X-User-Id: $USER_ID" -H "Content-Type: application/json" -d '{
     "ebay_item_id": "'$ebay_item_id'",
     "title": "Laptop",
     "price": 299.99,
@@ -154,7 +157,7 @@ add_item_to_wishlist() {
 remove_item_from_wishlist() {
   local item_id=$1
   echo "Removing item '$item_id' from wishlist..."
-  response=$(curl -s -o /dev/null -w "%{http_code}" -X DELETE http://localhost:5000/api/remove-item-from-wishlist/$item_id)
+  response=$(curl -s -o /dev/null -w "%{http_code}" -X DELETE -H "X-User-Id: $USER_ID" http://localhost:5000/api/remove-item-from-wishlist/$item_id)
   if [ "$response" -eq 200 ]; then
     echo "Remove item from wishlist test passed"
   else
@@ -165,7 +168,7 @@ remove_item_from_wishlist() {
 # Function to get wishlist
 get_wishlist() {
   echo "Retrieving wishlist..."
-  response=$(curl -s -o /dev/null -w "%{http_code}" http://localhost:5000/api/get-wishlist)
+  response=$(curl -s -o /dev/null -w "%{http_code}" -H "X-User-Id: $USER_ID" http://localhost:5000/api/get-wishlist)
   if [ "$response" -eq 200 ]; then
     echo "Get wishlist test passed"
   else
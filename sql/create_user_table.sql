@@ -1,6 +0,0 @@
-CREATE TABLE IF NOT EXISTS user (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    username TEXT NOT NULL UNIQUE,
-    salt TEXT NOT NULL,
-    hashed_password TEXT NOT NULL
-);
\ No newline at end of file
@@ -0,0 +1,32 @@
+-- Baseline schema. Replaces sql/create_user_table.sql and the old
+-- sql/create_wishlist_table.sql, which created a malformed "items" table and
+-- no "wishlist" table at all. Existing tables are left untouched.
+
+CREATE TABLE IF NOT EXISTS user (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    salt TEXT NOT NULL,
+    hashed_password TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ebay_item_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    price REAL,
+    available_quantity INTEGER NOT NULL DEFAULT 0,
+    sold_quantity INTEGER NOT NULL DEFAULT 0,
+    alert_price REAL,
+    deleted BOOLEAN DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS wishlist (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ebay_item_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    price REAL,
+    available_quantity INTEGER NOT NULL DEFAULT 0,
+    sold_quantity INTEGER NOT NULL DEFAULT 0,
+    alert_price REAL,
+    deleted BOOLEAN DEFAULT FALSE
+);
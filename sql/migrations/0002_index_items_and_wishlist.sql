@@ -0,0 +1,41 @@
+-- Index lookups by eBay item id and scans of live (non-deleted) rows.
+
+-- Rows sharing an eBay item id would fail the unique index. Keep one per id,
+-- the live row if there is one, otherwise the most recently created, and move
+-- the others to items_archive for an operator to review. Nothing is deleted
+-- without a copy; the migration runner logs how many rows were archived.
+CREATE TABLE IF NOT EXISTS items_archive (
+    id INTEGER PRIMARY KEY,
+    ebay_item_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    price REAL,
+    available_quantity INTEGER NOT NULL DEFAULT 0,
+    sold_quantity INTEGER NOT NULL DEFAULT 0,
+    alert_price REAL,
+    deleted BOOLEAN DEFAULT FALSE,
+    archived_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO items_archive (id, ebay_item_id, title, price, available_quantity, sold_quantity, alert_price, deleted)
+SELECT id, ebay_item_id, title, price, available_quantity, sold_quantity, alert_price, deleted
+FROM items
+WHERE id NOT IN (
+    SELECT (
+        SELECT keep.id FROM items AS keep
+        WHERE keep.ebay_item_id = dup.ebay_item_id
+        ORDER BY keep.deleted ASC, keep.id DESC
+        LIMIT 1
+    )
+    FROM items AS dup
+    GROUP BY dup.ebay_item_id
+);
+
+DELETE FROM items WHERE id IN (SELECT id FROM items_archive);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_items_ebay_item_id ON items (ebay_item_id);
+
+-- The WHERE clause must match the queries' "deleted = FALSE" for SQLite to use these
+CREATE INDEX IF NOT EXISTS idx_items_live ON items (id) WHERE deleted = FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_wishlist_ebay_item_id ON wishlist (ebay_item_id);
+CREATE INDEX IF NOT EXISTS idx_wishlist_live ON wishlist (id) WHERE deleted = FALSE;
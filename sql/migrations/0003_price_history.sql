@@ -0,0 +1,58 @@
+-- Append-only price observations for catalog items, with hourly and daily
+-- rollups kept up to date by a trigger as observations are inserted.
+
+-- Times are unix seconds (UTC). One observation per item per second; the
+-- primary key doubles as the (item_id, time range) index.
+CREATE TABLE IF NOT EXISTS price_history (
+    item_id INTEGER NOT NULL,
+    observed_at INTEGER NOT NULL,
+    price REAL NOT NULL,
+    available_quantity INTEGER,
+    sold_quantity INTEGER,
+    PRIMARY KEY (item_id, observed_at)
+) WITHOUT ROWID;
+
+-- resolution is the bucket width in seconds (3600 or 86400) and bucket the
+-- start of the bucket. The average is sum_price / samples; the "last" columns
+-- come from the latest observation in the bucket.
+CREATE TABLE IF NOT EXISTS price_rollups (
+    item_id INTEGER NOT NULL,
+    resolution INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    min_price REAL NOT NULL,
+    max_price REAL NOT NULL,
+    sum_price REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    last_price REAL NOT NULL,
+    last_available_quantity INTEGER,
+    last_sold_quantity INTEGER,
+    last_observed_at INTEGER NOT NULL,
+    PRIMARY KEY (item_id, resolution, bucket)
+) WITHOUT ROWID;
+
+-- Fires only for rows actually inserted, so re-sent observations that are
+-- ignored as duplicates are not counted twice.
+CREATE TRIGGER IF NOT EXISTS price_history_rollup
+AFTER INSERT ON price_history
+BEGIN
+    INSERT INTO price_rollups (
+        item_id, resolution, bucket, min_price, max_price, sum_price, samples,
+        last_price, last_available_quantity, last_sold_quantity, last_observed_at
+    )
+    SELECT NEW.item_id, width, NEW.observed_at - NEW.observed_at % width, NEW.price, NEW.price, NEW.price, 1,
+           NEW.price, NEW.available_quantity, NEW.sold_quantity, NEW.observed_at
+    FROM (SELECT 3600 AS width UNION ALL SELECT 86400)
+    WHERE true
+    ON CONFLICT (item_id, resolution, bucket) DO UPDATE SET
+        min_price = MIN(min_price, excluded.min_price),
+        max_price = MAX(max_price, excluded.max_price),
+        sum_price = sum_price + excluded.sum_price,
+        samples = samples + 1,
+        last_price = CASE WHEN excluded.last_observed_at >= last_observed_at
+                          THEN excluded.last_price ELSE last_price END,
+        last_available_quantity = CASE WHEN excluded.last_observed_at >= last_observed_at
+                                       THEN excluded.last_available_quantity ELSE last_available_quantity END,
+        last_sold_quantity = CASE WHEN excluded.last_observed_at >= last_observed_at
+                                  THEN excluded.last_sold_quantity ELSE last_sold_quantity END,
+        last_observed_at = MAX(last_observed_at, excluded.last_observed_at);
+END;
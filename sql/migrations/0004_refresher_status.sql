@@ -0,0 +1,17 @@
+-- Status of the background price refresher workers. Each worker overwrites
+-- its own row every few seconds so the web app can report queue depth and lag.
+
+CREATE TABLE IF NOT EXISTS refresher_status (
+    worker TEXT PRIMARY KEY,
+    pid INTEGER,
+    started_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    tracked INTEGER NOT NULL DEFAULT 0,
+    queue_depth INTEGER NOT NULL DEFAULT 0,
+    lag_seconds REAL NOT NULL DEFAULT 0,
+    calls_last_minute INTEGER NOT NULL DEFAULT 0,
+    calls_per_minute REAL NOT NULL,
+    refreshed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    alerts INTEGER NOT NULL DEFAULT 0
+);
@@ -0,0 +1,4 @@
+-- When the price refresher last sent a price alert for each item (unix
+-- seconds), so alerts are not repeated after the refresher restarts.
+
+ALTER TABLE items ADD COLUMN last_notified_at REAL;
@@ -0,0 +1,42 @@
+-- One wishlist per user. Rows from before this migration have no owner
+-- (user_id NULL) and are not returned for any user.
+
+ALTER TABLE wishlist ADD COLUMN user_id INTEGER;
+
+-- A user's live wishlist in id order, and at most one live row per eBay item per user
+CREATE INDEX IF NOT EXISTS idx_wishlist_user_live ON wishlist (user_id, id) WHERE deleted = FALSE;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_wishlist_user_ebay_item_id
+    ON wishlist (user_id, ebay_item_id) WHERE deleted = FALSE;
+
+-- A counter per user, bumped by the triggers below on every change to that
+-- user's rows, so a worker caching wishlists can tell which users changed
+-- after another connection committed.
+CREATE TABLE IF NOT EXISTS wishlist_versions (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS wishlist_version_insert
+AFTER INSERT ON wishlist
+WHEN NEW.user_id IS NOT NULL
+BEGIN
+    INSERT INTO wishlist_versions (user_id, version) VALUES (NEW.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS wishlist_version_update
+AFTER UPDATE ON wishlist
+BEGIN
+    INSERT INTO wishlist_versions (user_id, version)
+    SELECT user_id, 1 FROM (SELECT OLD.user_id AS user_id UNION SELECT NEW.user_id)
+    WHERE user_id IS NOT NULL
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS wishlist_version_delete
+AFTER DELETE ON wishlist
+WHEN OLD.user_id IS NOT NULL
+BEGIN
+    INSERT INTO wishlist_versions (user_id, version) VALUES (OLD.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+END;
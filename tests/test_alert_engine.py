@@ -0,0 +1,116 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.services.alert_engine import AlertEngine, PriceAlert
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+@pytest.fixture
+def engine():
+    """Fixture to provide an engine tracking three items with alert prices of 60."""
+    engine = AlertEngine(cooldown=100, rearm_ratio=0.1, capacity=2)
+    engine.load([1, 2, 3], [100.0, 100.0, 100.0], [60.0, 60.0, 60.0])
+    return engine
+
+
+######################################################
+#
+#    Evaluation
+#
+######################################################
+
+
+def test_evaluate_finds_items_at_or_below_alert_price(engine):
+    """Test that one pass reports every item at or below its alert price."""
+    engine.update_prices([1, 3], [60.0, 59.5])
+
+    assert engine.evaluate(now=0) == [PriceAlert(1, 60.0, 60.0), PriceAlert(3, 59.5, 60.0)]
+    assert engine.evaluate(now=1) == []
+
+
+def test_hysteresis_requires_recovery_before_refiring(engine):
+    """Test that an item re-arms only after recovering above the re-arm threshold."""
+    engine.update_prices([1], [55.0])
+    assert len(engine.evaluate(now=0)) == 1
+
+    engine.update_prices([1], [65.0])  # above 60 but not above 66
+    engine.update_prices([1], [55.0])
+    assert engine.evaluate(now=1000) == []
+
+    engine.update_prices([1], [67.0])
+    engine.update_prices([1], [55.0])
+    assert engine.evaluate(now=1000) == [PriceAlert(1, 55.0, 60.0)]
+
+
+def test_cooldown_delays_refiring(engine):
+    """Test that a re-armed item waits out the cooldown, then fires if still below."""
+    engine.update_prices([1], [50.0])
+    engine.evaluate(now=0)
+    engine.update_prices([1], [70.0])
+    engine.update_prices([1], [50.0])
+
+    assert engine.evaluate(now=50) == []
+    assert engine.evaluate(now=100) == [PriceAlert(1, 50.0, 60.0)]
+
+
+def test_alert_price_changes_and_missing_prices(engine):
+    """Test that raising an alert price can fire an item and missing prices never fire."""
+    engine.update_prices([2], [100.0], alert_prices=[100.0])
+    engine.upsert(4, None, 60.0)
+    engine.upsert(5, 10.0, None)
+
+    assert [alert.item_id for alert in engine.evaluate(now=0)] == [2]
+    assert engine.stats() == {"tracked": 5, "armed": 4, "below_alert_price": 1}
+
+
+def test_remove_keeps_rows_consistent(engine):
+    """Test that removing items moves the remaining ones without losing their state."""
+    engine.upsert(4, 50.0, 60.0)  # grows past the initial capacity
+    engine.remove([1, 99])
+
+    assert len(engine) == 3 and 1 not in engine
+    engine.update_prices([4, 3], [40.0, 50.0])
+    assert sorted(alert.item_id for alert in engine.evaluate(now=0)) == [3, 4]
+    with pytest.raises(KeyError, match="not tracked"):
+        engine.update_prices([1], [10.0])
+
+
+def test_load_restores_and_keeps_alert_state(engine):
+    """Test that reloading keeps state for tracked items and restores it from last_notified for new ones."""
+    engine.update_prices([1], [50.0])
+    engine.evaluate(now=0)
+
+    engine.load([1, 2, 5, 6], [50.0, 100.0, 40.0, 40.0], [60.0, 60.0, 60.0, 60.0],
+                last_notified=[np.nan, np.nan, 10.0, np.nan])
+
+    # 1 already fired and has not recovered; 5 was notified before a restart
+    assert engine.evaluate(now=1000) == [PriceAlert(6, 40.0, 60.0)]
+    assert engine.last_notified[0] == 0
+
+
+def test_evaluate_large_catalog():
+    """Test that a pass over a large catalog finds exactly the items below their alert price."""
+    rng = np.random.default_rng(0)
+    n = 100_000
+    prices = rng.uniform(10, 1000, n)
+    engine = AlertEngine()
+    engine.load(np.arange(n), prices, prices * 0.6)
+    dropped = rng.choice(n, 500, replace=False)
+
+    engine.update_prices(dropped.tolist(), (prices[dropped] * 0.5).tolist())
+
+    assert sorted(alert.item_id for alert in engine.evaluate(now=0)) == sorted(dropped.tolist())
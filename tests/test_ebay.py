@@ -0,0 +1,917 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ebay.services import cache_admin, ebay_client
+from ebay.services.async_ebay_client import AsyncEbayClient
+from ebay.services.http_client import EbayHttpClient
+from ebay.services.resilience import CircuitBreaker, CircuitOpenError, retry_with_backoff
+from ebay.services.rate_limiter import QuotaStore, RateLimiter, RateLimitExceeded, TokenBucket
+from ebay.services.token_manager import TokenManager
+from ebay.utils.cache import StaleWhileRevalidate, TTLCache
+from ebay.utils.disk_cache import DiskCache
+from ebay.utils.singleflight import SingleFlight
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Fixture to provide a local keep-alive HTTP server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def disk_cache(tmp_path, mocker):
+    """Fixture to point the shared disk cache at a fresh file for each test."""
+    cache = DiskCache(str(tmp_path / "ebay_cache.db"))
+    mocker.patch.object(ebay_client, "_disk_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def mock_search(mocker):
+    """Fixture to replace the upstream search call and reset the search cache."""
+    ebay_client._search_cache.clear()
+    return mocker.patch(
+        "ebay.services.ebay_client._fetch_search_items",
+        side_effect=lambda query, limit: ([
+            {"ebay_item_id": f"v1|{n}|0", "title": f"{query} {n}", "price": 10.0 + n}
+            for n in range(limit)
+        ], 0.0),
+    )
+
+
+@pytest.fixture
+def item_payload():
+    """Fixture to provide a raw Browse API item payload."""
+    return {
+        "itemId": "v1|254582474636|0",
+        "title": "HP X360 11 G4",
+        "price": {"value": "140.47", "currency": "USD"},
+        "estimatedAvailabilities": [
+            {"estimatedAvailableQuantity": 3, "estimatedSoldQuantity": 790}
+        ],
+    }
+
+
+@pytest.fixture
+def mock_item_lookup(mocker, item_payload):
+    """Fixture to replace the upstream item call and reset the item caches."""
+    ebay_client._item_stable_cache.clear()
+    ebay_client._item_volatile_cache.clear()
+    return mocker.patch("ebay.services.ebay_client.search_item_by_id", return_value=item_payload)
+
+
+######################################################
+#
+#    HTTP client
+#
+######################################################
+
+
+def test_http_client_reuses_connections(local_server):
+    """Test that sequential calls reuse a pooled connection."""
+    client = EbayHttpClient(pool_maxsize=2)
+    for _ in range(3):
+        response = client.get(f"{local_server}/ping")
+        assert response.json() == {"path": "/ping"}
+
+    stats = client.get_pool_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    client.close()
+
+
+def test_http_client_without_keep_alive(local_server):
+    """Test that disabling keep-alive opens a new connection per call."""
+    client = EbayHttpClient(keep_alive=False)
+    for _ in range(2):
+        client.get(f"{local_server}/ping")
+
+    assert client.get_pool_stats()["hits"] == 0
+    client.close()
+
+
+######################################################
+#
+#    Response cache
+#
+######################################################
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that a full cache evicts the least recently used entry."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are not returned once their TTL has passed."""
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=5, clock=lambda: now[0])
+    cache.set("a", 1)
+    now[0] = 4.9
+    assert cache.get("a") == 1
+    now[0] = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_search_items_cached_by_normalized_query(mock_search):
+    """Test that queries differing only in case and whitespace share a cache entry."""
+    ebay_client.search_items("Gaming  Laptop", 5)
+    items = ebay_client.search_items(" gaming laptop ", 5)
+
+    assert len(items) == 5
+    mock_search.assert_called_once_with("gaming laptop", 5)
+
+
+def test_search_items_smaller_limit_served_from_bucket(mock_search):
+    """Test that a cached larger result answers a smaller limit."""
+    ebay_client.search_items("laptop", 1)
+    items = ebay_client.search_items("laptop", 3)
+
+    assert [item["ebay_item_id"] for item in items] == ["v1|0|0", "v1|1|0", "v1|2|0"]
+    mock_search.assert_called_once_with("laptop", 5)
+
+
+def test_search_items_larger_limit_refetches(mock_search):
+    """Test that a limit above the cached bucket goes upstream."""
+    ebay_client.search_items("laptop", 5)
+    items = ebay_client.search_items("laptop", 7)
+
+    assert len(items) == 7
+    assert mock_search.call_count == 2
+
+
+def test_get_top_item_uses_cached_summary(mock_search):
+    """Test that the top item is served from a cached summary."""
+    ebay_client.search_items("laptop", 10)
+    top_item = ebay_client.get_top_item("Laptop")
+
+    assert top_item["ebay_item_id"] == "v1|0|0"
+    mock_search.assert_called_once()
+
+
+def test_parse_item_details(item_payload):
+    """Test parsing the fields the service uses out of an item payload."""
+    details = ebay_client.parse_item_details("v1|254582474636|0", item_payload)
+    assert details == {
+        "ebay_item_id": "v1|254582474636|0",
+        "title": "HP X360 11 G4",
+        "price": 140.47,
+        "available_quantity": 3,
+        "sold_quantity": 790,
+    }
+
+
+def test_get_item_details_shared_across_fields(mock_item_lookup):
+    """Test that lookups for different fields of the same item share one upstream call."""
+    ebay_client.get_item_details("v1|254582474636|0")
+    ebay_client.get_item_details("v1|254582474636|0", fields=("title", "sold_quantity"))
+    details = ebay_client.get_item_details("v1|254582474636|0", fields=("title", "available_quantity"))
+
+    assert details["available_quantity"] == 3
+    mock_item_lookup.assert_called_once_with("v1|254582474636|0")
+
+
+def test_get_item_details_volatile_expiry(mock_item_lookup, disk_cache):
+    """Test that expired volatile fields refetch while title-only lookups stay cached."""
+    ebay_client.get_item_details("v1|254582474636|0")
+    ebay_client._item_volatile_cache.clear()
+    disk_cache.purge(expired_only=False)
+
+    assert ebay_client.get_item_details("v1|254582474636|0", fields=("title",))["title"] == "HP X360 11 G4"
+    assert mock_item_lookup.call_count == 1
+
+    ebay_client.get_item_details("v1|254582474636|0", fields=("price",))
+    assert mock_item_lookup.call_count == 2
+
+
+######################################################
+#
+#    Disk cache
+#
+######################################################
+
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    """Test that entries written through one instance are read by another, as by another worker."""
+    path = str(tmp_path / "shared.db")
+    DiskCache(path).set("item:a", {"title": "Laptop"}, ttl=60, kind="item")
+
+    value, age = DiskCache(path).get("item:a")
+    assert value == {"title": "Laptop"}
+    assert age >= 0
+
+
+def test_disk_cache_expiry_and_purge(tmp_path):
+    """Test that expired entries are not returned and are removed by a purge."""
+    now = [1000.0]
+    cache = DiskCache(str(tmp_path / "cache.db"), clock=lambda: now[0])
+    cache.set_many({"item:a": 1, "item:b": 2}, ttl=10, kind="item")
+    cache.set("search:5:laptop", {"itemSummaries": []}, ttl=100, kind="search")
+    now[0] = 1020.0
+
+    assert cache.get_many(["item:a", "item:b", "search:5:laptop"]) == {"search:5:laptop": ({"itemSummaries": []}, 20.0)}
+    assert cache.stats()["kinds"]["item"] == {"entries": 2, "expired": 2, "bytes": 2}
+    assert cache.purge() == 2
+    assert cache.purge(expired_only=False) == 1
+
+
+def test_disk_cache_unavailable_behaves_as_miss(tmp_path):
+    """Test that an unusable cache file turns reads into misses and drops writes."""
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    cache = DiskCache(str(blocker / "cache.db"))
+
+    cache.set("item:a", 1, ttl=60)
+    assert cache.get("item:a") is None
+    assert cache.stats()["errors"] == 2
+
+
+def test_item_details_served_from_disk_cache(mock_item_lookup, disk_cache):
+    """Test that a worker with a cold memory cache reads an item another worker fetched."""
+    ebay_client.get_item_details("v1|254582474636|0")
+    ebay_client._item_stable_cache.clear()
+    ebay_client._item_volatile_cache.clear()
+
+    details = ebay_client.get_item_details("v1|254582474636|0")
+    assert details["price"] == 140.47
+    mock_item_lookup.assert_called_once()
+    assert disk_cache.stats()["hits"] == 1
+
+
+def test_disk_cache_age_carried_into_memory_cache(mocker, mock_item_lookup, item_payload, disk_cache):
+    """Test that an item read from disk is only fresh in memory for the rest of its TTL."""
+    disk_cache.set("item:v1|254582474636|0", item_payload, ttl=60, kind="item")
+    mocker.patch.object(disk_cache, "_clock", lambda: time.time() + 50)
+
+    ebay_client.get_item_details("v1|254582474636|0")
+    assert ebay_client._item_volatile_cache.lookup("v1|254582474636|0").age >= 50
+    mock_item_lookup.assert_not_called()
+
+
+def test_cache_admin_warm_and_inspect(mocker, mock_item_lookup, item_payload, disk_cache, tmp_path):
+    """Test that the CLI pre-warms the disk cache from a file of item ids."""
+    mocker.patch("ebay.services.ebay_client.search_items_by_ids",
+                 side_effect=lambda ids: {item_id: dict(item_payload, itemId=item_id) for item_id in ids})
+    id_file = tmp_path / "ids.txt"
+    id_file.write_text("# ids to warm\nv1|1|0\n\nv1|2|0\nv1|1|0\n")
+
+    assert cache_admin.main(["warm", str(id_file)]) == 0
+    report = cache_admin.inspect_cache(kind="item")
+    assert sorted(entry["key"] for entry in report["entries"]) == ["item:v1|1|0", "item:v1|2|0"]
+
+    ebay_client._item_stable_cache.clear()
+    ebay_client._item_volatile_cache.clear()
+    assert ebay_client.get_items_details(["v1|1|0", "v1|2|0"])[0]["ebay_item_id"] == "v1|1|0"
+    mock_item_lookup.assert_not_called()
+
+
+######################################################
+#
+#    Paginated search
+#
+######################################################
+
+
+def _search_page(total):
+    def fetch(query, limit, offset=0):
+        summaries = [
+            {"itemId": f"v1|{n}|0", "title": f"{query} {n}", "price": {"value": "5.00"}}
+            for n in range(offset, min(offset + limit, total))
+        ]
+        data = {"itemSummaries": summaries, "total": total}
+        if offset + limit < total:
+            data["next"] = f"?offset={offset + limit}"
+        return data
+    return fetch
+
+
+def test_iter_search_items_follows_pages(mocker):
+    """Test that the generator walks pages until eBay has no next page."""
+    fetch = mocker.patch("ebay.services.ebay_client._fetch_search_page", side_effect=_search_page(45))
+
+    items = list(ebay_client.iter_search_items("laptop", max_items=1000, page_size=20))
+
+    assert [item["ebay_item_id"] for item in items] == [f"v1|{n}|0" for n in range(45)]
+    assert [call.args[2] for call in fetch.call_args_list] == [0, 20, 40]
+
+
+def test_iter_search_items_stops_at_max_items(mocker):
+    """Test that the generator stops requesting pages once max_items is reached."""
+    fetch = mocker.patch("ebay.services.ebay_client._fetch_search_page", side_effect=_search_page(500))
+
+    items = list(ebay_client.iter_search_items("laptop", max_items=30, page_size=20))
+
+    assert len(items) == 30
+    assert [call.args[1:] for call in fetch.call_args_list] == [(20, 0), (10, 20)]
+
+
+######################################################
+#
+#    Batch lookups
+#
+######################################################
+
+
+def test_get_items_details_uses_get_items(mocker, mock_item_lookup, item_payload):
+    """Test that uncached ids are fetched in groups of 20 and duplicates once."""
+    ids = [f"v1|{n}|0" for n in range(25)]
+    batch = mocker.patch(
+        "ebay.services.ebay_client.search_items_by_ids",
+        side_effect=lambda chunk: {ebay_item_id: dict(item_payload, itemId=ebay_item_id) for ebay_item_id in chunk},
+    )
+
+    results = ebay_client.get_items_details(ids + ids[:3])
+
+    assert [result["ebay_item_id"] for result in results] == ids
+    assert sorted(len(call.args[0]) for call in batch.call_args_list) == [5, 20]
+    mock_item_lookup.assert_not_called()
+
+
+def test_get_items_details_reports_failures_per_id(mocker, mock_item_lookup, item_payload):
+    """Test that a failed group falls back to single lookups and missing ids report errors."""
+    def single_lookup(ebay_item_id):
+        if ebay_item_id == "v1|bad|0":
+            raise RuntimeError("Error searching for items: 404")
+        return item_payload
+
+    mocker.patch("ebay.services.ebay_client.search_items_by_ids", side_effect=RuntimeError("Error searching for items: 400"))
+    mock_item_lookup.side_effect = single_lookup
+
+    results = ebay_client.get_items_details(["v1|1|0", "v1|bad|0"])
+
+    assert results[0]["title"] == "HP X360 11 G4"
+    assert results[1] == {"ebay_item_id": "v1|bad|0", "error": "Error searching for items: 404"}
+
+
+def test_get_items_details_raises_when_throttled(mocker, mock_item_lookup):
+    """Test that a rate-limited group is raised instead of being retried and reported per id."""
+    mocker.patch("ebay.services.ebay_client.search_items_by_ids",
+                 side_effect=RateLimitExceeded("Daily quota exceeded for eBay item calls", retry_after=60))
+
+    with pytest.raises(RateLimitExceeded, match="Daily quota"):
+        ebay_client.get_items_details(["v1|1|0", "v1|2|0"])
+    mock_item_lookup.assert_not_called()
+
+
+######################################################
+#
+#    Stale-while-revalidate
+#
+######################################################
+
+
+class _InlineExecutor:
+    """Runs submitted work immediately, or holds it until run() if deferred."""
+
+    def __init__(self, deferred=False):
+        self.deferred = deferred
+        self.queued = []
+
+    def submit(self, fn, *args):
+        if self.deferred:
+            self.queued.append((fn, args))
+        else:
+            fn(*args)
+
+    def run(self):
+        while self.queued:
+            fn, args = self.queued.pop(0)
+            fn(*args)
+
+
+@pytest.fixture
+def swr_search(mocker, mock_search):
+    """Fixture to give the search cache a fake clock and run refreshes inline."""
+    now = [0.0]
+    cache = TTLCache(maxsize=8, ttl=30, stale_ttl=120, stale_if_error=3600, clock=lambda: now[0])
+    mocker.patch.object(ebay_client, "_search_cache", cache)
+    mocker.patch.object(ebay_client, "_revalidator", StaleWhileRevalidate(executor=_InlineExecutor()))
+    return now
+
+
+def test_ttl_cache_lookup_states():
+    """Test that an entry moves from fresh to stale to expired before being dropped."""
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, stale_ttl=20, stale_if_error=30, clock=lambda: now[0])
+    cache.set("a", 1)
+
+    assert cache.lookup("a").state == "fresh"
+    now[0] = 15.0
+    assert cache.lookup("a") == (1, 15.0, "stale")
+    assert cache.get("a") is None
+    now[0] = 45.0
+    assert cache.lookup("a").state == "expired"
+    now[0] = 60.0
+    assert cache.lookup("a") is None
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_stale_entry_refreshed_once_in_background():
+    """Test that stale entries are served immediately and only one refresh is queued per key."""
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, stale_ttl=20, clock=lambda: now[0])
+    executor = _InlineExecutor(deferred=True)
+    revalidator = StaleWhileRevalidate(executor=executor)
+    cache.set("a", "old")
+    now[0] = 12.0
+
+    def refresh():
+        cache.set("a", "new")
+        return "new"
+
+    first = revalidator.serve("a", cache.lookup("a"), refresh)
+    second = revalidator.serve("a", cache.lookup("a"), refresh)
+    assert (first.value, first.status, second.status) == ("old", "STALE", "STALE")
+    assert len(executor.queued) == 1
+
+    executor.run()
+    assert revalidator.serve("a", cache.lookup("a"), refresh).status == "HIT"
+    assert revalidator.stats()["pending_refreshes"] == 0
+
+
+def test_stale_if_error_serves_expired_entry():
+    """Test that a failed blocking refresh falls back to an expired entry but not to nothing."""
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, stale_ttl=5, stale_if_error=100, clock=lambda: now[0])
+    revalidator = StaleWhileRevalidate(executor=_InlineExecutor())
+    cache.set("a", "old")
+    now[0] = 50.0
+
+    def refresh():
+        raise RuntimeError("eBay is down")
+
+    result = revalidator.serve("a", cache.lookup("a"), refresh)
+    assert (result.value, result.status, result.age) == ("old", "STALE-IF-ERROR", 50.0)
+
+    with pytest.raises(RuntimeError, match="eBay is down"):
+        revalidator.serve("b", cache.lookup("b"), refresh)
+
+
+def test_search_items_cached_statuses(swr_search, mock_search):
+    """Test the X-Cache status of a search as its cache entry ages."""
+    assert ebay_client.search_items_cached("laptop", 5).status == "MISS"
+    assert ebay_client.search_items_cached("laptop", 5).status == "HIT"
+
+    swr_search[0] = 40.0
+    stale = ebay_client.search_items_cached("laptop", 5)
+    assert (stale.status, stale.age) == ("STALE", 40.0)
+    assert mock_search.call_count == 2  # refreshed in the background
+    assert ebay_client.search_items_cached("laptop", 5).status == "HIT"
+
+
+def test_search_items_cached_serves_stale_on_error(swr_search, mock_search):
+    """Test that search results past their stale TTL are still served when eBay fails."""
+    ebay_client.search_items("laptop", 5)
+    swr_search[0] = 500.0
+    mock_search.side_effect = RuntimeError("Error searching for items: 503")
+
+    result = ebay_client.search_items_cached("laptop", 3)
+    assert result.status == "STALE-IF-ERROR"
+    assert len(result.value) == 3
+
+
+def test_get_item_details_cached_uses_oldest_field(mocker, mock_item_lookup):
+    """Test that item freshness follows the oldest of the fields requested."""
+    now = [0.0]
+    mocker.patch.object(ebay_client, "_item_volatile_cache",
+                        TTLCache(maxsize=8, ttl=60, stale_ttl=240, clock=lambda: now[0]))
+    mocker.patch.object(ebay_client, "_item_stable_cache",
+                        TTLCache(maxsize=8, ttl=3600, stale_ttl=86400, clock=lambda: now[0]))
+    mocker.patch.object(ebay_client, "_revalidator", StaleWhileRevalidate(executor=_InlineExecutor(deferred=True)))
+
+    assert ebay_client.get_item_details_cached("v1|254582474636|0").status == "MISS"
+    now[0] = 90.0
+    assert ebay_client.get_item_details_cached("v1|254582474636|0", fields=("title",)).status == "HIT"
+    assert ebay_client.get_item_details_cached("v1|254582474636|0").status == "STALE"
+    assert mock_item_lookup.call_count == 1
+
+
+######################################################
+#
+#    Request coalescing
+#
+######################################################
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent callers with the same key share one execution."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_lookup():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"title": "shared"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("v1|1|0", slow_lookup)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["coalesced"] < 7:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"title": "shared"}] * 8
+    assert flight.stats() == {"executions": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_single_flight_shares_errors():
+    """Test that an error is raised to the caller and the key is released."""
+    flight = SingleFlight()
+
+    def failing_lookup():
+        raise RuntimeError("eBay unavailable")
+
+    with pytest.raises(RuntimeError, match="eBay unavailable"):
+        flight.do("v1|1|0", failing_lookup)
+    assert flight.do("v1|1|0", lambda: "ok") == "ok"
+
+
+######################################################
+#
+#    Token management
+#
+######################################################
+
+
+def test_token_manager_single_refresh_under_concurrency():
+    """Test that concurrent callers without a token trigger one fetch."""
+    release = threading.Event()
+    fetches = []
+
+    def fetch_token():
+        fetches.append(1)
+        release.wait(timeout=5)
+        return "token-1", 7200
+
+    manager = TokenManager(fetch_token, proactive=False)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    threading.Event().wait(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(fetches) == 1
+    assert tokens == ["token-1"] * 8
+
+
+def test_token_manager_serves_old_token_while_refreshing():
+    """Test that a token inside the skew window is returned while a refresh runs."""
+    now = [0.0]
+    release = threading.Event()
+    tokens = iter(["token-1", "token-2"])
+
+    def fetch_token():
+        token = next(tokens)
+        if token == "token-2":
+            release.wait(timeout=5)
+        return token, 1000
+
+    manager = TokenManager(fetch_token, refresh_skew=100, clock=lambda: now[0], proactive=False)
+    assert manager.get_token() == "token-1"
+
+    now[0] = 950
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-1"
+    release.set()
+    while manager.refreshes < 2:
+        threading.Event().wait(0.01)
+    assert manager.get_token() == "token-2"
+
+
+def test_token_manager_refresh_failure():
+    """Test that a failed refresh without a valid token raises an error."""
+    def fetch_token():
+        raise RuntimeError("Failed to fetch access token: 401")
+
+    manager = TokenManager(fetch_token, proactive=False)
+    with pytest.raises(RuntimeError, match="401"):
+        manager.get_token()
+
+
+######################################################
+#
+#    Async client
+#
+######################################################
+
+
+async def _fake_ebay_server(item_payload, in_flight):
+    async def token(request):
+        return web.json_response({"access_token": "async-token", "expires_in": 7200})
+
+    async def item(request):
+        assert request.headers["Authorization"] == "Bearer async-token"
+        in_flight["current"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+        await asyncio.sleep(0.02)
+        in_flight["current"] -= 1
+        return web.json_response(item_payload)
+
+    async def search(request):
+        return web.json_response({"itemSummaries": [
+            {"itemId": "v1|1|0", "title": request.query["q"], "price": {"value": "12.50"}}
+        ]})
+
+    app = web.Application()
+    app.router.add_post(ebay_client.TOKEN_PATH, token)
+    app.router.add_get(ebay_client.ITEM_PATH + "/{item_id}", item)
+    app.router.add_get(ebay_client.SEARCH_PATH, search)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+@pytest.fixture
+def async_hooks(mocker):
+    """Fixture to give the async client empty caches, fresh breakers and a recording rate limiter."""
+    ebay_client._search_cache.clear()
+    ebay_client._item_stable_cache.clear()
+    ebay_client._item_volatile_cache.clear()
+    breakers = {family: CircuitBreaker(family, min_calls=100) for family in ("search", "item", "oauth")}
+    mocker.patch.object(ebay_client, "_circuit_breakers", breakers)
+    acquire = mocker.patch.object(ebay_client._rate_limiter, "acquire")
+    return acquire, breakers
+
+
+def test_async_client_bounded_concurrency(item_payload, async_hooks):
+    """Test that concurrent async lookups share a token and respect the concurrency cap."""
+    async def run():
+        in_flight = {"current": 0, "peak": 0}
+        server = await _fake_ebay_server(item_payload, in_flight)
+        async with AsyncEbayClient(max_concurrency=2, base_url=str(server.make_url(""))) as client:
+            results = await asyncio.gather(*(client.get_item_details(f"v1|{n}|0") for n in range(6)))
+            items = await client.search_items("laptop")
+            refreshes = client.tokens.refreshes
+        await server.close()
+        return results, items, refreshes, in_flight["peak"]
+
+    results, items, refreshes, peak = asyncio.run(run())
+    assert [details["title"] for details in results] == ["HP X360 11 G4"] * 6
+    assert items == [{"ebay_item_id": "v1|1|0", "title": "laptop", "price": 12.5}]
+    assert refreshes == 1
+    assert peak == 2
+
+
+def test_async_client_timeout(item_payload, async_hooks):
+    """Test that a call exceeding its timeout raises a RuntimeError."""
+    async def run():
+        server = await _fake_ebay_server(item_payload, {"current": 0, "peak": 0})
+        try:
+            async with AsyncEbayClient(base_url=str(server.make_url(""))) as client:
+                await client.search_item_by_id("v1|1|0", timeout=0.001)
+        finally:
+            await server.close()
+
+    with pytest.raises(RuntimeError, match="Error searching for items"):
+        asyncio.run(run())
+
+
+def test_async_client_uses_rate_limits_breakers_and_caches(item_payload, async_hooks):
+    """Test that async calls are counted by the rate limiter, fail fast on an open breaker and share the item cache."""
+    acquire, breakers = async_hooks
+
+    async def run():
+        in_flight = {"current": 0, "peak": 0}
+        server = await _fake_ebay_server(item_payload, in_flight)
+        try:
+            async with AsyncEbayClient(base_url=str(server.make_url(""))) as client:
+                first = await client.get_item_details("v1|1|0")
+                again = await client.get_item_details("v1|1|0")
+                breakers["search"]._open()
+                with pytest.raises(CircuitOpenError):
+                    await client.search_items("laptop")
+        finally:
+            await server.close()
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert again == first
+    assert ebay_client._cached_item_details("v1|1|0") == first
+    assert [call.args[0] for call in acquire.call_args_list] == ["oauth", "item"]
+
+
+######################################################
+#
+#    Rate limiting
+#
+######################################################
+
+
+@pytest.fixture
+def quota_db(tmp_path, monkeypatch):
+    """Fixture to point the quota store at a temporary database."""
+    monkeypatch.setattr("ebay.utils.sql_utils.DB_PATH", str(tmp_path / "quota.db"))
+    return QuotaStore()
+
+
+def test_token_bucket_refills_over_time():
+    """Test that a drained bucket reports the wait until its next token."""
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.try_acquire() == 0
+
+
+def test_rate_limiter_fail_fast(quota_db):
+    """Test that fail mode raises with a retry-after once the bucket is empty."""
+    limiter = RateLimiter(rate_limits={"item": (1, 1)}, daily_quotas={}, mode="fail", quota_store=quota_db)
+    limiter.acquire("item")
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.acquire("item")
+    assert 0 < exc_info.value.retry_after <= 1
+
+
+def test_rate_limiter_blocks_until_token(quota_db):
+    """Test that block mode sleeps for the refill time instead of failing."""
+    sleeps = []
+    limiter = RateLimiter(rate_limits={"item": (1000, 1)}, daily_quotas={}, mode="block",
+                          quota_store=quota_db, sleep=sleeps.append)
+    limiter.acquire("item")
+    limiter.acquire("item")
+
+    assert len(sleeps) >= 1
+
+
+def test_daily_quota_persists_across_stores(quota_db):
+    """Test that the daily quota is counted in SQLite and shared by new stores."""
+    limiter = RateLimiter(rate_limits={"search": (1000, 1000)}, daily_quotas={"search": 2}, quota_store=quota_db)
+    limiter.acquire("search")
+    limiter.acquire("search")
+
+    restarted = RateLimiter(rate_limits={"search": (1000, 1000)}, daily_quotas={"search": 2}, quota_store=QuotaStore())
+    with pytest.raises(RateLimitExceeded, match="Daily quota exceeded"):
+        restarted.acquire("search")
+    assert restarted.stats()["search"]["calls_today"] == 2
+
+
+def test_upstream_429_raises_rate_limit(mocker):
+    """Test that a 429 from eBay becomes RateLimitExceeded with eBay's retry-after."""
+    response = mocker.Mock(status_code=429, headers={"Retry-After": "12"})
+    mocker.patch.object(ebay_client._rate_limiter, "acquire")
+    mocker.patch("ebay.services.ebay_client.get_http_client").return_value.request.return_value = response
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        ebay_client._send("search", "GET", ebay_client.SEARCH_URL)
+    assert exc_info.value.retry_after == 12
+
+
+######################################################
+#
+#    Retries and circuit breaking
+#
+######################################################
+
+
+def test_retry_with_backoff_full_jitter():
+    """Test that retries sleep a random time under an exponentially growing cap."""
+    sleeps = []
+    outcomes = iter([ConnectionError("reset"), ConnectionError("reset"), "ok"])
+
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    result = retry_with_backoff(flaky, max_attempts=3, is_retryable=lambda e: True,
+                                base_delay=1, max_delay=10, sleep=sleeps.append)
+
+    assert result == "ok"
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1 and 0 <= sleeps[1] <= 2
+
+
+def test_retry_with_backoff_gives_up():
+    """Test that non-retryable errors and exhausted attempts are raised."""
+    def failing():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        retry_with_backoff(failing, max_attempts=5, is_retryable=lambda e: False, sleep=lambda _: None)
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test that the breaker opens on a high error rate and closes after a good trial call."""
+    now = [0.0]
+    breaker = CircuitBreaker("item", failure_threshold=0.5, min_calls=4, open_duration=30, clock=lambda: now[0])
+    for ok in (True, False, True, False):
+        breaker.before_call()
+        breaker.record_success() if ok else breaker.record_failure()
+
+    assert breaker.state()["state"] == "open"
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == 30
+
+    now[0] = 31
+    breaker.before_call()
+    assert breaker.state()["state"] == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state()["state"] == "closed"
+
+
+def test_open_circuit_does_not_use_rate_limit(mocker):
+    """Test that a call failing fast on an open breaker takes no rate limit or quota slot."""
+    now = [0.0]
+    breaker = CircuitBreaker("search", min_calls=1, open_duration=30, clock=lambda: now[0])
+    breaker.before_call()
+    breaker.record_failure()
+    acquire = mocker.patch.object(ebay_client._rate_limiter, "acquire")
+    mocker.patch.object(ebay_client, "_circuit_breakers", {"search": breaker})
+
+    with pytest.raises(CircuitOpenError):
+        ebay_client._send("search", "GET", ebay_client.SEARCH_URL)
+    acquire.assert_not_called()
+
+    # A trial call rejected by the rate limiter gives its slot back
+    now[0] = 31
+    acquire.side_effect = RateLimitExceeded("Rate limit exceeded for eBay search calls", retry_after=1)
+    with pytest.raises(RateLimitExceeded):
+        ebay_client._send("search", "GET", ebay_client.SEARCH_URL)
+    breaker.before_call()
+
+
+def test_send_retries_transient_errors(mocker):
+    """Test that a GET is retried after a 503 and the breaker records both outcomes."""
+    def response(status):
+        resp = requests.Response()
+        resp.status_code = status
+        return resp
+
+    mocker.patch.object(ebay_client._rate_limiter, "acquire")
+    mocker.patch("ebay.services.resilience.time.sleep")
+    mocker.patch.object(ebay_client, "_circuit_breakers",
+                        {"search": CircuitBreaker("search", min_calls=100)})
+    request = mocker.patch("ebay.services.ebay_client.get_http_client").return_value.request
+    request.side_effect = [response(503), response(200)]
+
+    assert ebay_client._send("search", "GET", ebay_client.SEARCH_URL).status_code == 200
+    assert request.call_count == 2
+    assert ebay_client.get_circuit_breaker_states()["search"]["failure_rate"] == 0.5
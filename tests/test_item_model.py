@@ -1,4 +1,7 @@
 from contextlib import contextmanager
+from dataclasses import asdict
+import io
+import json
 import re
 import sqlite3
 import sys
@@ -11,13 +14,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 from ebay.models.item_model import (
+   CompactItem,
    Item,
    create_item,
    delete_item,
    get_item_by_id,
    get_all_items,
-   update_item_quantity
+   update_item_quantity,
+   create_items_bulk,
+   create_items_ebay_ids,
+   iter_all_items
 )
+from ebay.services import item_import
+from ebay.services.item_import import import_items
+from ebay.services.rate_limiter import RateLimitExceeded
+from ebay.utils import sql_utils
+from ebay.utils.migrations import upgrade
 
 
 ######################################################
@@ -367,3 +379,260 @@ def test_update_item_quantity_deleted_item(mock_cursor):
    # Ensure that no SQL query for updating quantity was executed
    mock_cursor.execute.assert_called_once_with("SELECT deleted FROM items WHERE id = ?", (1,))
 
+######################################################
+#
+#    Bulk load
+#
+######################################################
+
+
+@pytest.fixture
+def migrated_db(tmp_path, monkeypatch):
+    """Fixture to point DB_PATH at a fresh database with the current schema."""
+    db_path = str(tmp_path / "ebay_prices.db")
+    upgrade(db_path)
+    monkeypatch.setattr(sql_utils, "DB_PATH", db_path)
+    yield db_path
+    sql_utils.close_pools()
+
+
+def fetch_items(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT ebay_item_id, title, price, alert_price, deleted FROM items ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_create_items_bulk(migrated_db):
+    """Test that valid rows are inserted, invalid ones reported, and the alert price defaulted."""
+    rows = (
+        {"ebay_item_id": f"v1|{n}|0", "title": f"Item {n}", "price": "10.00", "available_quantity": "2"}
+        for n in range(5)
+    )
+
+    summary = create_items_bulk(rows, chunk_size=2)
+
+    assert (summary["created"], summary["updated"], summary["failed"]) == (5, 0, 0)
+    assert [result["row"] for result in summary["results"]] == [0, 1, 2, 3, 4]
+    assert fetch_items(migrated_db)[0] == ("v1|0|0", "Item 0", 10.0, 6.0, 0)
+
+
+def test_create_items_bulk_upserts_duplicates(migrated_db):
+    """Test that existing and repeated ebay item ids update the item instead of failing."""
+    create_items_bulk([{"ebay_item_id": "v1|1|0", "title": "Old", "price": 10.0, "available_quantity": 1}])
+    delete_item(1)
+
+    summary = create_items_bulk([
+        {"ebay_item_id": "v1|1|0", "title": "New", "price": 20.0, "available_quantity": 1},
+        {"ebay_item_id": "v1|2|0", "title": "First", "price": 5.0, "available_quantity": 1},
+        {"ebay_item_id": "v1|2|0", "title": "Second", "price": 6.0, "available_quantity": 1, "alert_price": 4.0},
+    ])
+
+    assert [result["status"] for result in summary["results"]] == ["updated", "created", "updated"]
+    assert fetch_items(migrated_db) == [("v1|1|0", "New", 20.0, 12.0, 0), ("v1|2|0", "Second", 6.0, 4.0, 0)]
+
+
+def test_create_items_bulk_reports_invalid_rows(migrated_db):
+    """Test that invalid rows get their own error without stopping the rest."""
+    summary = create_items_bulk([
+        {"ebay_item_id": "v1|1|0", "title": "Item", "price": -5, "available_quantity": 1},
+        {"ebay_item_id": "v1|2|0", "title": "Item", "price": 5, "available_quantity": "many"},
+        "not an object",
+        {"ebay_item_id": "v1|3|0", "title": "Item", "price": 5, "available_quantity": 1},
+    ])
+
+    assert summary["failed"] == 3
+    assert summary["results"][0]["error"] == "Invalid price: -5 (must be a positive number)."
+    assert summary["results"][1]["error"] == "Invalid quantity: many (must be a non-negative integer)."
+    assert summary["results"][3] == {"row": 3, "ebay_item_id": "v1|3|0", "status": "created"}
+
+
+def test_create_items_bulk_rolls_back_on_database_error(migrated_db):
+    """Test that a database error part way through commits nothing."""
+    rows = [{"ebay_item_id": f"v1|{n}|0", "title": "Item", "price": 5, "available_quantity": 1} for n in range(4)]
+
+    def failing_rows():
+        yield from rows[:2]
+        sqlite3.connect(migrated_db).execute("DROP INDEX idx_items_ebay_item_id")
+        yield from rows[2:]
+
+    with pytest.raises(sqlite3.Error, match="Database error"):
+        create_items_bulk(failing_rows(), chunk_size=2)
+    assert fetch_items(migrated_db) == []
+
+
+def test_import_items_from_csv_and_ndjson(migrated_db):
+    """Test that the import CLI readers feed the bulk loader."""
+    csv_summary = import_items(io.StringIO(
+        "ebay_item_id,title,price,available_quantity,sold_quantity\n"
+        "v1|1|0,Laptop,100.50,3,1\n"
+        "v1|2|0,Phone,,3,1\n"
+    ), "csv")
+    ndjson_summary = import_items(io.StringIO(
+        '{"ebay_item_id": "v1|1|0", "title": "Laptop", "price": 90, "available_quantity": 2}\n'
+        "\n"
+        "{not json\n"
+    ), "ndjson")
+
+    assert (csv_summary["created"], csv_summary["failed"]) == (1, 1)
+    assert (ndjson_summary["updated"], ndjson_summary["failed"]) == (1, 1)
+    assert fetch_items(migrated_db) == [("v1|1|0", "Laptop", 90.0, 54.0, 0)]
+
+
+def fake_items_details(ebay_item_ids, max_workers=None):
+    return [
+        {"ebay_item_id": ebay_item_id, "error": "No item found for the given eBay item ID"}
+        if "bad" in ebay_item_id else
+        {"ebay_item_id": ebay_item_id, "title": f"Item {ebay_item_id}", "price": 50.0,
+         "available_quantity": None, "sold_quantity": 3}
+        for ebay_item_id in ebay_item_ids
+    ]
+
+
+def test_create_items_ebay_ids(migrated_db, mocker):
+    """Test that eBay ids are fetched in getItems groups and written in committed batches."""
+    mock_details = mocker.patch("ebay.models.item_model.get_items_details", side_effect=fake_items_details)
+    ids = [f"v1|{n}|0" for n in range(45)] + ["v1|bad|0", "v1|0|0"]
+    progress = []
+
+    summary = create_items_ebay_ids(ids, max_workers=3, commit_size=10,
+                                    progress=lambda done, total: progress.append((done, total)))
+
+    assert (summary["total"], summary["created"], summary["failed"], summary["skipped"]) == (46, 45, 1, 0)
+    assert mock_details.call_count == 3
+    assert all(len(call.args[0]) <= 20 for call in mock_details.call_args_list)
+    assert progress[-1] == (46, 46)
+    assert len(progress) > 1
+    assert len(fetch_items(migrated_db)) == 45
+    assert fetch_items(migrated_db)[0][3] == 30.0
+
+
+def test_create_items_ebay_ids_resumes(migrated_db, mocker):
+    """Test that ids already in the catalog are skipped, so a rerun only fetches the rest."""
+    mocker.patch("ebay.models.item_model.get_items_details", side_effect=fake_items_details)
+    create_items_ebay_ids(["v1|1|0", "v1|2|0"])
+
+    mock_details = mocker.patch("ebay.models.item_model.get_items_details", side_effect=fake_items_details)
+    summary = create_items_ebay_ids(["v1|1|0", "v1|2|0", "v1|3|0"])
+
+    assert (summary["skipped"], summary["created"]) == (2, 1)
+    mock_details.assert_called_once_with(["v1|3|0"], 1)
+
+
+def test_create_items_ebay_ids_keeps_committed_batches(migrated_db, mocker):
+    """Test that batches committed before a failure survive it."""
+    calls = []
+
+    def failing_details(ebay_item_ids, max_workers=None):
+        calls.append(ebay_item_ids)
+        if len(calls) > 1:
+            raise RuntimeError("eBay is down")
+        return fake_items_details(ebay_item_ids)
+
+    mocker.patch("ebay.models.item_model.get_items_details", side_effect=failing_details)
+
+    with pytest.raises(RuntimeError):
+        create_items_ebay_ids([f"v1|{n}|0" for n in range(40)], max_workers=1, commit_size=20)
+
+    assert len(fetch_items(migrated_db)) == 20
+
+
+def test_create_items_ebay_ids_stops_when_throttled(migrated_db, mocker):
+    """Test that a rate-limited run commits what it fetched and leaves the rest pending, holding no connection."""
+    calls = []
+
+    def throttled_details(ebay_item_ids, max_workers=None):
+        calls.append(ebay_item_ids)
+        if len(calls) == 1:
+            # Fetched after the existing-id check and before any commit
+            assert sql_utils.get_db_pool_stats()["in_use"] == 0
+        else:
+            raise RateLimitExceeded("Daily quota exceeded for eBay item calls", retry_after=120)
+        return fake_items_details(ebay_item_ids)
+
+    mocker.patch("ebay.models.item_model.get_items_details", side_effect=throttled_details)
+
+    summary = create_items_ebay_ids([f"v1|{n}|0" for n in range(100)], max_workers=1, commit_size=10)
+
+    assert (summary["created"], summary["failed"], summary["pending"]) == (20, 0, 80)
+    assert summary["stopped"] == {"error": "Daily quota exceeded for eBay item calls", "retry_after": 120}
+    # The group already queued when the limit was hit is the last one fetched
+    assert len(calls) == 3
+    assert len(fetch_items(migrated_db)) == 20
+
+    mocker.patch("ebay.models.item_model.get_items_details", side_effect=fake_items_details)
+    resumed = create_items_ebay_ids([f"v1|{n}|0" for n in range(100)])
+    assert (resumed["skipped"], resumed["created"], resumed["stopped"]) == (20, 80, None)
+
+
+def test_item_import_ebay_ids_cli(migrated_db, mocker, tmp_path, capsys):
+    """Test that the import CLI hydrates a file of eBay ids and fails if any id failed."""
+    mocker.patch("ebay.models.item_model.get_items_details", side_effect=fake_items_details)
+    path = tmp_path / "ids.txt"
+    path.write_text("# watch list\nv1|1|0\n\nv1|bad|0\n")
+
+    assert item_import.main([str(path), "--ebay-ids", "--errors-only"]) == 1
+
+    output = json.loads(capsys.readouterr().out)
+    assert (output["created"], output["failed"]) == (1, 1)
+    assert output["results"] == [{"ebay_item_id": "v1|bad|0", "status": "error",
+                                  "error": "No item found for the given eBay item ID"}]
+
+
+def test_get_all_items_keyset_pages(migrated_db):
+    """Test that limit and after page through the live items in id order."""
+    create_items_bulk({"ebay_item_id": f"v1|{n}|0", "title": f"Item {n}", "price": 10, "available_quantity": 1}
+                      for n in range(5))
+    delete_item(2)
+
+    first = get_all_items(limit=2)
+    second = get_all_items(limit=2, after=first[-1]["id"])
+    rest = get_all_items(after=second[-1]["id"])
+
+    assert [item["id"] for item in first + second + rest] == [1, 3, 4, 5]
+    assert [item["id"] for item in get_all_items()] == [1, 3, 4, 5]
+
+
+def test_iter_all_items_reads_keyset_pages(mock_cursor):
+    """Test that streaming reads one keyset page per query, continuing after the last id."""
+    mock_cursor.fetchall.side_effect = [
+        [(1, "v1|1|0", "Item 1", 100.0, 10, 5, 60.0), (2, "v1|2|0", "Item 2", 200.0, 15, 3, 120.0)],
+        [(3, "v1|3|0", "Item 3", 300.0, 20, 8, 180.0)],
+    ]
+
+    items = list(iter_all_items(after=0, batch_size=2))
+
+    assert [item["id"] for item in items] == [1, 2, 3]
+    assert [call[0][1] for call in mock_cursor.execute.call_args_list] == [(0, 2), (2, 2)]
+
+
+def test_iter_all_items_releases_connection_between_pages(migrated_db):
+    """Test that a paused stream holds no pooled connection and stops at the limit."""
+    create_items_bulk({"ebay_item_id": f"v1|{n}|0", "title": f"Item {n}", "price": 10, "available_quantity": 1}
+                      for n in range(5))
+
+    items = iter_all_items(limit=3, batch_size=2)
+    assert next(items)["id"] == 1
+    assert sql_utils.get_db_pool_stats()["in_use"] == 0
+    assert [item["id"] for item in items] == [2, 3]
+
+
+
+######################################################
+#
+#    Compact items
+#
+######################################################
+
+
+def test_compact_item_matches_item():
+    """Test that CompactItem has Item's fields and validation but no per-instance __dict__."""
+    item = CompactItem(1, "v1|1|0", "Item 1", 100.0, 10, 5, 0.0)
+
+    assert not hasattr(item, "__dict__")
+    assert item == CompactItem(**asdict(Item(1, "v1|1|0", "Item 1", 100.0, 10, 5, 0.0)))
+    assert item.alert_price == 60.0
+    with pytest.raises(ValueError, match="Price must be non-negative"):
+        CompactItem(1, "v1|1|0", "Item 1", -1.0, 10, 5, 0.0)
+    with pytest.raises(ValueError, match="Sold quantity must be non-negative"):
+        CompactItem(1, "v1|1|0", "Item 1", 1.0, 10, -5, 0.0)
@@ -0,0 +1,154 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.models.item_model import CompactItem, Item
+from ebay.models.item_table import ItemTable
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+def item_row(item_id, title=None, price=None, alert_price=None, available_quantity=1, sold_quantity=0):
+    return (item_id, f"v1|{item_id}|0", title or f"Item {item_id}", 10.0 * item_id if price is None else price,
+            available_quantity, sold_quantity, alert_price)
+
+
+@pytest.fixture
+def table():
+    """Fixture to provide a table of three items, two of them sharing a title."""
+    return ItemTable.from_rows([
+        item_row(3, title="Laptop", alert_price=12.0),
+        item_row(1, title="Laptop"),
+        item_row(2, title="Phone", sold_quantity=4),
+    ])
+
+
+######################################################
+#
+#    Building and reading
+#
+######################################################
+
+
+def test_rows_read_back_their_fields(table):
+    """Test that row views return every field, with missing alert prices defaulted."""
+    assert len(table) == 3
+    assert table[0].to_dict() == {"id": 3, "ebay_item_id": "v1|3|0", "title": "Laptop", "price": 30.0,
+                                  "available_quantity": 1, "sold_quantity": 0, "alert_price": 12.0}
+    assert table[1].alert_price == 6.0
+    assert table[-1].sold_quantity == 4
+    assert [row.id for row in table] == [3, 1, 2]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_titles_are_interned(table):
+    """Test that repeated titles are stored once."""
+    assert table.distinct_titles == 2
+    assert table[0].title is table[1].title
+
+
+def test_find_by_id(table):
+    """Test looking rows up by item id, including after more items are appended."""
+    assert table.find(1).title == "Laptop"
+    assert table.find(4) is None
+
+    table.append(Item(4, "v1|4|0-with-a-longer-id", "Tablet", 40.0, 2, 0, 0.0))
+    assert table.find(4).ebay_item_id == "v1|4|0-with-a-longer-id"
+    assert table.find(3).ebay_item_id == "v1|3|0"
+
+
+def test_table_grows_past_its_capacity():
+    """Test that appending past the initial capacity keeps every row."""
+    table = ItemTable(capacity=2)
+    for item_id in range(1, 11):
+        table.append(CompactItem(*item_row(item_id, alert_price=0.0)))
+
+    assert len(table) == 10
+    assert table.prices.tolist() == [10.0 * item_id for item_id in range(1, 11)]
+
+
+def test_columns_are_read_only_views(table):
+    """Test that the numeric columns are exposed as read-only arrays of the live rows."""
+    assert table.ids.tolist() == [3, 1, 2]
+    assert table.alert_prices.tolist() == [12.0, 6.0, 12.0]
+    with pytest.raises(ValueError):
+        table.prices[0] = 1.0
+
+
+def test_to_item_keeps_alert_price(table):
+    """Test that a row copied into an Item keeps its stored alert price."""
+    item = table[0].to_item()
+    assert isinstance(item, Item)
+    assert item.alert_price == 12.0
+
+
+def test_from_items():
+    """Test building a table from Item objects."""
+    items = [Item(*item_row(item_id)) for item_id in (1, 2)]
+    table = ItemTable.from_items(items)
+    assert [row.to_item() for row in table] == items
+
+
+######################################################
+#
+#    Validation
+#
+######################################################
+
+
+@pytest.mark.parametrize("row, message", [
+    (item_row(2, price=-1.0), "Price must be non-negative, got -1.0 \\(row 1\\)"),
+    (item_row(2, price=math.nan), "Price must be non-negative, got nan"),
+    (item_row(2, available_quantity=-1), "Available quantity must be a non-negative 32-bit integer"),
+    (item_row(2, sold_quantity=2 ** 40), "Sold quantity must be a non-negative 32-bit integer"),
+    (item_row(2, alert_price=-5.0), "Alert price must be non-negative"),
+    (item_row(2, available_quantity=1.7), "Available quantity must be an integer, got 1.7 \\(row 1\\)"),
+    (item_row(2, sold_quantity="3"), "Sold quantity must be an integer"),
+    (item_row(1), "Item id must be unique"),
+    ((2.5,) + item_row(2)[1:], "Item id must be an integer"),
+    (item_row(2, title=7), "Invalid title"),
+])
+def test_invalid_rows_are_rejected_in_bulk(row, message):
+    """Test that one invalid row rejects the whole batch, naming the row."""
+    table = ItemTable()
+    with pytest.raises(ValueError, match=message):
+        table.extend(*zip(item_row(1), row))
+    assert len(table) == 0
+    assert table.distinct_titles == 0
+
+
+def test_ids_must_be_unique_across_batches(table):
+    """Test that an id already in the table is rejected, and whole-number floats are accepted."""
+    with pytest.raises(ValueError, match="Item id must be unique, got 3"):
+        table.extend(*zip(item_row(4), item_row(3)))
+    assert len(table) == 3
+
+    table.extend(*zip(item_row(4.0, available_quantity=2.0)))
+    assert table.find(4).available_quantity == 2
+
+
+def test_mismatched_columns_are_rejected():
+    """Test that columns of different lengths are rejected."""
+    with pytest.raises(ValueError, match="same length"):
+        ItemTable().extend([1, 2], ["v1|1|0"], ["Item 1"], [1.0], [1], [0])
+
+
+def test_numeric_columns_are_typed(table):
+    """Test that the columns are typed arrays usable in vectorized comparisons."""
+    assert np.flatnonzero(table.prices <= table.alert_prices).tolist() == []
+    assert table.prices.dtype == np.float64
+    assert table.available_quantities.dtype == np.int32
@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.utils.migrations import get_schema_version, load_migrations, status, upgrade
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture to provide the path of a database that does not exist yet."""
+    return str(tmp_path / "db" / "ebay_prices.db")
+
+
+def query_plan(db_path: str, sql: str) -> str:
+    conn = sqlite3.connect(db_path)
+    try:
+        return " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+    finally:
+        conn.close()
+
+
+######################################################
+#
+#    Migrations
+#
+######################################################
+
+
+def test_upgrade_creates_schema(db_path):
+    """Test that a new database is created at the latest version with its tables and indexes."""
+    applied = upgrade(db_path)
+
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    version = get_schema_version(conn)
+    user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+
+    assert applied == [migration.version for migration in load_migrations()]
+    assert version == user_version == applied[-1]
+    assert {"items", "wishlist", "user", "idx_items_ebay_item_id", "idx_items_live", "idx_wishlist_live",
+            "price_history", "price_rollups", "price_history_rollup", "idx_wishlist_user_live",
+            "wishlist_versions", "wishlist_version_insert", "wishlist_version_update"} <= names
+
+
+def test_upgrade_is_idempotent(db_path):
+    """Test that a second upgrade applies nothing."""
+    upgrade(db_path)
+
+    assert upgrade(db_path) == []
+    assert status(db_path)["pending"] == []
+
+
+def test_live_row_queries_use_partial_index(db_path):
+    """Test that the deleted = FALSE scans no longer read the whole table."""
+    upgrade(db_path)
+
+    assert "idx_items_live" in query_plan(db_path, "SELECT id, title FROM items WHERE deleted = FALSE")
+    assert "USING INDEX idx_wishlist_" in query_plan(db_path, "SELECT id, title FROM wishlist WHERE deleted = FALSE")
+    assert "idx_wishlist_user_live" in query_plan(
+        db_path, "SELECT id, title FROM wishlist WHERE user_id = 1 AND deleted = FALSE ORDER BY id")
+    assert "idx_items_ebay_item_id" in query_plan(db_path, "SELECT id FROM items WHERE ebay_item_id = 'v1|1|0'")
+
+
+def test_upgrade_in_place_deduplicates_items(db_path, caplog):
+    """Test that an existing database keeps one row per eBay item id and archives the others."""
+    upgrade(db_path, target=1)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO items (ebay_item_id, title, price, deleted) VALUES (?, ?, ?, ?)",
+        [("v1|1|0", "Old", 10.0, False), ("v1|1|0", "Deleted", 11.0, True),
+         ("v1|2|0", "First", 20.0, True), ("v1|2|0", "Second", 21.0, True),
+         ("v1|3|0", "Only", 30.0, False)]
+    )
+    conn.commit()
+    conn.close()
+
+    assert upgrade(db_path, target=2) == [2]
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT ebay_item_id, title FROM items ORDER BY ebay_item_id").fetchall()
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO items (ebay_item_id, title) VALUES ('v1|3|0', 'Duplicate')")
+    archived = conn.execute("SELECT ebay_item_id, title FROM items_archive ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [("v1|1|0", "Old"), ("v1|2|0", "Second"), ("v1|3|0", "Only")]
+    assert archived == [("v1|1|0", "Deleted"), ("v1|2|0", "First")]
+    assert "moved 2 row(s) to items_archive" in caplog.text
+
+
+def test_failed_migration_rolls_back(db_path, tmp_path):
+    """Test that a failing migration leaves the database at its previous version."""
+    directory = tmp_path / "migrations"
+    directory.mkdir()
+    (directory / "0001_create.sql").write_text("CREATE TABLE things (id INTEGER PRIMARY KEY);")
+    (directory / "0002_broken.sql").write_text("CREATE INDEX idx_missing ON nowhere (id);")
+
+    with pytest.raises(sqlite3.Error, match="Migration 2 \\(broken\\) failed"):
+        upgrade(db_path, directory=str(directory))
+
+    assert status(db_path, directory=str(directory))["version"] == 0
+
+
+def test_drop_table_migrations_rejected(tmp_path):
+    """Test that migrations may not drop tables."""
+    (tmp_path / "0001_reset.sql").write_text("DROP TABLE IF EXISTS items;")
+
+    with pytest.raises(ValueError, match="DROP TABLE"):
+        load_migrations(str(tmp_path))
@@ -0,0 +1,156 @@
+from datetime import datetime, timezone
+import os
+import sqlite3
+import sys
+
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.models.price_history_model import (
+    PriceHistoryWriter,
+    get_price_history,
+    parse_timestamp,
+    record_prices,
+)
+from ebay.utils import sql_utils
+from ebay.utils.migrations import upgrade
+
+
+# 2024-01-01T00:00:00Z
+DAY_START = 1704067200
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+@pytest.fixture
+def migrated_db(tmp_path, monkeypatch):
+    """Fixture to point DB_PATH at a fresh database with the current schema."""
+    db_path = str(tmp_path / "ebay_prices.db")
+    upgrade(db_path)
+    monkeypatch.setattr(sql_utils, "DB_PATH", db_path)
+    yield db_path
+    sql_utils.close_pools()
+
+
+def observation(price, seconds, item_id=1, **fields):
+    return {"item_id": item_id, "price": price, "observed_at": DAY_START + seconds, **fields}
+
+
+######################################################
+#
+#    Recording
+#
+######################################################
+
+
+def test_record_prices_ignores_duplicates(migrated_db):
+    """Test that re-sent observations are not recorded or rolled up twice."""
+    batch = [observation(10.0, 0), observation(12.0, 60)]
+
+    assert record_prices(batch) == 2
+    assert record_prices(batch + [observation(11.0, 120)]) == 1
+
+    history = get_price_history(1, start=DAY_START, end=DAY_START + 3600, resolution="hour")
+    assert history["points"][0]["samples"] == 3
+
+
+def test_record_prices_rejects_invalid_batch(migrated_db):
+    """Test that an invalid observation fails the whole batch before anything is written."""
+    with pytest.raises(ValueError, match="Invalid price"):
+        record_prices([observation(10.0, 0), observation(-1, 60)])
+
+    conn = sqlite3.connect(migrated_db)
+    assert conn.execute("SELECT COUNT(*) FROM price_history").fetchone()[0] == 0
+    conn.close()
+
+
+def test_writer_buffers_until_batch_size(migrated_db):
+    """Test that the writer only writes once its buffer is full or flushed."""
+    writer = PriceHistoryWriter(batch_size=3)
+    writer.add(1, 10.0, observed_at=DAY_START)
+    writer.add(1, 11.0, observed_at=DAY_START + 1)
+    assert len(writer) == 2 and writer.recorded == 0
+
+    writer.add(1, 12.0, observed_at=DAY_START + 2)
+    assert len(writer) == 0 and writer.recorded == 3
+
+    with writer:
+        writer.add(2, 5.0, observed_at=DAY_START)
+    assert writer.recorded == 4
+
+    with pytest.raises(ValueError):
+        writer.add(3, float("nan"))
+    assert len(writer) == 0
+
+
+######################################################
+#
+#    Rollups
+#
+######################################################
+
+
+def test_hourly_and_daily_rollups(migrated_db):
+    """Test that min/max/avg/last are kept per hour and per day, even for out-of-order inserts."""
+    record_prices([
+        observation(10.0, 60, available_quantity=5, sold_quantity=1),
+        observation(14.0, 1800, available_quantity=4, sold_quantity=2),
+        observation(8.0, 3700, available_quantity=3, sold_quantity=3),
+    ])
+    # A late observation from earlier in the first hour must not replace its "last" values
+    record_prices([observation(20.0, 30, available_quantity=9, sold_quantity=0)])
+
+    hourly = get_price_history(1, start=DAY_START, end=DAY_START + 7200, resolution="hour")["points"]
+    daily = get_price_history(1, start=DAY_START, end=DAY_START + 86400, resolution="day")["points"]
+
+    assert hourly == [
+        {"time": "2024-01-01T00:00:00Z", "min": 10.0, "max": 20.0, "avg": 14.67, "last": 14.0,
+         "available_quantity": 4, "sold_quantity": 2, "samples": 3},
+        {"time": "2024-01-01T01:00:00Z", "min": 8.0, "max": 8.0, "avg": 8.0, "last": 8.0,
+         "available_quantity": 3, "sold_quantity": 3, "samples": 1},
+    ]
+    assert daily == [
+        {"time": "2024-01-01T00:00:00Z", "min": 8.0, "max": 20.0, "avg": 13.0, "last": 8.0,
+         "available_quantity": 3, "sold_quantity": 3, "samples": 4},
+    ]
+
+
+def test_history_auto_resolution_and_range(migrated_db):
+    """Test that auto picks daily points for long ranges and the range filters buckets."""
+    record_prices([observation(10.0 + day, day * 86400) for day in range(30)])
+    record_prices([observation(99.0, 0, item_id=2)])
+
+    history = get_price_history(1, start="2024-01-10T12:00:00Z", end="2024-01-20")
+
+    assert history["resolution"] == "day"
+    assert [point["time"][:10] for point in history["points"]][0] == "2024-01-10"
+    assert len(history["points"]) == 11
+    assert get_price_history(1, start=DAY_START, end=DAY_START + 86400)["resolution"] == "hour"
+
+
+def test_history_rejects_bad_arguments(migrated_db):
+    """Test that invalid ranges and resolutions are reported as ValueError."""
+    with pytest.raises(ValueError, match="resolution"):
+        get_price_history(1, resolution="minute")
+    with pytest.raises(ValueError, match="start"):
+        get_price_history(1, start=DAY_START + 10, end=DAY_START)
+    with pytest.raises(ValueError, match="Invalid timestamp"):
+        get_price_history(1, start="yesterday")
+
+
+def test_parse_timestamp():
+    """Test that unix seconds, ISO strings and datetimes are accepted, naive ones as UTC."""
+    assert parse_timestamp("1704067200") == DAY_START
+    assert parse_timestamp("2024-01-01T00:00:00Z") == DAY_START
+    assert parse_timestamp("2024-01-01T01:00:00+01:00") == DAY_START
+    assert parse_timestamp(datetime(2024, 1, 1)) == DAY_START
+    assert parse_timestamp(datetime(2024, 1, 1, tzinfo=timezone.utc)) == DAY_START
@@ -0,0 +1,222 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.models.item_model import create_items_bulk, delete_item, get_item_by_id
+from ebay.models.price_history_model import get_price_history
+from ebay.services.price_refresher import (
+    REFRESH_MAX_INTERVAL,
+    REFRESH_MIN_INTERVAL,
+    PriceRefresher,
+    RefreshQueue,
+    TrackedItem,
+    alert_closeness,
+    get_refresher_status,
+    refresh_interval,
+)
+from ebay.services.rate_limiter import RateLimitExceeded
+from ebay.utils import sql_utils
+from ebay.utils.migrations import upgrade
+
+
+# 2024-01-01T00:00:00Z
+START = 1704067200.0
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+class FakeClock:
+    def __init__(self, now: float = START):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def migrated_db(tmp_path, monkeypatch):
+    """Fixture to point DB_PATH at a fresh database with the current schema."""
+    db_path = str(tmp_path / "ebay_prices.db")
+    upgrade(db_path)
+    monkeypatch.setattr(sql_utils, "DB_PATH", db_path)
+    yield db_path
+    sql_utils.close_pools()
+
+
+@pytest.fixture
+def catalog(migrated_db):
+    """Fixture to add two items to the catalog, one priced just above its alert price."""
+    create_items_bulk([
+        {"ebay_item_id": "v1|1|0", "title": "Laptop", "price": 100.0, "available_quantity": 5},
+        {"ebay_item_id": "v1|2|0", "title": "Phone", "price": 50.0, "available_quantity": 5, "alert_price": 48.0},
+    ])
+    return migrated_db
+
+
+def make_refresher(prices, clock, calls_per_minute=60, **kwargs):
+    calls = []
+
+    def fetch(ebay_item_id):
+        calls.append(ebay_item_id)
+        price = prices[ebay_item_id]
+        if isinstance(price, Exception):
+            raise price
+        return {"ebay_item_id": ebay_item_id, "title": "Item", "price": price,
+                "available_quantity": 3, "sold_quantity": 7}
+
+    refresher = PriceRefresher(calls_per_minute, worker="test", fetch=fetch, clock=clock, sleep=clock.sleep, **kwargs)
+    return refresher, calls
+
+
+######################################################
+#
+#    Scheduling
+#
+######################################################
+
+
+def test_refresh_interval_bounds():
+    """Test that urgency maps geometrically from the longest to the shortest interval."""
+    assert refresh_interval(0) == pytest.approx(REFRESH_MAX_INTERVAL)
+    assert refresh_interval(1) == pytest.approx(REFRESH_MIN_INTERVAL)
+    assert refresh_interval(0.5) == pytest.approx((REFRESH_MIN_INTERVAL * REFRESH_MAX_INTERVAL) ** 0.5)
+
+
+def test_alert_closeness():
+    """Test that closeness grows as the price approaches the alert price."""
+    assert alert_closeness(100.0, 60.0) == 0.0
+    assert alert_closeness(100.0, 80.0) == pytest.approx(0.5)
+    assert alert_closeness(50.0, 60.0) == 1.0
+    assert alert_closeness(None, 60.0) == 0.0
+
+
+def test_queue_orders_by_due_time_then_urgency():
+    """Test that the most overdue item comes first and ties go to the item nearest its alert price."""
+    queue = RefreshQueue()
+    queue.schedule(TrackedItem(1, "a", 100.0, 60.0), START + 10)
+    queue.schedule(TrackedItem(2, "b", 100.0, 60.0), START)
+    queue.schedule(TrackedItem(3, "c", 100.0, 95.0), START)
+    queue.schedule(queue.get(1), START + 100)  # rescheduled: the old entry is skipped
+
+    assert queue.depth(START) == 2
+    assert queue.lag(START + 5) == 5
+    assert [queue.pop_due(START + 5).id, queue.pop_due(START + 5).id] == [3, 2]
+    assert queue.pop_due(START + 50) is None
+    assert queue.pop_due(START + 100).id == 1
+
+
+######################################################
+#
+#    Refreshing
+#
+######################################################
+
+
+def test_refresher_records_prices_and_alerts(catalog):
+    """Test that a pass refreshes every item, records history, updates items and raises alerts."""
+    clock = FakeClock()
+    refresher, calls = make_refresher({"v1|1|0": 90.0, "v1|2|0": 45.0}, clock)
+
+    refresher.run(once=True)
+
+    assert sorted(calls) == ["v1|1|0", "v1|2|0"]
+    assert refresher.counts == {"refreshed": 2, "errors": 0, "alerts": 1}
+    assert get_item_by_id(2).price == 45.0
+    assert get_item_by_id(2).available_quantity == 3
+    history = get_price_history(1, start=START - 3600, end=START + 3600, resolution="hour")
+    assert history["points"][0]["last"] == 90.0
+
+
+def test_refresher_polls_urgent_items_more_often(catalog):
+    """Test that an item near its alert price is due again long before a quiet one."""
+    clock = FakeClock()
+    refresher, _ = make_refresher({"v1|1|0": 100.0, "v1|2|0": 49.0}, clock)
+    refresher.run(once=True)
+
+    assert refresher.queue.get(2).due_at - START < 1000
+    assert refresher.queue.get(1).due_at - START == pytest.approx(REFRESH_MAX_INTERVAL, abs=5)
+
+
+def test_refresher_stays_within_budget(migrated_db):
+    """Test that calls are paced by the per-minute budget."""
+    create_items_bulk({"ebay_item_id": f"v1|{n}|0", "title": "Item", "price": 10.0, "available_quantity": 1}
+                      for n in range(30))
+    clock = FakeClock()
+    refresher, calls = make_refresher({f"v1|{n}|0": 10.0 for n in range(30)}, clock, calls_per_minute=12)
+
+    refresher.run(once=True)
+
+    # A one-token burst, then one call every 5 seconds
+    assert len(calls) == 30
+    assert clock.now - START == pytest.approx(29 * 5, abs=1)
+
+
+def test_refresher_backs_off_failures_and_rate_limits(catalog):
+    """Test that failing items are retried later and eBay rate limits pause the item."""
+    clock = FakeClock()
+    refresher, _ = make_refresher({"v1|1|0": RuntimeError("Not found"),
+                                   "v1|2|0": RateLimitExceeded("slow down", retry_after=30)}, clock)
+    refresher.load_items()
+
+    refresher.step()
+    refresher.step()
+
+    assert refresher.counts["errors"] == 1
+    assert refresher.queue.get(1).due_at == START + 2 * REFRESH_MIN_INTERVAL
+    assert refresher.queue.get(2).due_at == START + 30
+
+
+def test_refresher_drops_deleted_items(catalog):
+    """Test that items deleted from the catalog leave the queue on reload."""
+    refresher, _ = make_refresher({}, FakeClock())
+    refresher.load_items()
+    delete_item(1)
+
+    refresher.load_items()
+
+    assert 1 not in refresher.queue and 2 in refresher.queue
+
+
+def test_refresher_status_is_saved(catalog):
+    """Test that the worker's queue depth and lag are readable from the database."""
+    clock = FakeClock(START)
+    refresher, _ = make_refresher({"v1|1|0": 90.0, "v1|2|0": 45.0}, clock)
+    refresher.load_items()
+    clock.now += 120
+    refresher.write_status()
+
+    status = get_refresher_status(stale_after=float("inf"))
+
+    assert len(status) == 1
+    assert status[0]["worker"] == "test"
+    assert (status[0]["tracked"], status[0]["queue_depth"], status[0]["lag_seconds"]) == (2, 2, 120.0)
+    assert status[0]["stale"] is False
+
+
+def test_refresher_does_not_repeat_alerts_after_restart(catalog):
+    """Test that the alert time saved on the item keeps a restarted worker from alerting again."""
+    clock = FakeClock()
+    refresher, _ = make_refresher({"v1|1|0": 90.0, "v1|2|0": 45.0}, clock)
+    refresher.run(once=True)
+
+    clock.now += REFRESH_MAX_INTERVAL
+    restarted, _ = make_refresher({"v1|1|0": 90.0, "v1|2|0": 44.0}, clock)
+    restarted.run(once=True)
+
+    assert refresher.counts["alerts"] == 1
+    assert restarted.counts == {"refreshed": 2, "errors": 0, "alerts": 0}
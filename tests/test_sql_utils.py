@@ -0,0 +1,232 @@
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.utils import sql_utils
+from ebay.utils.sql_utils import (
+    ConnectionPool,
+    PoolTimeout,
+    check_database_connection,
+    check_table_exists,
+    fetch_in_batches,
+    get_db_connection,
+    get_db_pool_stats,
+    get_db_settings,
+)
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Fixture to point DB_PATH at a fresh database with one table."""
+    path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE wishlist (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.close()
+    monkeypatch.setattr(sql_utils, "DB_PATH", path)
+    yield path
+    sql_utils.close_pools()
+
+
+######################################################
+#
+#    Connection pool
+#
+######################################################
+
+
+def test_get_db_connection_reuses_connection(db_path):
+    """Test that consecutive calls on one thread reuse a single connection."""
+    with get_db_connection() as first:
+        pass
+    with get_db_connection() as second:
+        pass
+
+    assert first is second
+    stats = get_db_pool_stats()
+    assert stats["connections_created"] == 1
+    assert stats["thread_reuses"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_get_db_connection_rolls_back_uncommitted_work(db_path):
+    """Test that work left uncommitted is not visible after the connection is returned."""
+    with get_db_connection() as conn:
+        conn.execute("INSERT INTO wishlist (title) VALUES ('Laptop')")
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM wishlist").fetchone()[0] == 0
+    assert get_db_pool_stats()["rollbacks_on_return"] == 1
+
+
+def test_get_db_connection_follows_db_path(db_path, tmp_path, monkeypatch):
+    """Test that changing DB_PATH switches to a pool for the new file."""
+    with get_db_connection() as conn:
+        conn.execute("INSERT INTO wishlist (title) VALUES ('Laptop')")
+        conn.commit()
+
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "other.db"))
+    with pytest.raises(Exception, match="Table check error"):
+        check_table_exists("wishlist")
+
+
+def test_pool_replaces_unhealthy_connection(db_path):
+    """Test that a broken idle connection is replaced on checkout."""
+    pool = ConnectionPool(db_path, max_size=1)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone() == (1,)
+    assert pool.stats()["health_check_failures"] == 1
+    assert pool.stats()["size"] == 1
+
+
+def test_pool_waits_then_times_out_at_max_size(db_path):
+    """Test that checkouts beyond max_size wait for a release and time out without one."""
+    pool = ConnectionPool(db_path, max_size=1, timeout=0.05)
+    conn = pool.acquire()
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+
+    pool.timeout = 2
+    timer = threading.Timer(0.05, pool.release, args=(conn,))
+    timer.start()
+    assert pool.acquire() is conn
+    timer.join()
+    assert pool.stats()["waits"] == 2
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_pool_shared_across_threads(db_path):
+    """Test that concurrent threads never open more than max_size connections."""
+    pool = ConnectionPool(db_path, max_size=3)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                conn = pool.acquire()
+                conn.execute("SELECT COUNT(*) FROM wishlist").fetchone()
+                pool.release(conn)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert pool.stats()["connections_created"] <= 3
+    assert pool.stats()["checkouts"] == 160
+
+
+def test_check_database_connection_uses_pool(db_path):
+    """Test that the health checks go through the pool."""
+    check_database_connection()
+    check_table_exists("wishlist")
+
+    assert get_db_pool_stats()["connections_created"] == 1
+
+
+######################################################
+#
+#    Pragma profile
+#
+######################################################
+
+
+def test_pool_applies_pragma_profile(db_path):
+    """Test that pooled connections use WAL and the configured pragmas."""
+    settings = get_db_settings()
+
+    assert settings["journal_mode"] == "wal"
+    assert settings["synchronous"] == 1  # NORMAL
+    assert settings["busy_timeout"] == sql_utils.DB_PRAGMAS["busy_timeout"]
+    assert settings["cache_size"] == sql_utils.DB_PRAGMAS["cache_size"]
+    assert settings["temp_store"] == 2  # MEMORY
+
+
+def test_pool_custom_pragmas(db_path):
+    """Test that a pool can be given its own pragma profile."""
+    pool = ConnectionPool(db_path, pragmas={"journal_mode": "DELETE", "busy_timeout": 250})
+
+    assert pool.settings() == {"journal_mode": "delete", "busy_timeout": 250}
+
+
+def test_pool_rejects_unsafe_pragma_values(db_path):
+    """Test that pragma values cannot smuggle in extra SQL."""
+    with pytest.raises(ValueError, match="Invalid pragma"):
+        ConnectionPool(db_path, pragmas={"journal_mode": "WAL; DROP TABLE wishlist"})
+
+
+def test_pool_closes_connection_when_pragmas_fail(db_path, monkeypatch):
+    """Test that a connection whose pragmas fail is closed and its pool slot freed."""
+    pool = ConnectionPool(db_path, max_size=1)
+    opened = []
+
+    def failing_pragmas(conn):
+        opened.append(conn)
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(pool, "_apply_pragmas", failing_pragmas)
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+        pool.acquire()
+
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        opened[0].execute("SELECT 1")
+    assert pool.stats()["size"] == 0
+
+
+def test_wal_readers_not_blocked_by_writer(db_path):
+    """Test that a reader can query while another connection holds an open write transaction."""
+    pool = ConnectionPool(db_path, max_size=2)
+    writer = pool.acquire()
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO wishlist (title) VALUES ('Laptop')")
+
+    reader = pool.acquire()
+    assert reader.execute("SELECT COUNT(*) FROM wishlist").fetchone()[0] == 0
+
+    writer.commit()
+    pool.release(writer)
+    pool.release(reader)
+
+
+def test_fetch_in_batches(db_path):
+    """Test that query results are read in fetchmany batches of the requested size."""
+    with get_db_connection() as conn:
+        conn.executemany("INSERT INTO wishlist (title) VALUES (?)", [(f"Item {n}",) for n in range(5)])
+        cursor = conn.execute("SELECT id FROM wishlist ORDER BY id")
+        batches = []
+        fetchmany = cursor.fetchmany
+
+        class Recording:
+            def fetchmany(self, size):
+                rows = fetchmany(size)
+                batches.append(len(rows))
+                return rows
+
+        rows = list(fetch_in_batches(Recording(), batch_size=2))
+
+    assert rows == [(1,), (2,), (3,), (4,), (5,)]
+    assert batches == [2, 2, 1, 0]
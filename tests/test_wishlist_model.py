@@ -117,3 +117,119 @@ def test_wishlist_length(wishlist_model, sample_item, another_item):
     wishlist_model.add_item_to_wishlist(sample_item)
     wishlist_model.add_item_to_wishlist(another_item)
     assert wishlist_model.get_wishlist_length() == 2
+
+
+def test_get_all_items_keeps_insertion_order(wishlist_model):
+    """Test that items come back in the order they were added, with removed items gone."""
+    items = [Item(item_id, f'Ebay Item Id {item_id}', f'Title {item_id}', 10.0, 1, 0, 6.0) for item_id in (5, 3, 9, 1)]
+    for item in items:
+        wishlist_model.add_item_to_wishlist(item)
+
+    wishlist_model.remove_item_by_item_id(3)
+    wishlist_model.add_item_to_wishlist(items[1])
+
+    assert [item.id for item in wishlist_model.get_all_items()] == [5, 9, 1, 3]
+    assert wishlist_model.wishlist == wishlist_model.get_all_items()
+
+
+def test_wishlist_attribute_stays_a_mutable_list(wishlist_model, sample_item, another_item):
+    """Test that changes made through the wishlist attribute reach the model and its indexes."""
+    wishlist_model.wishlist.append(sample_item)
+    assert wishlist_model.has_item(1)
+    assert wishlist_model.get_cheapest(1) == [sample_item]
+
+    wishlist_model.wishlist = [another_item, sample_item]
+    assert [item.id for item in wishlist_model.get_all_items()] == [2, 1]
+    assert wishlist_model.wishlist[0] == another_item and len(wishlist_model.wishlist) == 2
+
+    del wishlist_model.wishlist[0]
+    assert wishlist_model.wishlist == [sample_item]
+    assert [item.id for item in wishlist_model.get_items_in_price_range(0, 1000)] == [1]
+
+    with pytest.raises(ValueError, match="Item with ID 1 already exists"):
+        wishlist_model.wishlist = [another_item, sample_item, sample_item]
+    assert wishlist_model.wishlist == [sample_item]
+
+
+@pytest.fixture
+def priced_wishlist(wishlist_model):
+    """Fixture to provide a wishlist of items at assorted prices, one below its alert price."""
+    for item_id, price, alert_price in [(1, 50.0, 30.0), (2, 20.0, 25.0), (3, 50.0, 40.0), (4, 80.0, 10.0), (5, 35.0, 35.0)]:
+        item = Item(item_id, f'Ebay Item Id {item_id}', f'Title {item_id}', price, 1, 0, alert_price)
+        # Item defaults the alert price to 60% of the price, so set it explicitly
+        item.alert_price = alert_price
+        wishlist_model.add_item_to_wishlist(item)
+    return wishlist_model
+
+
+def test_get_item_by_price_keeps_insertion_order(priced_wishlist):
+    """Test that items with the same price come back in the order they were added."""
+    assert [item.id for item in priced_wishlist.get_item_by_price(50)] == [1, 3]
+    with pytest.raises(ValueError, match="No items found with price 60"):
+        priced_wishlist.get_item_by_price(60)
+
+
+def test_get_items_in_price_range(priced_wishlist):
+    """Test that a price range is inclusive and sorted by price."""
+    assert [item.id for item in priced_wishlist.get_items_in_price_range(20, 50)] == [2, 5, 1, 3]
+    assert [item.id for item in priced_wishlist.get_items_in_price_range(36, 49.99)] == []
+    assert [item.id for item in priced_wishlist.get_items_in_price_range(80, 80)] == [4]
+
+
+def test_get_items_in_invalid_price_range(priced_wishlist):
+    """Test that a reversed or negative price range raises a ValueError."""
+    with pytest.raises(ValueError, match="Invalid price range"):
+        priced_wishlist.get_items_in_price_range(50, 20)
+    with pytest.raises(ValueError, match="Invalid price"):
+        priced_wishlist.get_items_in_price_range(-1, 20)
+
+
+def test_get_cheapest(priced_wishlist):
+    """Test retrieving the n cheapest items, and that n must be positive."""
+    assert [item.id for item in priced_wishlist.get_cheapest(3)] == [2, 5, 1]
+    assert len(priced_wishlist.get_cheapest(10)) == 5
+    with pytest.raises(ValueError, match="Invalid number of items: 0"):
+        priced_wishlist.get_cheapest(0)
+
+
+def test_get_items_below_alert(priced_wishlist):
+    """Test retrieving items priced at or below their alert price, furthest below first."""
+    assert [item.id for item in priced_wishlist.get_items_below_alert()] == [2, 5]
+
+
+def test_update_item_price_reindexes(priced_wishlist):
+    """Test that updating a price moves the item in the price and alert indexes."""
+    priced_wishlist.update_item_price(4, 1.0)
+    assert priced_wishlist.get_item_by_item_id(4).price == 1.0
+    assert [item.id for item in priced_wishlist.get_cheapest(1)] == [4]
+    assert [item.id for item in priced_wishlist.get_items_below_alert()] == [4, 2, 5]
+
+    priced_wishlist.update_item_price(2, 30.0, alert_price=10.0)
+    assert [item.id for item in priced_wishlist.get_items_below_alert()] == [4, 5]
+    with pytest.raises(ValueError, match="Item with ID 99 not found in the wishlist"):
+        priced_wishlist.update_item_price(99, 10.0)
+
+
+def test_replace_item_keeps_position_and_reindexes(priced_wishlist):
+    """Test that replacing an item keeps its place in the wishlist and moves it in the price indexes."""
+    priced_wishlist.replace_item(Item(1, 'Ebay Item Id 1', 'Title 1', 5.0, 1, 0, 3.0))
+    assert [item.id for item in priced_wishlist.get_all_items()] == [1, 2, 3, 4, 5]
+    assert [item.id for item in priced_wishlist.get_cheapest(1)] == [1]
+    with pytest.raises(ValueError, match="Item with ID 99 not found in the wishlist"):
+        priced_wishlist.replace_item(Item(99, 'Ebay Item Id 99', 'Title 99', 5.0, 1, 0, 3.0))
+
+
+def test_price_index_follows_removal_and_clear(priced_wishlist):
+    """Test that removed and cleared items leave the price indexes."""
+    priced_wishlist.remove_item_by_item_id(1)
+    assert [item.id for item in priced_wishlist.get_item_by_price(50)] == [3]
+    priced_wishlist.clear_wishlist()
+    assert priced_wishlist.get_items_in_price_range(0, 100) == []
+    assert priced_wishlist.get_items_below_alert() == []
+
+
+def test_has_item(wishlist_model, sample_item):
+    """Test checking for an item without raising on an empty wishlist."""
+    assert not wishlist_model.has_item(1)
+    wishlist_model.add_item_to_wishlist(sample_item)
+    assert wishlist_model.has_item(1)
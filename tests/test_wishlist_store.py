@@ -0,0 +1,206 @@
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+
+# Add the root directory of the project to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from ebay.models.wishlist_store import WishlistStore, close_wishlist_stores, get_wishlist_store
+from ebay.utils import sql_utils
+from ebay.utils.migrations import upgrade
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+@pytest.fixture
+def migrated_db(tmp_path, monkeypatch):
+    """Fixture to point DB_PATH at a fresh database with the current schema."""
+    db_path = str(tmp_path / "ebay_prices.db")
+    upgrade(db_path)
+    monkeypatch.setattr(sql_utils, "DB_PATH", db_path)
+    yield db_path
+    close_wishlist_stores()
+    sql_utils.close_pools()
+
+
+@pytest.fixture
+def store(migrated_db):
+    """Fixture to provide a wishlist store on the migrated database."""
+    store = WishlistStore(migrated_db, cache_size=2)
+    yield store
+    store.close()
+
+
+def wishlist_item(n, **fields):
+    return {"ebay_item_id": f"v1|{n}|0", "title": f"Item {n}", "price": 10.0 * n, "available_quantity": 1, **fields}
+
+
+######################################################
+#
+#    Reads and writes
+#
+######################################################
+
+
+def test_add_items_persists_per_user(store, migrated_db):
+    """Test that items are written for their user only, with their ids and alert prices."""
+    stored = store.add_items(1, [wishlist_item(1), wishlist_item(2, alert_price=5.0)])
+    store.add_item(2, wishlist_item(3))
+
+    assert [item["title"] for item in store.get_items(1)] == ["Item 1", "Item 2"]
+    assert stored[0]["alert_price"] == 6.0
+    assert stored[1]["alert_price"] == 5.0
+    assert [item["title"] for item in store.get_items(2)] == ["Item 3"]
+
+    conn = sqlite3.connect(migrated_db)
+    rows = conn.execute("SELECT user_id, title FROM wishlist ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [(1, "Item 1"), (1, "Item 2"), (2, "Item 3")]
+
+
+def test_add_existing_item_updates_it(store):
+    """Test that re-adding an eBay item already on the wishlist updates it in place."""
+    first = store.add_item(1, wishlist_item(1))
+    again = store.add_item(1, wishlist_item(1, price=7.0))
+
+    assert again["id"] == first["id"]
+    assert [(item["id"], item["price"]) for item in store.get_items(1)] == [(first["id"], 7.0)]
+
+
+def test_add_items_is_all_or_nothing(store):
+    """Test that one invalid item in a batch means nothing is written."""
+    with pytest.raises(ValueError, match="Invalid price"):
+        store.add_items(1, [wishlist_item(1), wishlist_item(2, price=-1)])
+    assert store.get_items(1) == []
+
+
+def test_get_items_pages_by_id(store):
+    """Test keyset pagination over a user's wishlist."""
+    ids = [item["id"] for item in store.add_items(1, [wishlist_item(n) for n in range(1, 6)])]
+
+    assert [item["id"] for item in store.get_items(1, limit=2)] == ids[:2]
+    assert [item["id"] for item in store.get_items(1, after=ids[1], limit=2)] == ids[2:4]
+    assert store.get_items(1, after=ids[-1]) == []
+
+
+def test_pages_stay_in_id_order_after_update(store):
+    """Test that updating an item already on the wishlist keeps the cached pages in id order."""
+    ids = [item["id"] for item in store.add_items(1, [wishlist_item(n) for n in range(1, 4)])]
+    store.get_items(1)
+    store.add_item(1, wishlist_item(1, price=7.0))
+
+    assert [item["id"] for item in store.get_items(1)] == ids
+    first = store.get_items(1, limit=2)
+    assert [item["id"] for item in first] == ids[:2]
+    assert [item["id"] for item in store.get_items(1, after=first[-1]["id"], limit=2)] == ids[2:]
+    assert store.stats()["misses"] == 1
+
+
+def test_iter_items_reads_pages_without_holding_the_store(store):
+    """Test that a paused stream of a wishlist does not block other users' requests."""
+    ids = [item["id"] for item in store.add_items(1, [wishlist_item(n) for n in range(1, 6)])]
+
+    items = store.iter_items(1, limit=4, batch_size=2)
+    assert next(items)["id"] == ids[0]
+
+    writer = threading.Thread(target=store.add_item, args=(2, wishlist_item(6)))
+    writer.start()
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert [item["id"] for item in items] == ids[1:4]
+    assert [item["title"] for item in store.iter_items(2)] == ["Item 6"]
+
+
+def test_remove_items(store):
+    """Test removing items, and that an item of another user cannot be removed."""
+    ids = [item["id"] for item in store.add_items(1, [wishlist_item(1), wishlist_item(2)])]
+    other = store.add_item(2, wishlist_item(3))["id"]
+
+    store.remove_item(1, ids[0])
+    with pytest.raises(ValueError, match=f"Item with ID {other} not found in the wishlist"):
+        store.remove_item(1, other)
+
+    assert [item["id"] for item in store.get_items(1)] == ids[1:]
+    assert len(store.get_items(2)) == 1
+
+
+def test_invalid_user_id(store):
+    """Test that the user ID must be a positive integer."""
+    with pytest.raises(ValueError, match="Invalid user ID"):
+        store.get_items(0)
+
+
+######################################################
+#
+#    Cache
+#
+######################################################
+
+
+def test_cache_serves_reads_and_evicts_least_recently_used(store):
+    """Test that repeat reads are cache hits and the cache holds at most cache_size users."""
+    for user_id in (1, 2, 3):
+        store.add_item(user_id, wishlist_item(user_id))
+        store.get_items(user_id)
+    store.get_items(3)
+
+    stats = store.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["misses"] == 3
+    assert stats["hits"] >= 1
+
+
+def test_own_writes_keep_the_cache(store):
+    """Test that writes are applied to the cached wishlist instead of invalidating it."""
+    store.get_items(1)
+    store.add_item(1, wishlist_item(1))
+    assert [item["title"] for item in store.get_items(1)] == ["Item 1"]
+    assert store.stats()["misses"] == 1
+    assert store.stats()["invalidations"] == 0
+
+
+def test_cache_invalidated_by_another_worker(store, migrated_db):
+    """Test that a write by another connection drops only the changed user's cached wishlist."""
+    store.add_item(1, wishlist_item(1))
+    store.add_item(2, wishlist_item(2))
+    store.get_items(1)
+    store.get_items(2)
+
+    other = WishlistStore(migrated_db)
+    other.add_item(1, wishlist_item(9))
+    other.close()
+
+    assert [item["title"] for item in store.get_items(1)] == ["Item 1", "Item 9"]
+    assert store.stats()["invalidations"] == 1
+
+
+def test_unrelated_write_does_not_invalidate(store, migrated_db):
+    """Test that another connection writing other tables leaves the cache alone."""
+    store.add_item(1, wishlist_item(1))
+    store.get_items(1)
+
+    conn = sqlite3.connect(migrated_db)
+    conn.execute("INSERT INTO items (ebay_item_id, title, price) VALUES ('v1|1|0', 'Item 1', 10.0)")
+    conn.commit()
+    conn.close()
+
+    store.get_items(1)
+    assert store.stats()["invalidations"] == 0
+    assert store.stats()["misses"] == 1
+
+
+def test_get_wishlist_store_follows_db_path(migrated_db):
+    """Test that the shared store is created for the current DB_PATH."""
+    assert get_wishlist_store() is get_wishlist_store()
+    assert get_wishlist_store().path == migrated_db